@@ -64,6 +64,7 @@ setup(
         "livekit-agents[turn-detector]>=1.2.0",
         "websockets>=10.0",
         "python-socketio>=5.0.0",
+        "simple-websocket>=0.10.0",
     ],
     extras_require={
         "dev": [
@@ -82,7 +83,7 @@ setup(
         "console_scripts": [
             "macbot=macbot.cli:main",
             "macbot-orchestrator=macbot.orchestrator:main",
-            "macbot-dashboard=macbot.web_dashboard:main",
+            "macbot-dashboard=macbot.cli:dashboard",
             "macbot-rag=macbot.rag_server:main",
         ],
     },
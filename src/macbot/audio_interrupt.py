@@ -35,19 +35,26 @@ class AudioInterruptHandler:
         self.audio_queue = queue.Queue()
         self.is_playing = False
         self.interrupt_requested = False
-        self.playback_thread: Optional[threading.Thread] = None
         self.interrupt_callbacks: List[Callable] = []
         self.output_device = output_device  # sd device index or name
 
-        # Audio buffer management
-        self.audio_buffer = np.array([], dtype=np.float32)
-        self.buffer_lock = threading.Lock()
+        # Playback buffer management. The output stream stays open between
+        # utterances; play_audio() converts each clip once into the reusable
+        # int16 scratch and the callback copies from it at _play_pos.
+        self._play_f32 = np.zeros(0, dtype=np.float32)
+        self._play_buf = np.zeros(0, dtype=np.int16)
+        self._play_len = 0
+        self._play_pos = 0
+        self._play_done = threading.Event()
+        self._play_lock = threading.Lock()  # one clip at a time
+        self._stream_lock = threading.Lock()
 
         # Voice activity detection for interruption
         self.vad_enabled = True
         self.vad_threshold = 0.01
         self.vad_buffer_size = int(sample_rate * 0.1)  # 100ms buffer
         self.vad_buffer = np.zeros(self.vad_buffer_size, dtype=np.float32)
+        self._vad_pos = 0  # next write index; vad_buffer is used as a ring
 
     def start(self):
         """Start the audio interruption handler"""
@@ -59,9 +66,7 @@ class AudioInterruptHandler:
         logger.info("Stopping audio interruption handler")
         self.interrupt_requested = True
         self._stop_current_playback()
-
-        if self.playback_thread and self.playback_thread.is_alive():
-            self.playback_thread.join(timeout=1.0)
+        self._close_stream()
 
     def play_audio(self, audio_data: np.ndarray, on_interrupt: Optional[Callable] = None) -> bool:
         """
@@ -84,83 +89,95 @@ class AudioInterruptHandler:
         if sd is None:
             logger.warning("sounddevice not available; skipping audio playback")
             return True
-        if self.interrupt_requested:
-            logger.info("Playback skipped due to pending interrupt")
-            # Reset the flag for future calls
+        with self._play_lock:
+            if self.interrupt_requested:
+                logger.info("Playback skipped due to pending interrupt")
+                # Reset the flag for future calls
+                self.interrupt_requested = False
+                return False
+
+            # Reset interrupt flag for new playback
             self.interrupt_requested = False
-            return False
 
-        # Reset interrupt flag for new playback
-        self.interrupt_requested = False
+            if not self._ensure_stream():
+                return True
 
-        with self.buffer_lock:
-            self.audio_buffer = audio_data.copy()
+            self._load_clip(audio_data)
+            self._play_done.clear()
             self.is_playing = True
 
-        if on_interrupt:
-            self.interrupt_callbacks.append(on_interrupt)
-
-        # Start playback in separate thread
-        self.playback_thread = threading.Thread(
-            target=self._playback_worker,
-            daemon=True
-        )
-        self.playback_thread.start()
-
-        # Wait for playback to complete or be interrupted with adaptive timeout
-        try:
-            # Derive an expected duration based on samples and sample_rate, add a small cushion
-            expected_sec = max(3.0, min(120.0, (len(audio_data) / float(self.sample_rate)) + 1.0))
-        except Exception:
-            expected_sec = 15.0
-
-        self.playback_thread.join(timeout=expected_sec)
-        if self.playback_thread.is_alive():
-            # Give one more grace period before forcing an interrupt
-            logger.warning(
-                f"Audio playback exceeded expected duration ({expected_sec:.1f}s); extending wait"
-            )
-            self.playback_thread.join(timeout=min(30.0, expected_sec))
-
-        if self.playback_thread.is_alive():
-            logger.warning("Audio playback still active; forcing interruption")
-            self.interrupt_requested = True
-            self._stop_current_playback()
-
-        # Clean up callbacks
-        if on_interrupt and on_interrupt in self.interrupt_callbacks:
-            self.interrupt_callbacks.remove(on_interrupt)
-
-        return not self.interrupt_requested
+            if on_interrupt:
+                self.interrupt_callbacks.append(on_interrupt)
 
-    def _playback_worker(self):
-        """Worker thread for audio playback with interruption monitoring"""
-        if sd is None:
-            return
-        try:
-            # Create audio stream
-            self.current_stream = sd.OutputStream(
-                samplerate=self.sample_rate,
-                channels=1,
-                dtype=np.float32,
-                blocksize=int(self.sample_rate * 0.05),  # 50ms blocks
-                callback=self._audio_callback,
-                device=self.output_device
-            )
-
-            if self.current_stream:
-                with self.current_stream:
-                    while self.is_playing and not self.interrupt_requested:
-                        time.sleep(0.01)  # Small sleep to prevent busy waiting
-            else:
-                while self.is_playing and not self.interrupt_requested:
-                    time.sleep(0.01)  # Small sleep to prevent busy waiting
+            # Wait for playback to complete or be interrupted with adaptive timeout
+            try:
+                # Derive an expected duration based on samples and sample_rate, add a small cushion
+                expected_sec = max(3.0, min(120.0, (len(audio_data) / float(self.sample_rate)) + 1.0))
+            except Exception:
+                expected_sec = 15.0
+
+            if not self._play_done.wait(timeout=expected_sec):
+                # Give one more grace period before forcing an interrupt
+                logger.warning(
+                    f"Audio playback exceeded expected duration ({expected_sec:.1f}s); extending wait"
+                )
+                if not self._play_done.wait(timeout=min(30.0, expected_sec)):
+                    logger.warning("Audio playback still active; forcing interruption")
+                    self.interrupt_requested = True
+                    self._stop_current_playback()
+
+            # Clean up callbacks
+            if on_interrupt and on_interrupt in self.interrupt_callbacks:
+                self.interrupt_callbacks.remove(on_interrupt)
+
+            return not self.interrupt_requested
+
+    def _load_clip(self, audio_data: np.ndarray) -> None:
+        """Convert a clip to int16 in the reusable playback scratch"""
+        n = len(audio_data)
+        if n > len(self._play_buf):
+            # Grow geometrically so steady-state playback never allocates
+            size = max(n, 2 * len(self._play_buf))
+            self._play_f32 = np.empty(size, dtype=np.float32)
+            self._play_buf = np.empty(size, dtype=np.int16)
+        f32 = self._play_f32[:n]
+        np.multiply(np.ravel(audio_data), 32767.0, out=f32)
+        np.clip(f32, -32768.0, 32767.0, out=f32)
+        self._play_buf[:n] = f32
+        self._play_len = n
+        self._play_pos = 0
+
+    def _ensure_stream(self) -> bool:
+        """Open the persistent output stream on first use"""
+        with self._stream_lock:
+            if self.current_stream is not None:
+                return True
+            try:
+                stream = sd.OutputStream(
+                    samplerate=self.sample_rate,
+                    channels=1,
+                    dtype='int16',
+                    blocksize=int(self.sample_rate * 0.05),  # 50ms blocks
+                    callback=self._audio_callback,
+                    device=self.output_device
+                )
+                stream.start()
+            except Exception as e:
+                logger.error(f"Audio playback error: {e}")
+                return False
+            self.current_stream = stream
+            return True
 
-        except Exception as e:
-            logger.error(f"Audio playback error: {e}")
-        finally:
-            self.is_playing = False
-            self.current_stream = None
+    def _close_stream(self) -> None:
+        """Stop and close the persistent output stream"""
+        with self._stream_lock:
+            stream, self.current_stream = self.current_stream, None
+        if stream is not None:
+            try:
+                stream.stop()
+                stream.close()
+            except Exception as e:
+                logger.error(f"Error stopping audio stream: {e}")
 
     def _audio_callback(self, outdata: np.ndarray, frames: int, time_info, status):
         """Audio callback for real-time interruption monitoring"""
@@ -169,25 +186,14 @@ class AudioInterruptHandler:
             return
 
         try:
-            # Get next chunk of audio data
-            with self.buffer_lock:
-                if len(self.audio_buffer) == 0:
-                    self.is_playing = False
-                    outdata.fill(0)
-                    return
-
-                # Extract chunk
-                chunk_size = min(frames, len(self.audio_buffer))
-                chunk = self.audio_buffer[:chunk_size]
-                self.audio_buffer = self.audio_buffer[chunk_size:]
-
-                # Zero-pad if necessary
-                if len(chunk) < frames:
-                    padded_chunk = np.zeros(frames, dtype=np.float32)
-                    padded_chunk[:len(chunk)] = chunk
-                    chunk = padded_chunk
-
-            outdata[:] = chunk.reshape(-1, 1)
+            pos = self._play_pos
+            n = min(frames, self._play_len - pos)
+            outdata[:n, 0] = self._play_buf[pos:pos + n]
+            outdata[n:] = 0
+            self._play_pos = pos + n
+            if self._play_pos >= self._play_len:
+                self.is_playing = False
+                self._play_done.set()
 
         except Exception as e:
             logger.error(f"Audio callback error: {e}")
@@ -211,17 +217,9 @@ class AudioInterruptHandler:
         self.interrupt_callbacks.clear()
 
     def _stop_current_playback(self):
-        """Stop current audio playback"""
+        """Stop current audio playback; the output stream stays open for reuse"""
         self.is_playing = False
-
-        if self.current_stream:
-            try:
-                self.current_stream.stop()
-                self.current_stream.close()
-            except Exception as e:
-                logger.error(f"Error stopping audio stream: {e}")
-            finally:
-                self.current_stream = None
+        self._play_done.set()
 
     def check_voice_activity(self, audio_chunk: np.ndarray) -> bool:
         """
@@ -236,17 +234,25 @@ class AudioInterruptHandler:
         if not self.vad_enabled:
             return False
 
-        # Simple energy-based VAD
-        energy = np.sqrt(np.mean(audio_chunk ** 2))
-
-        # Update VAD buffer
-        self.vad_buffer = np.roll(self.vad_buffer, -len(audio_chunk))
-        self.vad_buffer[-len(audio_chunk):] = audio_chunk
-
-        # Calculate RMS of recent audio
-        rms = np.sqrt(np.mean(self.vad_buffer ** 2))
-
-        return rms > self.vad_threshold
+        # Write the chunk into the 100ms window in place (ring order); this
+        # runs for every mic block while speaking, so nothing is allocated
+        chunk = np.ravel(audio_chunk)
+        n = len(chunk)
+        size = self.vad_buffer_size
+        if n >= size:
+            self.vad_buffer[:] = chunk[n - size:]
+            self._vad_pos = 0
+        elif n:
+            pos = self._vad_pos
+            first = min(n, size - pos)
+            self.vad_buffer[pos:pos + first] = chunk[:first]
+            if first < n:
+                self.vad_buffer[:n - first] = chunk[first:]
+            self._vad_pos = (pos + n) % size
+
+        # RMS of recent audio > threshold, compared on energy to skip the sqrt
+        energy = float(np.dot(self.vad_buffer, self.vad_buffer))
+        return energy > self.vad_threshold * self.vad_threshold * size
 
     def set_vad_threshold(self, threshold: float):
         """Set voice activity detection threshold"""
@@ -263,7 +269,7 @@ class AudioInterruptHandler:
         return {
             'is_playing': self.is_playing,
             'interrupt_requested': self.interrupt_requested,
-            'buffer_size': len(self.audio_buffer),
+            'buffer_size': self._play_len - self._play_pos,
             'vad_enabled': self.vad_enabled,
             'vad_threshold': self.vad_threshold
         }
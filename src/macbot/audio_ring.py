@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+MacBot Audio Ring Buffer
+Preallocated single-producer/single-consumer sample buffer between the
+sounddevice input callback and the transcription loop.
+"""
+import threading
+from typing import Optional
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Lock-free SPSC ring buffer of audio samples.
+
+    The producer (audio callback) only advances ``_head`` and the consumer
+    only advances ``_tail``. Both are monotonically increasing sample counts
+    whose assignment is atomic under the GIL, so neither side takes a lock
+    and no memory is allocated after construction. If the consumer falls
+    more than ``capacity`` samples behind, the oldest audio is dropped.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float32):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._buf = np.zeros(capacity, dtype=dtype)
+        self._capacity = capacity
+        self._head = 0  # total samples written (producer-owned)
+        self._tail = 0  # total samples consumed (consumer-owned)
+        self._data_ready = threading.Event()
+        self.overruns = 0  # consumer-side count of dropped-audio events
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def available(self) -> int:
+        """Number of samples ready to be read"""
+        return min(self._head - self._tail, self._capacity)
+
+    def write(self, samples: np.ndarray) -> None:
+        """Copy samples into the ring (producer side)."""
+        n = len(samples)
+        if n == 0:
+            return
+        if n > self._capacity:
+            samples = samples[-self._capacity:]
+            n = self._capacity
+
+        head = self._head
+        start = head % self._capacity
+        first = min(n, self._capacity - start)
+        self._buf[start:start + first] = samples[:first]
+        if first < n:
+            self._buf[:n - first] = samples[first:]
+
+        self._head = head + n
+        self._data_ready.set()
+
+    def read_into(self, out: np.ndarray) -> int:
+        """Copy up to ``len(out)`` samples into ``out`` (consumer side).
+
+        Returns:
+            int: Number of samples copied
+        """
+        head = self._head
+        tail = self._tail
+        if head - tail > self._capacity:
+            # Producer lapped us; skip to the oldest sample still in the ring
+            self.overruns += 1
+            tail = head - self._capacity
+
+        n = min(len(out), head - tail)
+        if n <= 0:
+            return 0
+
+        start = tail % self._capacity
+        first = min(n, self._capacity - start)
+        np.copyto(out[:first], self._buf[start:start + first])
+        if first < n:
+            np.copyto(out[first:n], self._buf[:n - first])
+
+        self._tail = tail + n
+        return n
+
+    def peek(self, n: int) -> np.ndarray:
+        """Return a zero-copy view of up to ``n`` unread samples (consumer side).
+
+        The view ends at the edge of the backing store, so it can be shorter
+        than ``n`` when the readable region wraps; the remainder is returned
+        by the next call. It aliases ring memory and must be consumed before
+        the producer writes another ``capacity`` samples.
+        """
+        head = self._head
+        tail = self._tail
+        if head - tail > self._capacity:
+            self.overruns += 1
+            tail = head - self._capacity
+            self._tail = tail
+
+        start = tail % self._capacity
+        n = min(n, head - tail, self._capacity - start)
+        return self._buf[start:start + max(0, n)]
+
+    def advance(self, n: int) -> None:
+        """Mark ``n`` samples returned by peek() as consumed"""
+        self._tail += n
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until samples are available or the timeout expires"""
+        if self._head != self._tail:
+            return True
+        self._data_ready.clear()
+        # Re-check after clearing so a write racing with clear() is not missed
+        if self._head != self._tail:
+            return True
+        return self._data_ready.wait(timeout)
+
+    def clear(self) -> None:
+        """Discard all unread samples (consumer side)"""
+        self._tail = self._head
@@ -11,6 +11,13 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+def dashboard():
+    """Web dashboard entry point (``macbot-dashboard``). The dashboard is
+    imported here, not at module level, so worker processes that re-import
+    the __main__ module do not load it"""
+    from macbot.web_dashboard import main as dashboard_main
+    dashboard_main()
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
@@ -54,8 +61,7 @@ Examples:
             from macbot.orchestrator import main as orchestrator_main
             orchestrator_main()
         elif args.command == 'dashboard':
-            from macbot.web_dashboard import main as dashboard_main
-            dashboard_main()
+            dashboard()
         elif args.command == 'rag':
             from macbot.rag_server import main as rag_main
             rag_main()
@@ -306,6 +306,13 @@ def get_llm_temperature() -> float:
 def get_llm_max_tokens() -> int:
     return get_typed("models.llm.max_tokens", 200, int)
 
+def get_llm_expected_quant() -> str:
+    """Get the GGUF quantization the LLM server should be running (empty: any)"""
+    env_quant = os.getenv("MACBOT_LLM_QUANT", "")
+    if env_quant:
+        return env_quant
+    return str(get("models.llm.expected_quant", "") or "")
+
 
 def get_system_prompt() -> str:
     return str(get("prompts.system", "You are MacBot, a helpful AI assistant running locally on macOS."))
@@ -338,6 +345,22 @@ def get_stt_bin() -> str:
 def get_stt_model() -> str:
     return os.path.abspath(str(get("models.stt.model", "models/whisper.cpp/models/ggml-base.en.bin")))
 
+def get_stt_quantized_model() -> Optional[str]:
+    """Get the quantized whisper.cpp model path, if one is configured and present"""
+    path = get("models.stt.quantized_model", "models/whisper.cpp/models/ggml-base.en-q5_1.bin")
+    if not path:
+        return None
+    path = os.path.abspath(str(path))
+    return path if os.path.exists(path) else None
+
+def get_stt_server_bin() -> str:
+    """whisper.cpp server binary used by the dashboard to keep the STT model loaded"""
+    return os.path.abspath(str(get("models.stt.server_bin", "models/whisper.cpp/build/bin/whisper-server")))
+
+def get_stt_server_port() -> int:
+    """Loopback port for the dashboard's whisper.cpp server (0 disables it)"""
+    return get_typed("models.stt.server_port", 8178, int)
+
 def get_stt_language() -> str:
     return str(get("models.stt.language", "en"))
 
@@ -393,6 +416,10 @@ def get_tts_buffer_size() -> int:
     """Get TTS buffer size for streaming"""
     return get_typed("voice_assistant.performance.tts_buffer_size", 180, int)
 
+def get_tts_first_chunk_size() -> int:
+    """Get the buffer size at which a reply's first clause is cut without a boundary"""
+    return get_typed("voice_assistant.performance.tts_first_chunk_size", 60, int)
+
 def get_tts_cache_size() -> int:
     """Get TTS cache size"""
     return get_typed("voice_assistant.performance.tts_cache_size", 100, int)
@@ -409,6 +436,54 @@ def get_tts_optimize_for_speed() -> bool:
     """Get TTS optimize for speed status"""
     return get_typed("voice_assistant.performance.tts_optimize_for_speed", True, bool)
 
+def get_response_cache_enabled() -> bool:
+    """Get LLM response cache enabled status"""
+    return get_typed("voice_assistant.performance.response_cache_enabled", True, bool)
+
+def get_response_cache_size() -> int:
+    """Get maximum number of cached LLM replies"""
+    return get_typed("voice_assistant.performance.response_cache_size", 128, int)
+
+def get_response_cache_ttl() -> float:
+    """Get seconds a cached LLM reply stays valid"""
+    return get_typed("voice_assistant.performance.response_cache_ttl_sec", 60.0, float)
+
+def get_llm_health_ttl() -> float:
+    """Get seconds a successful LLM health probe is reused"""
+    return get_typed("voice_assistant.performance.llm_health_ttl_sec", 5.0, float)
+
+def get_llm_health_negative_ttl() -> float:
+    """Get seconds a failed LLM health probe is reused before probing again"""
+    return get_typed("voice_assistant.performance.llm_health_negative_ttl_sec", 1.0, float)
+
+def get_llm_prefill_warmup_enabled() -> bool:
+    """Check whether the LLM prompt cache is warmed when the user starts speaking"""
+    return get_typed("voice_assistant.performance.llm_prefill_warmup", True, bool)
+
+def get_llm_prefill_interval() -> float:
+    """Get the minimum seconds between two LLM prompt cache warmups"""
+    return get_typed("voice_assistant.performance.llm_prefill_interval_sec", 30.0, float)
+
+def get_filler_enabled() -> bool:
+    """Check whether a short acknowledgement is spoken while a slow LLM reply starts"""
+    return get_typed("voice_assistant.performance.filler_enabled", True, bool)
+
+def get_filler_phrase() -> str:
+    """Get the acknowledgement spoken while waiting for the first LLM token"""
+    return get_typed("voice_assistant.performance.filler_phrase", "One moment.", str)
+
+def get_filler_delay_sec() -> float:
+    """Get seconds without an LLM token before the acknowledgement is spoken"""
+    return get_typed("voice_assistant.performance.filler_delay_sec", 0.7, float)
+
+def get_speculative_reply_enabled() -> bool:
+    """Check whether the LLM may start on a partial transcript before end of turn"""
+    return get_typed("voice_assistant.performance.speculative_reply", True, bool)
+
+def get_speculative_silence_sec() -> float:
+    """Get seconds of silence after which a speculative LLM request starts"""
+    return get_typed("voice_assistant.performance.speculative_silence_sec", 0.15, float)
+
 def get_piper_quantized_path() -> Optional[str]:
     """Get quantized Piper model path"""
     path = get("models.tts.piper.quantized_path")
@@ -469,6 +544,11 @@ def get_enabled_tools() -> List[str]:
     return list(get("tools.enabled", []))
 
 
+def get_web_dashboard_async_mode() -> str:
+    """Get the Socket.IO server mode for the dashboard: threading, eventlet or gevent"""
+    mode = str(get("services.web_dashboard.async_mode", "threading") or "threading").lower()
+    return mode if mode in ("threading", "eventlet", "gevent") else "threading"
+
 def get_web_dashboard_host_port() -> tuple[str, int]:
     host = str(get("services.web_dashboard.host", "0.0.0.0"))
     try:
@@ -92,34 +92,38 @@ class ConversationManager:
     def start_conversation(self, conversation_id: Optional[str] = None) -> str:
         """Start a new conversation or resume existing one"""
         with self.lock:
-            if conversation_id is None:
-                conversation_id = f"conv_{int(time.time())}"
-
-            current_time = time.time()
-
-            # Check if we have an existing context that's still valid
-            if (self.current_context and
-                self.current_context.conversation_id == conversation_id and
-                (current_time - self.current_context.last_activity) < self.context_timeout):
-
-                # Resume existing conversation
-                self.current_context.last_activity = current_time
-                self.current_context.current_state = ConversationState.IDLE
-                logger.info(f"Resumed conversation: {conversation_id}")
-            else:
-                # Start new conversation
-                self.current_context = ConversationContext(
-                    conversation_id=conversation_id,
-                    start_time=current_time,
-                    last_activity=current_time,
-                    turn_count=0,
-                    current_state=ConversationState.IDLE
-                )
-                logger.info(f"Started new conversation: {conversation_id}")
+            conversation_id = self._start_conversation_locked(conversation_id)
 
         self._notify_state_change()
         return conversation_id
 
+    def _start_conversation_locked(self, conversation_id: Optional[str]) -> str:
+        if conversation_id is None:
+            conversation_id = f"conv_{int(time.time())}"
+
+        current_time = time.time()
+
+        # Check if we have an existing context that's still valid
+        if (self.current_context and
+            self.current_context.conversation_id == conversation_id and
+            (current_time - self.current_context.last_activity) < self.context_timeout):
+
+            # Resume existing conversation
+            self.current_context.last_activity = current_time
+            self.current_context.current_state = ConversationState.IDLE
+            logger.info(f"Resumed conversation: {conversation_id}")
+        else:
+            # Start new conversation
+            self.current_context = ConversationContext(
+                conversation_id=conversation_id,
+                start_time=current_time,
+                last_activity=current_time,
+                turn_count=0,
+                current_state=ConversationState.IDLE
+            )
+            logger.info(f"Started new conversation: {conversation_id}")
+        return conversation_id
+
     def update_state(self, new_state: ConversationState, metadata: Optional[Dict[str, Any]] = None):
         """Update conversation state"""
         should_notify = False
@@ -147,23 +151,43 @@ class ConversationManager:
 
         with self.lock:
             if self.current_context:
-                self.current_context.user_input = text
-                self.current_context.turn_count += 1
-                self.current_context.last_activity = time.time()
-
-                # Add to history
-                message = Message(
-                    timestamp=time.time(),
-                    sender="user",
-                    content=text,
-                    message_type="text",
-                    metadata=metadata or {},
-                )
-                self._add_to_history(message)
+                self._add_user_input_locked(text, metadata)
 
         self.update_state(ConversationState.PROCESSING)
         logger.info(f"User input added: {text[:50]}...")
 
+    def begin_turn(self, text: str, conversation_id: Optional[str] = None,
+                   metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Start (or resume) a conversation and record the user's utterance.
+
+        Same result as start_conversation() followed by add_user_input(), but
+        applied under one lock hold with a single state-change notification
+        (PROCESSING) instead of three.
+        """
+        with self.lock:
+            conversation_id = self._start_conversation_locked(conversation_id)
+            self._add_user_input_locked(text, metadata)
+            self.current_context.current_state = ConversationState.PROCESSING
+
+        self._notify_state_change()
+        logger.info(f"User input added: {text[:50]}...")
+        return conversation_id
+
+    def _add_user_input_locked(self, text: str, metadata: Optional[Dict[str, Any]]) -> None:
+        self.current_context.user_input = text
+        self.current_context.turn_count += 1
+        self.current_context.last_activity = time.time()
+
+        # Add to history
+        message = Message(
+            timestamp=time.time(),
+            sender="user",
+            content=text,
+            message_type="text",
+            metadata=metadata or {},
+        )
+        self._add_to_history(message)
+
     def start_response(self, response_text: str = ""):
         """Start AI response"""
         should_update = False
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+MacBot Document Text - Plain-text extraction for uploaded documents
+
+Extraction runs in worker processes (see web_dashboard.upload_documents), so
+this module only imports the parser a document actually needs.
+"""
+import os
+from typing import Optional
+
+# File extension -> document type reported to the RAG server
+DOCUMENT_KINDS = {'.txt': 'text', '.pdf': 'pdf', '.docx': 'docx'}
+
+
+class DocumentTextError(ValueError):
+    """A document could not be turned into text; the message is user-facing"""
+
+
+def document_kind(filename: str) -> Optional[str]:
+    """Return the document type for ``filename``, or None if unsupported"""
+    return DOCUMENT_KINDS.get(os.path.splitext(filename.lower())[1])
+
+
+def _pdf_text(path: str) -> str:
+    """Extract PDF text with PDFium when installed, else with pure-Python PyPDF2"""
+    try:
+        import pypdfium2 as pdfium  # type: ignore
+    except ImportError:
+        pdfium = None
+
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(path)
+        try:
+            parts = []
+            for page in pdf:
+                textpage = page.get_textpage()
+                parts.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+        finally:
+            pdf.close()
+        return "\n".join(parts).strip()
+
+    try:
+        import PyPDF2  # type: ignore
+    except Exception:
+        raise DocumentTextError("PDF support requires pypdfium2 or PyPDF2")
+    with open(path, 'rb') as fh:
+        reader = PyPDF2.PdfReader(fh)
+        return "\n".join([page.extract_text() or '' for page in reader.pages]).strip()
+
+
+def extract_text(path: str, kind: str) -> str:
+    """Read the document at ``path`` and return its stripped text"""
+    if kind == 'text':
+        with open(path, 'rb') as fh:
+            return fh.read().decode('utf-8', errors='ignore')
+
+    if kind == 'pdf':
+        content = _pdf_text(path)
+        if not content:
+            raise DocumentTextError("no extractable text")
+        return content
+
+    if kind == 'docx':
+        try:
+            import docx  # type: ignore
+        except Exception:
+            raise DocumentTextError("DOCX support requires python-docx")
+        document = docx.Document(path)
+        content = "\n".join([p.text for p in document.paragraphs if p.text]).strip()
+        if not content:
+            raise DocumentTextError("empty or unreadable document")
+        return content
+
+    raise DocumentTextError("unsupported file type (txt, pdf, docx supported)")
@@ -21,6 +21,10 @@ from .logging_utils import setup_logger
 # Unified logging
 logger = setup_logger("macbot.health_monitor", "logs/health_monitor.log")
 
+# Periodic probes reuse keep-alive connections instead of a new socket per check
+_http = requests.Session()
+_http.mount("http://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=0))
+
 class ServiceStatus(Enum):
     HEALTHY = "healthy"
     DEGRADED = "degraded"
@@ -162,7 +166,7 @@ class HealthMonitor:
         def check_llm_server():
             try:
                 llm_url = CFG.get_llm_server_url()
-                response = requests.get(f"{llm_url.replace('/v1/chat/completions', '/health')}", timeout=5)
+                response = _http.get(f"{llm_url.replace('/v1/chat/completions', '/health')}", timeout=5)
                 return response.status_code == 200
             except:
                 return False
@@ -171,7 +175,7 @@ class HealthMonitor:
         def check_rag_server():
             try:
                 rag_url = CFG.get_rag_base_url()
-                response = requests.get(f"{rag_url}/health", timeout=5)
+                response = _http.get(f"{rag_url}/health", timeout=5)
                 return response.status_code == 200
             except:
                 return False
@@ -180,7 +184,7 @@ class HealthMonitor:
         def check_web_dashboard():
             try:
                 host, port = CFG.get_web_dashboard_host_port()
-                response = requests.get(f"http://{host}:{port}/health", timeout=5)
+                response = _http.get(f"http://{host}:{port}/health", timeout=5)
                 return response.status_code == 200
             except:
                 return False
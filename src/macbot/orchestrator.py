@@ -230,11 +230,12 @@ class MacBotOrchestrator:
         env = os.environ.copy()
         env['PYTHONPATH'] = os.path.join(base_dir, 'src')
 
-        # Web dashboard
+        # Web dashboard; launched through the CLI so its upload parse workers
+        # re-import the light macbot.cli as __main__, not the dashboard
         wd_host, wd_port = CFG.get_web_dashboard_host_port()
         self.service_definitions['web_gui'] = ServiceDefinition(
             name='web_gui',
-            command=[py, '-m', 'macbot.web_dashboard'],
+            command=[py, '-m', 'macbot.cli', 'dashboard'],
             health_endpoint=f"http://{wd_host}:{wd_port}",
             env=env,
             cwd=base_dir,
@@ -707,6 +708,7 @@ class MacBotOrchestrator:
         for name, process in list(self.processes.items()):
             if process.poll() is not None:
                 logger.warning(f"Process {name} died, restarting...")
+                self._announce_service_down(name)
                 self._log_process_output(name, process)
                 self._cleanup_process_streams(name)
                 for stream in (getattr(process, 'stdout', None), getattr(process, 'stderr', None)):
@@ -718,6 +720,15 @@ class MacBotOrchestrator:
                 self.processes.pop(name, None)
                 self.restart_process(name)
     
+    def _announce_service_down(self, name: str) -> None:
+        """Tell bus clients a service died so they can stop relying on it"""
+        if not self.bus_client:
+            return
+        try:
+            self.bus_client.send_message({'type': 'service_down', 'service': name})
+        except Exception as e:
+            logger.debug(f"Could not announce {name} down: {e}")
+
     def restart_process(self, name: str) -> Dict[str, Any]:
         """Restart a specific process"""
         proc = self.processes.get(name)
@@ -4,6 +4,7 @@
 (function () {
   const state = {
     socket: null,
+    drafts: new Map(), // reply_to id -> assistant bubble filled by llm_token events
     sse: null,
     isRecording: false,
     mediaRecorder: null,
@@ -37,6 +38,7 @@
     div.textContent = message;
     history.appendChild(div);
     history.scrollTop = history.scrollHeight;
+    return div;
   }
   window.addChatMessage = addChatMessage;
 
@@ -454,17 +456,40 @@
       state.socket = io({ transports: ['websocket','polling'], reconnection: true });
       state.socket.on('connect', () => console.log('WS connected'));
       state.socket.on('disconnect', () => console.log('WS disconnected'));
-      state.socket.on('conversation_update', (data) => {
+      const onConversationUpdate = (data) => {
         if (!data) return;
         if (data.type === 'assistant_message') {
-          addChatMessage(data.content, 'assistant'); setStatus('Ready', 'info');
+          // Replace the streamed draft with the final reply
+          const draft = data.reply_to && state.drafts.get(data.reply_to);
+          if (draft) { draft.textContent = data.content; state.drafts.delete(data.reply_to); }
+          else addChatMessage(data.content, 'assistant');
+          setStatus('Ready', 'info');
           if (isSpeakEnabled()) speakViaAssistant(data.content);
         } else if (data.type === 'user_message') {
           // Don't add user messages here - they're already added when sent
           // addChatMessage(data.content, 'user');
         } else if (data.type === 'error_message') {
+          const draft = data.reply_to && state.drafts.get(data.reply_to);
+          if (draft) { draft.remove(); state.drafts.delete(data.reply_to); }
           addChatMessage(data.content, 'system'); setStatus('Ready','info');
         }
+      };
+      // Per-client replies arrive singly; broadcasts are coalesced into batches
+      state.socket.on('conversation_update', onConversationUpdate);
+      state.socket.on('llm_token', (data) => {
+        if (!data || !data.text || !data.reply_to) return;
+        let draft = state.drafts.get(data.reply_to);
+        if (!draft) {
+          draft = addChatMessage('', 'assistant');
+          if (!draft) return;
+          state.drafts.set(data.reply_to, draft);
+        }
+        draft.textContent += data.text;
+        const history = byId('chat-history');
+        if (history) history.scrollTop = history.scrollHeight;
+      });
+      state.socket.on('conversation_batch', (batch) => {
+        ((batch && batch.events) || []).forEach(onConversationUpdate);
       });
       state.socket.on('assistant_state', (data) => {
         if (!data || !data.type) return;
@@ -16,6 +16,9 @@ import requests
 
 from . import config as cfg
 
+# Keep-alive connections to the RAG server, shared by every tool call
+_http = requests.Session()
+
 
 def _get_rag_auth_token() -> Optional[str]:
     """Return the first configured RAG API token, if present."""
@@ -140,17 +143,17 @@ def rag_search(query: str, n_results: int = 3) -> str:
             "X-API-Token": token,
         }
     try:
-        # quick health check
+        # The short connect timeout fails fast when the server is down, so no
+        # separate /health round trip is needed
         try:
-            requests.get(f"{base}/health", timeout=2, headers=headers)
-        except Exception:
+            r = _http.post(
+                f"{base}/api/search",
+                json={"query": query},
+                timeout=(2, 8),
+                headers=headers,
+            )
+        except (requests.exceptions.ConnectionError, requests.exceptions.ConnectTimeout):
             return "Knowledge base is unavailable"
-        r = requests.post(
-            f"{base}/api/search",
-            json={"query": query},
-            timeout=8,
-            headers=headers,
-        )
         if token and r.status_code in {401, 403}:
             detail = ""
             try:
@@ -8,6 +8,12 @@ from .logging_utils import setup_logger
 
 logger = setup_logger("macbot.validation", "logs/macbot.log")
 
+# Control characters except newlines and tabs
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]')
+# Every dangerous pattern needs one of these characters to match, so text
+# without them (most chat messages) skips the pattern scans entirely
+_DANGEROUS_TRIGGER_CHARS = ('<', ':', '=')
+
 class ValidationError(Exception):
     """Raised when input validation fails"""
     pass
@@ -58,8 +64,10 @@ class InputValidator:
         # Basic sanitization
         sanitized = self._sanitize_html(text)
 
-        # Remove control characters except newlines and tabs
-        sanitized = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', sanitized)
+        # Remove control characters except newlines and tabs; isprintable()
+        # is a single C-level pass that rules them all out for typical text
+        if not sanitized.isprintable():
+            sanitized = _CONTROL_CHARS_RE.sub('', sanitized)
 
         return sanitized.strip()
 
@@ -136,6 +144,8 @@ class InputValidator:
 
     def _sanitize_html(self, text: str) -> str:
         """Remove potentially dangerous HTML/JS"""
+        if not any(ch in text for ch in _DANGEROUS_TRIGGER_CHARS):
+            return text
         for pattern in self.COMPILED_PATTERNS:
             text = pattern.sub('', text)
         return text
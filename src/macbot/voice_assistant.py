@@ -1,13 +1,18 @@
+import atexit
+import contextlib
 import os
 import queue
 import subprocess
+import io
 import json
+import re
 import tempfile
 import time
 import threading
 import sys
 import signal
-import uuid
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import psutil
 import platform
@@ -22,10 +27,11 @@ except Exception as _sf_imp_err:
 import requests
 import logging
 from .logging_utils import setup_logger
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterator, List, Optional, Any
 from pathlib import Path
 
 from .audio_interrupt import AudioInterruptHandler
+from .audio_ring import AudioRingBuffer
 from .conversation_manager import (
     ConversationManager,
     ConversationContext,
@@ -36,51 +42,88 @@ from .message_bus_client import MessageBusClient
 from . import config as CFG
 from . import tools
 from .validation import validate_chat_message
-from .resource_manager import get_resource_manager, managed_temp_file, managed_resource, track_resource
+from .resource_manager import get_resource_manager, managed_resource, track_resource
 
 # Configure logging with structured logging
 logger = setup_logger("macbot.voice_assistant", "logs/voice_assistant.log", structured=True)
 
+# Shared keep-alive HTTP session for the dashboard, health and LLM calls;
+# all of them hit localhost services many times per turn
+_http = requests.Session()
+_http.mount("http://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 # Dashboard notifications
 _WD_HOST, _WD_PORT = CFG.get_web_dashboard_host_port()
 VA_HOST, VA_PORT = CFG.get_voice_assistant_host_port()
 
-def _notify_dashboard_state(event_type: str, message: str = "") -> None:
-    """Non-blocking notify with small retry/backoff to improve reliability."""
-    url = f"http://{_WD_HOST}:{_WD_PORT}/api/assistant-event"
+_DASHBOARD_EVENT_URL = f"http://{_WD_HOST}:{_WD_PORT}/api/assistant-event"
+_notify_q: "queue.Queue[tuple]" = queue.Queue(maxsize=32)
+_notify_worker: Optional[threading.Thread] = None
+_notify_worker_lock = threading.Lock()
+
+def _send_dashboard_event(event_type: str, message: str) -> None:
+    """POST one event with small retry/backoff to improve reliability."""
     payload = {"type": event_type}
     if message:
         payload["message"] = message
-
-    def _send():
-        delay = 0.15
-        for _ in range(3):
+    delay = 0.15
+    for _ in range(3):
+        try:
+            _http.post(_DASHBOARD_EVENT_URL, json=payload, timeout=(0.2, 0.8))
+            return
+        except Exception:
+            time.sleep(delay)
+            delay *= 2
+    logger.debug("Dashboard notify dropped after retries")
+
+def _notify_worker_loop() -> None:
+    """Deliver queued dashboard events in order, one POST at a time."""
+    while True:
+        batch = [_notify_q.get()]
+        while True:
             try:
-                requests.post(url, json=payload, timeout=0.8)
-                return
-            except Exception as e:
-                try:
-                    time.sleep(delay)
-                except Exception:
-                    pass
-                delay *= 2
-        logger.debug("Dashboard notify dropped after retries")
+                batch.append(_notify_q.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            previous = None
+            for event in batch:
+                # A backlog of identical consecutive events carries no extra state
+                if event != previous:
+                    _send_dashboard_event(*event)
+                previous = event
+        finally:
+            for _ in batch:
+                _notify_q.task_done()
 
+def _notify_dashboard_state(event_type: str, message: str = "") -> None:
+    """Queue a dashboard state event; never blocks the caller."""
+    global _notify_worker
+    if _notify_worker is None:
+        with _notify_worker_lock:
+            if _notify_worker is None:
+                _notify_worker = threading.Thread(target=_notify_worker_loop, name="DashboardNotify", daemon=True)
+                _notify_worker.start()
     try:
-        threading.Thread(target=_send, daemon=True).start()
-    except Exception as e:
-        logger.debug(f"Notify thread failed: {e}")
+        _notify_q.put_nowait((event_type, message))
+    except queue.Full:
+        logger.debug("Dashboard notify queue full; dropping %s", event_type)
 
 # No heavy optional deps needed here; RAG is handled via HTTP client.
 
 LLAMA_SERVER = CFG.get_llm_server_url()
 LLAMA_TEMP   = CFG.get_llm_temperature()
 LLAMA_MAXTOK = CFG.get_llm_max_tokens()
+LLAMA_HEALTH_URL = LLAMA_SERVER.replace("/v1/chat/completions", "/health")
+LLAMA_PROPS_URL = LLAMA_SERVER.replace("/v1/chat/completions", "/props")
+LLM_EXPECTED_QUANT = CFG.get_llm_expected_quant().strip().upper()
 
 SYSTEM_PROMPT = CFG.get_system_prompt()
 
 WHISPER_BIN   = CFG.get_stt_bin()
-WHISPER_MODEL = CFG.get_stt_model()
+# Prefer a quantized ggml model when present: the encoder is memory-bound,
+# so halving weight bandwidth roughly doubles CPU throughput
+WHISPER_MODEL = CFG.get_stt_quantized_model() or CFG.get_stt_model()
 WHISPER_LANG  = CFG.get_stt_language()
 
 VOICE    = CFG.get_tts_voice()
@@ -97,12 +140,33 @@ INTERRUPT_THRESHOLD = CFG.get_interrupt_threshold()
 INTERRUPT_COOLDOWN = CFG.get_interrupt_cooldown()
 CONVERSATION_TIMEOUT = CFG.get_conversation_timeout()
 CONTEXT_BUFFER_SIZE = CFG.get_context_buffer_size()
+MIC_MUTE_WHILE_TTS = CFG.mic_mute_while_tts()
+
+# Per-turn performance settings, read once at startup
+TTS_BUFFER_SIZE = CFG.get_tts_buffer_size()
+TTS_FIRST_CHUNK_SIZE = CFG.get_tts_first_chunk_size()
+RESPONSE_CACHE_ENABLED = CFG.get_response_cache_enabled()
+RESPONSE_CACHE_SIZE = max(1, CFG.get_response_cache_size())
+RESPONSE_CACHE_TTL = CFG.get_response_cache_ttl()
+HEALTH_CHECK_CACHE_TTL = CFG.get_llm_health_ttl()  # reuse a passing LLM health probe
+HEALTH_CHECK_NEGATIVE_TTL = CFG.get_llm_health_negative_ttl()  # shorter, so recovery is seen quickly
+LLM_PREFILL_WARMUP = CFG.get_llm_prefill_warmup_enabled()
+LLM_PREFILL_INTERVAL = CFG.get_llm_prefill_interval()
+FILLER_ENABLED = CFG.get_filler_enabled()
+FILLER_PHRASE = CFG.get_filler_phrase().strip()
+FILLER_DELAY = CFG.get_filler_delay_sec()
+SPECULATIVE_REPLY = CFG.get_speculative_reply_enabled()
+SPECULATIVE_SILENCE = CFG.get_speculative_silence_sec()
 
 # Constants
 MAX_INPUT_LENGTH = 2000  # Maximum input length for safety
 LLM_TIMEOUT = 120  # LLM request timeout in seconds
 HEALTH_CHECK_TIMEOUT = 2  # Health check timeout in seconds
 TURNING_DELAY = 0.35  # Delay for turn detection in seconds
+# Endpointing compares integer time.monotonic_ns() readings against these
+TURNING_DELAY_NS = int(TURNING_DELAY * 1e9)
+SILENCE_HANG_NS = int(SILENCE_HANG * 1e9)
+SPECULATIVE_SILENCE_NS = int(SPECULATIVE_SILENCE * 1e9)
 TTS_SAMPLE_RATE = 24000  # TTS audio sample rate
 TTS_RATE_MULTIPLIER = 180  # TTS rate multiplier for pyttsx3
 
@@ -110,13 +174,24 @@ TTS_RATE_MULTIPLIER = 180  # TTS rate multiplier for pyttsx3
 MAX_CONCURRENT_TTS = 2  # Maximum concurrent TTS operations
 TTS_QUEUE_TIMEOUT = 5.0  # TTS queue timeout in seconds
 PERFORMANCE_LOG_INTERVAL = 10  # Log performance every N requests
+AUDIO_RING_SECONDS = 5.0  # Mic audio buffered between the input callback and the main loop
+SHUTDOWN_STEP_TIMEOUT = 2.0  # Max seconds to wait on each cleanup step at exit
+TURN_QUEUE_SIZE = 4  # Finished utterances that may wait for the LLM/TTS stage
+STT_QUEUE_SIZE = 64  # Voiced audio runs and turn markers that may wait for transcription
 
 # Optional Python bindings for whisper.cpp / whisper
 try:
     import whispercpp
 
     try:
-        _WHISPER_CTX = whispercpp.Whisper.from_pretrained("base.en")
+        if os.path.exists(WHISPER_MODEL):
+            try:
+                _WHISPER_CTX = whispercpp.Whisper.from_pretrained(WHISPER_MODEL)
+            except Exception as _perr:  # pragma: no cover - older bindings only take names
+                logger.warning(f"whispercpp could not load {WHISPER_MODEL}: {_perr}")
+                _WHISPER_CTX = whispercpp.Whisper.from_pretrained("base.en")
+        else:
+            _WHISPER_CTX = whispercpp.Whisper.from_pretrained("base.en")
         _WHISPER_IMPL = "whispercpp"
     except Exception as _werr:  # pragma: no cover - best effort
         logger.warning(f"Failed to init whispercpp: {_werr}")
@@ -247,119 +322,255 @@ tool_caller = ToolCaller()
 
 # RAG handled via external rag_server (see macbot.tools.rag_search)
 
+# ---- Optional: Numba-compiled VAD energy ----
+# A fused multiply-add loop without NumPy's per-call dispatch; used when numba
+# is installed (pip install macbot[performance]), NumPy otherwise.
+try:
+    from numba import njit
+
+    @njit(cache=True, fastmath=True)
+    def _frame_energies(samples, frame_len):  # pragma: no cover - compiled
+        n_frames = samples.size // frame_len
+        out = np.empty(n_frames, dtype=np.float32)
+        for f in range(n_frames):
+            acc = np.float32(0.0)
+            base = f * frame_len
+            for i in range(base, base + frame_len):
+                acc += samples[i] * samples[i]
+            out[f] = acc
+        return out
+
+    @njit(cache=True, fastmath=True)
+    def _voiced_run_bounds(samples, frame_len, min_energy):  # pragma: no cover - compiled
+        # Energy, threshold and run detection in one pass, without the
+        # per-call flag, padding and diff temporaries of voiced_runs()
+        n_frames = samples.size // frame_len
+        runs = np.empty((n_frames // 2 + 1, 2), dtype=np.int64)
+        n_runs = 0
+        in_run = False
+        for f in range(n_frames):
+            acc = np.float32(0.0)
+            base = f * frame_len
+            for i in range(base, base + frame_len):
+                acc += samples[i] * samples[i]
+            if acc > min_energy:
+                if not in_run:
+                    runs[n_runs, 0] = f
+                    in_run = True
+            elif in_run:
+                runs[n_runs, 1] = f
+                n_runs += 1
+                in_run = False
+        if in_run:
+            runs[n_runs, 1] = n_frames
+            n_runs += 1
+        return runs[:n_runs]
+
+    # Compile (or load cache) now, not mid-utterance
+    _frame_energies(np.zeros(2, dtype=np.float32), 1)
+    _voiced_run_bounds(np.zeros(2, dtype=np.float32), 1, 0.0)
+    HAS_NUMBA_VAD = True
+except Exception as _nb_err:
+    logger.debug(f"numba VAD kernel unavailable: {_nb_err}")
+    _frame_energies = None
+    _voiced_run_bounds = None
+    HAS_NUMBA_VAD = False
+
 # ---- Simple energy VAD ----
 def is_voiced(block: np.ndarray, thresh: float = VAD_THRESH) -> bool:
-    # Optimize: handle multi-dimensional arrays without explicit reshape
-    # Use ravel() for a view instead of flatten() for a copy
-    return np.sqrt(np.mean(block.ravel()**2)) > thresh
+    # RMS > thresh  <=>  sum(x^2) > thresh^2 * N; the dot product computes the
+    # energy without a block-sized temporary and the sqrt is not needed.
+    # ravel() is a view for the contiguous blocks we get from the ring.
+    flat = block.ravel()
+    if HAS_NUMBA_VAD and flat.dtype == np.float32 and flat.size:
+        return float(_frame_energies(flat, flat.size)[0]) > thresh * thresh * flat.size
+    return float(np.dot(flat, flat)) > thresh * thresh * flat.size
+
+def frame_voicing(samples: np.ndarray, frame_len: int, thresh: float = VAD_THRESH) -> np.ndarray:
+    """Vectorised is_voiced() over consecutive ``frame_len``-sample frames.
+
+    Trailing samples that do not fill a whole frame are ignored.
+    """
+    if HAS_NUMBA_VAD and samples.dtype == np.float32:
+        energy = _frame_energies(samples, frame_len)
+    else:
+        n_frames = len(samples) // frame_len
+        frames = samples[:n_frames * frame_len].reshape(n_frames, frame_len)
+        energy = np.einsum("ij,ij->i", frames, frames)
+    return energy > thresh * thresh * frame_len
+
+def voiced_runs(flags: np.ndarray) -> np.ndarray:
+    """Return ``[start, end)`` frame index pairs for each run of voiced frames"""
+    padded = np.concatenate(([False], flags, [False])).astype(np.int8)
+    return np.flatnonzero(np.diff(padded)).reshape(-1, 2)
+
+def voiced_frame_runs(samples: np.ndarray, frame_len: int, thresh: float = VAD_THRESH) -> np.ndarray:
+    """``voiced_runs(frame_voicing(samples, frame_len, thresh))`` in one pass when numba is available"""
+    if HAS_NUMBA_VAD and samples.dtype == np.float32:
+        return _voiced_run_bounds(samples, frame_len, thresh * thresh * frame_len)
+    return voiced_runs(frame_voicing(samples, frame_len, thresh))
 
 def check_llm_service_available() -> bool:
     """Check if LLM service is available"""
     try:
-        response = requests.get(LLAMA_SERVER.replace("/v1/chat/completions", "/health"), timeout=HEALTH_CHECK_TIMEOUT)
+        response = _http.get(LLAMA_HEALTH_URL, timeout=HEALTH_CHECK_TIMEOUT)
         return response.status_code == 200
     except Exception as e:
         logger.warning(f"LLM service health check failed: {e}")
         return False
 
-def validate_input(text: str, max_length: int = MAX_INPUT_LENGTH) -> bool:
-    """Validate user input to prevent issues"""
+# Quantization tag in a GGUF file name, e.g. "...-Q4_K_M.gguf" or "...-f16.gguf"
+_GGUF_QUANT_RE = re.compile(r"(?<![A-Za-z0-9])(I?Q\d(?:_[A-Za-z0-9]+)*|BF16|F16|F32)(?=[-.]|$)", re.IGNORECASE)
+_UNQUANTIZED = ("F16", "BF16", "F32")
+
+def gguf_quantization(model_path: str) -> Optional[str]:
+    """Return the quantization named in a GGUF file name, upper-cased, if any"""
+    name = os.path.basename(model_path)
+    if name.lower().endswith(".gguf"):
+        name = name[:-5]
+    matches = _GGUF_QUANT_RE.findall(name)
+    return matches[-1].upper() if matches else None
+
+def check_llm_quantization() -> Optional[str]:
+    """Warn when the running LLM is unquantized or not the expected quantization.
+
+    Decode throughput is bound by weight size, so this only logs; a mismatch
+    must not push the assistant into degraded mode.
+    """
     try:
-        validate_chat_message(text)
-        return True
+        props = _http.get(LLAMA_PROPS_URL, timeout=HEALTH_CHECK_TIMEOUT).json()
+    except Exception as e:
+        logger.debug(f"LLM props probe failed: {e}")
+        return None
+    model_path = str(props.get("model_path") or "")
+    quant = gguf_quantization(model_path)
+    if quant in _UNQUANTIZED:
+        logger.warning(
+            "LLM %s runs unquantized %s weights; a Q4_K_M GGUF with full GPU offload (-ngl 99) decodes several times faster",
+            os.path.basename(model_path), quant,
+        )
+    elif LLM_EXPECTED_QUANT and quant != LLM_EXPECTED_QUANT:
+        logger.warning("LLM %s reports quantization %s, expected %s",
+                       os.path.basename(model_path) or "model", quant or "unknown", LLM_EXPECTED_QUANT)
+    return quant
+
+_llm_health_cache: Dict[str, Any] = {"ok": False, "until": 0.0}
+
+def _llm_service_available_cached() -> bool:
+    """Return the LLM health status, probing only when the cached result expired.
+
+    A passing probe is reused for HEALTH_CHECK_CACHE_TTL seconds, a failing
+    one for HEALTH_CHECK_NEGATIVE_TTL.
+    """
+    now = time.monotonic()
+    if now < _llm_health_cache["until"]:
+        return _llm_health_cache["ok"]
+    ok = check_llm_service_available()
+    ttl = HEALTH_CHECK_CACHE_TTL if ok else HEALTH_CHECK_NEGATIVE_TTL
+    _llm_health_cache.update(ok=ok, until=now + ttl)
+    return ok
+
+def _invalidate_llm_health_cache() -> None:
+    """Force the next availability check to probe the LLM server again"""
+    _llm_health_cache["until"] = 0.0
+
+def _mark_llm_service_down() -> None:
+    """Report the LLM as unavailable without probing, until the negative TTL expires"""
+    _llm_health_cache.update(ok=False, until=time.monotonic() + HEALTH_CHECK_NEGATIVE_TTL)
+
+def prepare_transcript(text: str) -> Optional[str]:
+    """Validate a transcript and return its sanitized form, or None if invalid.
+
+    The turn uses the returned string for logging, conversation tracking and
+    the LLM, so the validator's work is not repeated or discarded.
+    """
+    try:
+        return validate_chat_message(text)
     except Exception as e:
         logger.warning(f"Input validation failed: {e}")
-        return False
+        return None
+
+def validate_input(text: str, max_length: int = MAX_INPUT_LENGTH) -> bool:
+    """Validate user input to prevent issues"""
+    return prepare_transcript(text) is not None
 
 # ---- Audio I/O ----
-audio_q = queue.Queue()
+_AUDIO_BLOCK_SIZE = int(SAMPLE_RATE * BLOCK_DUR)
+# A whole number of blocks, so peeked blocks never straddle the wrap point
+_audio_ring = AudioRingBuffer(_AUDIO_BLOCK_SIZE * max(1, int(AUDIO_RING_SECONDS / BLOCK_DUR)))
+
+# Last non-empty stream status (overflow etc.) from the audio callback; the
+# main loop reports it so terminal I/O never blocks the real-time thread
+_audio_status = None
 
 def _callback(indata: np.ndarray, frames: int, time_info, status) -> None:
     if status:
-        print(status, file=sys.stderr)
+        global _audio_status
+        _audio_status = status
     
     # Fast path: check if we should process audio at all
     try:
-        if CFG.mic_mute_while_tts() and tts_manager and tts_manager.audio_handler and getattr(tts_manager.audio_handler, 'is_playing', False):
+        if MIC_MUTE_WHILE_TTS and tts_manager and tts_manager.audio_handler and getattr(tts_manager.audio_handler, 'is_playing', False):
             return
     except Exception:
         pass
     
-    # Put audio data in queue for processing
-    audio_q.put(indata)
-
-    # Optimized interruptibility check - minimize lock time
-    if INTERRUPTION_ENABLED and tts_manager.audio_handler and conversation_manager:
-        # Quick state check without holding lock
-        current_context = conversation_manager.current_context
-        if (current_context and 
-            current_context.current_state == ConversationState.SPEAKING and
-            tts_manager.audio_handler.check_voice_activity(indata.flatten())):
-            
-            # Only acquire lock for the actual interrupt
-            conversation_manager.interrupt_response()
+    # The input stream is mono; copy the single channel straight into the
+    # preallocated ring (sounddevice reuses ``indata``) without locking.
+    # Barge-in detection happens in the main loop, keeping this real-time
+    # callback free of allocations and of the conversation manager's lock.
+    block = indata[:, 0] if indata.ndim > 1 else indata
+    _audio_ring.write(block)
 
 # ---- Whisper transcription ----
+def _wav_bytes(wav_f32: np.ndarray) -> bytes:
+    """Encode mono float32 audio as an in-memory 16-bit WAV file"""
+    import wave
+    pcm = np.clip(wav_f32, -1.0, 1.0)
+    pcm = (pcm * 32767.0).astype(np.int16)
+    buf = io.BytesIO()
+    with wave.open(buf, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)  # 16-bit
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+
 def _transcribe_cli(wav_f32: np.ndarray) -> str:
-    """Fallback transcription via whisper.cpp CLI using temp files."""
+    """Fallback transcription via whisper.cpp CLI, piping audio over stdin/stdout."""
     try:
-        with managed_temp_file(suffix=".wav") as tmp_file:
-            txt_path = f"{tmp_file.name}.txt"
-            try:
-                if sf is not None:
-                    sf.write(tmp_file.name, wav_f32, SAMPLE_RATE, subtype="PCM_16")
-                else:
-                    import wave
-                    with wave.open(tmp_file.name, 'wb') as wf:
-                        wf.setnchannels(1)
-                        wf.setsampwidth(2)  # 16-bit
-                        wf.setframerate(SAMPLE_RATE)
-                        # clip and convert to int16
-                        data_i16 = np.clip(wav_f32, -1.0, 1.0)
-                        data_i16 = (data_i16 * 32767.0).astype(np.int16)
-                        wf.writeframes(data_i16.tobytes())
-            except Exception as e:
-                logger.error(f"Failed to write WAV: {e}")
-                return ""
+        try:
+            wav_bytes = _wav_bytes(wav_f32)
+        except Exception as e:
+            logger.error(f"Failed to encode WAV: {e}")
+            return ""
 
-            try:
-                # call whisper.cpp
-                # -nt = no timestamps, -l language
-                # -otxt = output to text file
-                cmd = [
-                    WHISPER_BIN,
-                    "-m",
-                    WHISPER_MODEL,
-                    "-f",
-                    tmp_file.name,
-                    "-l",
-                    WHISPER_LANG,
-                    "-nt",
-                    "-otxt",
-                    "-of",
-                    tmp_file.name,
-                ]
-                proc = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            except subprocess.TimeoutExpired:
-                logger.error("Whisper transcription timed out")
-                return ""
+        try:
+            # call whisper.cpp
+            # -f - = read WAV from stdin, -nt = no timestamps, -l language;
+            # the transcript is printed to stdout, so no files touch the disk
+            cmd = [
+                WHISPER_BIN,
+                "-m",
+                WHISPER_MODEL,
+                "-f",
+                "-",
+                "-l",
+                WHISPER_LANG,
+                "-nt",
+            ]
+            proc = subprocess.run(cmd, input=wav_bytes, capture_output=True, timeout=30)
+        except subprocess.TimeoutExpired:
+            logger.error("Whisper transcription timed out")
+            return ""
 
-            try:
-                if proc.returncode != 0:
-                    logger.error(f"Whisper transcription failed: {proc.stderr}")
-                    return ""
-                if not os.path.exists(txt_path):
-                    logger.error("Whisper output file not found")
-                    return ""
-                with open(txt_path, "r") as rf:
-                    text = rf.read().strip()
-                return text
-            finally:
-                try:
-                    if os.path.exists(txt_path):
-                        os.unlink(txt_path)
-                except Exception as cleanup_err:
-                    logger.warning(f"Failed to cleanup Whisper output file {txt_path}: {cleanup_err}")
+        if proc.returncode != 0:
+            stderr = proc.stderr.decode("utf-8", errors="replace") if proc.stderr else ""
+            logger.error(f"Whisper transcription failed: {stderr}")
+            return ""
+        stdout = proc.stdout.decode("utf-8", errors="replace") if proc.stdout else ""
+        return " ".join(line.strip() for line in stdout.splitlines() if line.strip())
     except Exception as e:  # pragma: no cover
         logger.error(f"Transcription error: {e}")
         return ""
@@ -388,15 +599,22 @@ class StreamingTranscriber:
     """Optimized streaming transcriber with intelligent buffering and segment tracking."""
 
     def __init__(self, max_buffer_duration: float = 30.0, sample_rate: int = 16000) -> None:
-        self._buffer: np.ndarray = np.array([], dtype=np.float32)
+        # Retained audio lives in ``_arena[_start:_end]``. Appends write at
+        # ``_end`` and trimming only advances ``_start``; live samples are moved
+        # back to the front only when the arena's tail is full, so appending is
+        # amortized O(chunk) instead of re-copying the whole buffer every block.
+        self._max_buffer_samples = int(max_buffer_duration * sample_rate)
+        self._arena: np.ndarray = np.empty(max(1, 2 * self._max_buffer_samples), dtype=np.float32)
+        self._start: int = 0
+        self._end: int = 0
         self._buffer_offset: int = 0  # Absolute sample index of the first element in ``_buffer``
         self._processed_offset: int = 0  # Absolute index up to which audio has been transcribed
         self._next_sample_index: int = 0  # Absolute index assigned to the next appended sample
 
-        self._last_text: str = ""
+        # Transcript pieces of the current utterance, joined only when read
+        self._text_parts: List[str] = []
         self._segments: List[Dict[str, Any]] = []
 
-        self._max_buffer_samples = int(max_buffer_duration * sample_rate)
         self._sample_rate = sample_rate
         self._min_chunk_size = int(CFG.get_min_chunk_duration() * sample_rate)
 
@@ -410,16 +628,35 @@ class StreamingTranscriber:
         self._last_transcription_time = 0.0
         self._transcription_interval = CFG.get_transcription_interval()
 
+    @property
+    def _buffer(self) -> np.ndarray:
+        """View of the retained audio (no copy)"""
+        return self._arena[self._start:self._end]
+
+    def _append(self, chunk: np.ndarray) -> None:
+        n = len(chunk)
+        if self._end + n > len(self._arena):
+            live = self._end - self._start
+            if live + n > len(self._arena):
+                # Only hit if a single chunk outgrows the arena; grow it
+                arena = np.empty(max(live + n, 2 * len(self._arena)), dtype=np.float32)
+                arena[:live] = self._arena[self._start:self._end]
+                self._arena = arena
+            else:
+                self._arena[:live] = self._arena[self._start:self._end]
+            self._start, self._end = 0, live
+        self._arena[self._end:self._end + n] = chunk
+        self._end += n
+
     def add_chunk(self, chunk: np.ndarray) -> str:
         if chunk.size == 0:
             return ""
 
         # Append new audio and update absolute indices
-        self._buffer = np.concatenate([self._buffer, chunk])
+        self._append(chunk)
         self._next_sample_index += len(chunk)
 
         delta_fragments: List[str] = []
-        aggregated_text = self._last_text
         processed_any = False
 
         while True:
@@ -468,30 +705,31 @@ class StreamingTranscriber:
             self._last_transcription_time = current_time
             processed_any = True
 
-            previous_text = aggregated_text
             if normalized_text:
-                aggregated_text = (f"{aggregated_text} {normalized_text}" if aggregated_text else normalized_text).strip()
-            delta_part = aggregated_text[len(previous_text):]
-            if delta_part:
-                delta_fragments.append(delta_part)
-
-        if processed_any:
-            self._last_text = aggregated_text
-            delta_text = "".join(delta_fragments).strip()
-        else:
-            delta_text = ""
+                delta_fragments.append(normalized_text)
 
+        # Appending pieces keeps long utterances linear; rebuilding the whole
+        # transcript string per window was quadratic in its length
+        self._text_parts.extend(delta_fragments)
         self._trim_buffer()
-        return delta_text
+        return " ".join(delta_fragments)
+
+    def peek(self) -> str:
+        """Return the transcript ``flush()`` would produce, without resetting"""
+        return " ".join(self._text_parts)
 
     def flush(self) -> str:
-        text = self._last_text.strip()
-        self._buffer = np.array([], dtype=np.float32)
+        """Return the utterance transcript and reset for the next one.
+
+        The audio arena is kept and rewound, so utterances never reallocate it.
+        """
+        text = " ".join(self._text_parts)
+        self._start = self._end = 0
         self._buffer_offset = 0
         self._processed_offset = 0
         self._next_sample_index = 0
         self._segments.clear()
-        self._last_text = ""
+        self._text_parts.clear()
         return text
 
     def _trim_buffer(self) -> None:
@@ -505,112 +743,428 @@ class StreamingTranscriber:
             return
 
         drop = target_offset - self._buffer_offset
-        if drop >= len(self._buffer):
-            self._buffer = np.array([], dtype=np.float32)
-        else:
-            self._buffer = self._buffer[drop:]
+        self._start = min(self._start + drop, self._end)
 
         self._buffer_offset = target_offset
 
+# ---- LLM reply cache ----
+# Replies to repeated utterances are reused for a short while; anything that
+# mentions time-sensitive topics always goes to the model.
+_RESPONSE_CACHE_SKIP_WORDS = ("time", "date", "today", "weather", "news")
+_response_cache: Dict[str, tuple] = {}
+_response_cache_lock = threading.Lock()
+
+def _response_cache_key(user_text: str) -> Optional[str]:
+    """Normalize an utterance into a cache key, or None if it must not be cached"""
+    key = " ".join(user_text.lower().split()).strip(" .?!")
+    if not key or any(word in key for word in _RESPONSE_CACHE_SKIP_WORDS):
+        return None
+    return key
+
+def _get_cached_response(key: str) -> Optional[str]:
+    with _response_cache_lock:
+        hit = _response_cache.get(key)
+        if hit is None:
+            return None
+        reply, stored_at = hit
+        if time.monotonic() - stored_at >= RESPONSE_CACHE_TTL:
+            del _response_cache[key]
+            return None
+        return reply
+
+def _cache_response(key: str, reply: str) -> None:
+    with _response_cache_lock:
+        while len(_response_cache) >= RESPONSE_CACHE_SIZE:
+            # dicts keep insertion order, so the first key is the oldest entry
+            del _response_cache[next(iter(_response_cache))]
+        _response_cache[key] = (reply, time.monotonic())
+
 # ---- Enhanced LLM chat with tool calling ----
 TTS_STREAMED = False  # set true when llama_chat performs streaming TTS
 
-def llama_chat(user_text: str) -> str:
+# orjson parses the SSE deltas 2-3x faster than the stdlib when installed
+try:
+    import orjson as _orjson
+    _json_loads = _orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# ---- Tool keyword routing ----
+_TOOL_KEYWORDS = (
+    "search", "web", "for", "browse", "website", "open website", "open", "app",
+    "screenshot", "take picture", "weather", "system", "info",
+    "knowledge", "document", "file", "kb",
+)
+# Zero-width lookahead so every start position is tried in one C-level scan;
+# longest alternatives first, then expand to keywords contained in the match
+# (e.g. "website" also counts as "web") to keep plain substring semantics.
+_TOOL_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(_TOOL_KEYWORDS, key=len, reverse=True)) + "))"
+)
+_TOOL_KEYWORD_IMPLIES = {k: frozenset(j for j in _TOOL_KEYWORDS if j in k) for k in _TOOL_KEYWORDS}
+_WEB_SEARCH_STRIP_RE = re.compile("search|for|web")
+_APP_LAUNCH_STRIP_RE = re.compile("open|app")
+# A whitespace-delimited word starting with a URL scheme or "www."
+_URL_RE = re.compile(r"(?<!\S)(?:https?://|www\.)\S*")
+
+
+def _match_tool_keywords(text_lower: str) -> frozenset:
+    """Return every routing keyword that occurs in ``text_lower``"""
+    hits = set()
+    for match in _TOOL_KEYWORD_RE.finditer(text_lower):
+        hits |= _TOOL_KEYWORD_IMPLIES[match.group(1)]
+    return frozenset(hits)
+
+
+# A clause ends at terminal punctuation followed by whitespace, so "3.5" or
+# "e.g.x" mid-token never splits; newlines always end a clause
+_TTS_BOUNDARY_RE = re.compile(r"[.!?:;](?=\s)|\n")
+_TTS_MIN_CHARS = 12  # shorter fragments wait for more text; synthesis has fixed per-call overhead
+
+def _split_tts_buffer(buf: str, scan_from: int = 0, max_chars: Optional[int] = None) -> tuple:
+    """Split streamed text into ``(ready, rest)`` at the last clause boundary.
+
+    Only boundaries at or after ``scan_from`` (the start of the newest delta)
+    trigger a split. When no boundary is found and the buffer has grown past
+    ``max_chars`` (TTS_BUFFER_SIZE by default), it is cut at the last comma
+    or space instead.
+    """
+    if max_chars is None:
+        max_chars = TTS_BUFFER_SIZE
+    cut = -1
+    if _TTS_BOUNDARY_RE.search(buf, max(0, scan_from - 1)):
+        for match in _TTS_BOUNDARY_RE.finditer(buf):
+            if match.end() >= _TTS_MIN_CHARS:
+                cut = match.end()
+    if cut < 0 and len(buf) > max_chars:
+        cut = max(buf.rfind(",", 0, max_chars), buf.rfind(" ", 0, max_chars)) + 1 or len(buf)
+    if cut <= 0:
+        return "", buf
+    return buf[:cut].strip(), buf[cut:]
+
+
+def _split_tts_clauses(text: str) -> List[str]:
+    """Split a complete reply into speakable clauses, in order.
+
+    Uses the same boundaries and minimum clause length as streamed replies.
+    """
+    clauses: List[str] = []
+    start = 0
+    for match in _TTS_BOUNDARY_RE.finditer(text):
+        if match.end() - start >= _TTS_MIN_CHARS:
+            clause = text[start:match.end()].strip()
+            if clause:
+                clauses.append(clause)
+            start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        clauses.append(tail)
+    return clauses
+
+
+def _llm_payload(user_text: str) -> Dict[str, Any]:
+    return {
+        "model": "local",
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_text}
+        ],
+        "temperature": LLAMA_TEMP,
+        "max_tokens": LLAMA_MAXTOK,
+        "stream": True,
+        # llama.cpp extension: reuse the KV cache for the shared prompt prefix
+        "cache_prompt": True
+    }
+
+_prefill_lock = threading.Lock()
+_prefill_state: Dict[str, Any] = {"busy": False, "last": float("-inf")}
+
+def _prefill_llm_cache() -> None:
+    """Warm the LLM server's prompt cache with the system prompt.
+
+    Called when an utterance starts so the prefix is already evaluated by the
+    time the transcript arrives. Runs on a background thread, at most once
+    per LLM_PREFILL_INTERVAL; the caller never waits on it.
+    """
+    now = time.monotonic()
+    with _prefill_lock:
+        if _prefill_state["busy"] or now - _prefill_state["last"] < LLM_PREFILL_INTERVAL:
+            return
+        _prefill_state.update(busy=True, last=now)
+    threading.Thread(target=_run_llm_prefill, name="LLMPrefill", daemon=True).start()
+
+def _run_llm_prefill() -> None:
+    payload = {
+        "model": "local",
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": ""}
+        ],
+        "max_tokens": 1,
+        "stream": False,
+        "cache_prompt": True
+    }
+    try:
+        _http.post(LLAMA_SERVER, json=payload, timeout=LLM_TIMEOUT).close()
+    except Exception as e:
+        logger.debug(f"LLM prompt cache warmup failed: {e}")
+    finally:
+        with _prefill_lock:
+            _prefill_state["busy"] = False
+
+def _iter_sse_deltas(r, cancel: Optional[threading.Event] = None) -> Iterator[str]:
+    """Yield content deltas from a streamed chat completion response"""
+    # Raw bytes lines: the JSON parser takes bytes, so each delta skips
+    # a UTF-8 decode round-trip
+    for line in r.iter_lines():
+        if cancel is not None and cancel.is_set():
+            return
+        if not line or not line.startswith(b"data: "):
+            continue
+        data = line[6:]
+        if data.strip() == b"[DONE]":
+            return
+        try:
+            chunk = _json_loads(data)
+            delta = chunk["choices"][0]["delta"].get("content", "")
+        except Exception:
+            delta = ""
+        if delta:
+            yield delta
+
+@contextlib.contextmanager
+def _open_llm_stream(user_text: str, cancel: Optional[threading.Event] = None):
+    """POST the chat request and yield an iterator over its content deltas"""
+    with _http.post(
+        LLAMA_SERVER,
+        json=_llm_payload(user_text),
+        stream=True,
+        timeout=LLM_TIMEOUT,
+    ) as r:
+        r.raise_for_status()
+        yield _iter_sse_deltas(r, cancel)
+
+
+class _SpeculativeReply:
+    """LLM reply requested on a partial transcript before the turn has ended.
+
+    A background thread buffers the streamed deltas; nothing is spoken until
+    ``llama_chat`` adopts the reply for a final transcript equal to ``text``.
+    ``cancel()`` stops the request when the user resumes speaking.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._deltas: List[str] = []
+        self._cond = threading.Condition()
+        self._opened = False
+        self._finished = False
+        self._error: Optional[BaseException] = None
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="SpeculativeLLM", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            with _open_llm_stream(self.text, self._cancel) as deltas:
+                with self._cond:
+                    self._opened = True
+                    self._cond.notify_all()
+                for delta in deltas:
+                    with self._cond:
+                        self._deltas.append(delta)
+                        self._cond.notify_all()
+        except Exception as e:
+            self._error = e
+        finally:
+            with self._cond:
+                self._opened = self._finished = True
+                self._cond.notify_all()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @contextlib.contextmanager
+    def stream(self):
+        """Yield the buffered deltas followed by the live ones.
+
+        Raises the request error, if any, before anything is yielded so
+        callers see the same failures as with ``_open_llm_stream``.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._opened)
+            if self._error is not None and not self._deltas:
+                raise self._error
+        try:
+            yield self._iter_deltas()
+        finally:
+            # Stops generation if the consumer broke off early
+            self.cancel()
+
+    def _iter_deltas(self) -> Iterator[str]:
+        sent = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: sent < len(self._deltas) or self._finished)
+                batch = self._deltas[sent:]
+                sent += len(batch)
+                if not batch:
+                    if self._error is not None:
+                        raise self._error
+                    return
+            yield from batch
+
+
+def _start_speculative_reply(text: str) -> Optional[_SpeculativeReply]:
+    """Start generating a reply to a partial transcript, when it is safe to.
+
+    The partial text is sanitized like the final turn, so nothing unvalidated
+    reaches the LLM and ``llama_chat`` compares like with like. Utterances
+    that would route to a tool are skipped so no side effect runs before the
+    turn is confirmed; cached replies need no head start. The service health
+    check is left to the turn worker so the audio loop never blocks here.
+    """
+    if not text:
+        return None
+    text = prepare_transcript(text)
+    if text is None:
+        return None
+    if tool_caller and tool_caller.has_enabled_tools() and _match_tool_keywords(text.lower()):
+        return None
+    if RESPONSE_CACHE_ENABLED:
+        cache_key = _response_cache_key(text)
+        if cache_key and _get_cached_response(cache_key) is not None:
+            return None
+    return _SpeculativeReply(text)
+
+
+class _Filler:
+    """Speaks FILLER_PHRASE if the first LLM token has not arrived after ``delay``.
+
+    ``stop()`` cancels the timer and returns the filler's TTS job, if it was
+    queued, so the reply's first sentence can be chained after it.
+    """
+
+    def __init__(self, delay: float) -> None:
+        self._lock = threading.Lock()
+        self._job: Optional['TTSJob'] = None
+        self._stopped = False
+        self._timer = threading.Timer(delay, self._fire)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _fire(self) -> None:
+        with self._lock:
+            if not self._stopped:
+                self._job = tts_manager.enqueue_speak(FILLER_PHRASE, interruptible=True, notify=False)
+
+    def stop(self) -> Optional['TTSJob']:
+        self._timer.cancel()
+        with self._lock:
+            self._stopped = True
+            return self._job
+
+
+def _chain_error_reply(reply: str, filler: Optional[_Filler], after: Optional['TTSJob']) -> str:
+    """Queue an error reply behind speech already queued this turn (the filler
+    or streamed chunks) so it cannot talk over it; with nothing queued the
+    caller speaks it as usual"""
+    global TTS_STREAMED
+    if filler is not None:
+        after = filler.stop() or after
+    if after is not None:
+        tts_manager.enqueue_speak(reply, interruptible=True, notify=False, after=after)
+        TTS_STREAMED = True
+    return reply
+
+
+def llama_chat(user_text: str, speculative: Optional[_SpeculativeReply] = None) -> str:
+    """Answer ``user_text`` via tools, the response cache or the LLM.
+
+    ``speculative`` is a reply already requested for a partial transcript;
+    it is reused when that transcript matches ``user_text`` and cancelled
+    otherwise.
+    """
+    if speculative is not None and speculative.text != user_text:
+        speculative.cancel()
+        speculative = None
     # Check if user is requesting tool usage
     tool_support = tool_caller if tool_caller and tool_caller.has_enabled_tools() else None
     if tool_support:
-        # Enhanced keyword-based tool detection
+        # Keyword-based tool detection from a single scan of the text
         user_text_lower = user_text.lower()
+        hits = _match_tool_keywords(user_text_lower)
+        enabled = tool_support.is_tool_enabled
 
         # Web search
-        if (
-            tool_support.is_tool_enabled("web_search")
-            and "search" in user_text_lower
-            and ("web" in user_text_lower or "for" in user_text_lower)
-        ):
-            query = user_text_lower.replace("search", "").replace("for", "").replace("web", "").strip()
+        if "search" in hits and ("web" in hits or "for" in hits) and enabled("web_search"):
+            query = _WEB_SEARCH_STRIP_RE.sub("", user_text_lower).strip()
             result = tool_support.web_search(query)
             return f"I searched for '{query}'. {result}"
 
         # Website browsing
-        elif (
-            tool_support.is_tool_enabled("web_search")
-            and (
-                "browse" in user_text_lower
-                or "website" in user_text_lower
-                or "open website" in user_text_lower
-            )
-        ):
-            words = user_text.split()
-            for word in words:
-                if word.startswith(("http://", "https://", "www.")):
-                    result = tool_support.browse_website(word)
-                    return f"I browsed {word}. {result}"
+        elif ("browse" in hits or "website" in hits) and enabled("web_search"):
+            url_match = _URL_RE.search(user_text)
+            if url_match:
+                url = url_match.group(0)
+                result = tool_support.browse_website(url)
+                return f"I browsed {url}. {result}"
 
         # App opening
-        elif (
-            tool_support.is_tool_enabled("app_launcher")
-            and "open" in user_text_lower
-            and "app" in user_text_lower
-        ):
-            app_name = user_text_lower.replace("open", "").replace("app", "").strip()
+        elif "open" in hits and "app" in hits and enabled("app_launcher"):
+            app_name = _APP_LAUNCH_STRIP_RE.sub("", user_text_lower).strip()
             result = tool_support.open_app(app_name)
             return result
 
         # Screenshot
-        elif tool_support.is_tool_enabled("screenshot") and (
-            "screenshot" in user_text_lower or "take picture" in user_text_lower
-        ):
+        elif ("screenshot" in hits or "take picture" in hits) and enabled("screenshot"):
             result = tool_support.take_screenshot()
             return result
 
         # Weather
-        elif tool_support.is_tool_enabled("weather") and "weather" in user_text_lower:
+        elif "weather" in hits and enabled("weather"):
             result = tool_support.get_weather()
             return result
 
         # System info
-        elif (
-            tool_support.is_tool_enabled("system_monitor")
-            and "system" in user_text_lower
-            and "info" in user_text_lower
-        ):
+        elif "system" in hits and "info" in hits and enabled("system_monitor"):
             result = tool_support.get_system_info()
             return f"Here's your system information: {result}"
 
         # RAG search
-        elif tool_support.is_tool_enabled("rag_search") and any(
-            keyword in user_text_lower
-            for keyword in ["knowledge", "document", "file", "kb", "search kb", "search knowledge"]
-        ):
+        elif hits & {"knowledge", "document", "file", "kb"} and enabled("rag_search"):
             result = tool_support.search_knowledge_base(user_text)
             return result
     
-    # Regular chat if no tools needed
-    payload = {
-        "model": "local",
-        "messages": [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_text}
-        ],
-        "temperature": LLAMA_TEMP,
-        "max_tokens": LLAMA_MAXTOK,
-        "stream": True
-    }
+    global TTS_STREAMED
+    cache_key = _response_cache_key(user_text) if RESPONSE_CACHE_ENABLED else None
+    if cache_key:
+        cached = _get_cached_response(cache_key)
+        if cached is not None:
+            logger.debug("LLM response cache hit")
+            if speculative is not None:
+                speculative.cancel()
+            TTS_STREAMED = False  # nothing was streamed; caller speaks the reply
+            return cached
 
+    # Regular chat if no tools needed
+    filler = _Filler(FILLER_DELAY) if FILLER_ENABLED and FILLER_PHRASE else None
+    last_tts_job: Optional['TTSJob'] = None
     try:
-        global TTS_STREAMED
         TTS_STREAMED = False
         # Inform UI that assistant will start speaking (streamed)
         _notify_dashboard_state('speaking_started')
-        with requests.post(
-            LLAMA_SERVER,
-            json=payload,
-            stream=True,
-            timeout=LLM_TIMEOUT,
-        ) as r:
-            r.raise_for_status()
-
+        if speculative is not None:
+            logger.debug("Reusing speculative LLM reply")
+            reply_stream = speculative.stream()
+        else:
+            # Shutdown ends the stream at the next delta instead of the reply's end
+            reply_stream = _open_llm_stream(user_text, _cleanup_done)
+        with reply_stream as deltas:
             full_response = ""
             tts_buf = ""
 
@@ -619,59 +1173,52 @@ def llama_chat(user_text: str) -> str:
 
             pending_tts_jobs: List['TTSJob'] = []
 
-            for line in r.iter_lines(decode_unicode=True):
+            for delta in deltas:
+                if _cleanup_done.is_set():
+                    break
+
+                if filler is not None:
+                    # First token: a filler already queued plays before the reply
+                    last_tts_job = filler.stop()
+                    filler = None
+
                 if INTERRUPTION_ENABLED and tts_manager.audio_handler and tts_manager.audio_handler.interrupt_requested:
                     if conversation_manager:
                         conversation_manager.interrupt_response()
                     break
 
-                if not line:
-                    continue
+                full_response += delta
 
-                if line.startswith("data: "):
-                    data = line[6:]
-                    if data.strip() == "[DONE]":
-                        break
+                if INTERRUPTION_ENABLED and conversation_manager:
+                    conversation_manager.update_response(full_response)
 
-                    try:
-                        chunk = json.loads(data)
-                        delta = chunk["choices"][0]["delta"].get("content", "")
-                    except Exception:
-                        delta = ""
-
-                    if not delta:
-                        continue
+                # Accumulate deltas and hand whole clauses to the TTS queue.
+                # Until the first clause is queued a shorter cut applies, so a
+                # long opening sentence starts playing while the rest streams
+                scan_from = len(tts_buf)
+                tts_buf += delta
+                to_say, tts_buf = _split_tts_buffer(
+                    tts_buf, scan_from,
+                    TTS_BUFFER_SIZE if pending_tts_jobs else TTS_FIRST_CHUNK_SIZE,
+                )
 
-                    full_response += delta
+                if to_say:
+                    TTS_STREAMED = True
 
-                    if INTERRUPTION_ENABLED and conversation_manager:
-                        conversation_manager.update_response(full_response)
-
-                    # Optimized TTS streaming with better sentence boundary detection
-                    tts_buf += delta
-                    
-                    # More intelligent sentence boundary detection
-                    sentence_endings = [".", "?", "!", "\n", ":", ";"]
-                    tts_buffer_size = CFG.get_tts_buffer_size()
-                    flush_now = (any(p in delta for p in sentence_endings) or 
-                               len(tts_buf) > tts_buffer_size or
-                               (len(tts_buf) > 100 and any(p in tts_buf for p in [",", "and", "but", "so"])))
-                    
-                    if flush_now and tts_buf.strip():
-                        to_say = tts_buf.strip()
-                        tts_buf = ""
-                        TTS_STREAMED = True
-
-                        # Check if we should still speak (not interrupted)
-                        if (INTERRUPTION_ENABLED and conversation_manager and
+                    # Check if we should still speak (not interrupted)
+                    if not (INTERRUPTION_ENABLED and conversation_manager and
                             conversation_manager.current_context and
-                            conversation_manager.current_context.response_state != ResponseState.INTERRUPTED):
-                            job = tts_manager.enqueue_speak(to_say, interruptible=True, notify=False)
-                            pending_tts_jobs.append(job)
+                            conversation_manager.current_context.response_state == ResponseState.INTERRUPTED):
+                        last_tts_job = tts_manager.enqueue_speak(
+                            to_say, interruptible=True, notify=False, after=last_tts_job
+                        )
+                        pending_tts_jobs.append(last_tts_job)
 
             if tts_buf.strip():
                 TTS_STREAMED = True
-                job = tts_manager.enqueue_speak(tts_buf.strip(), interruptible=True, notify=False)
+                job = tts_manager.enqueue_speak(
+                    tts_buf.strip(), interruptible=True, notify=False, after=last_tts_job
+                )
                 pending_tts_jobs.append(job)
 
             if INTERRUPTION_ENABLED and conversation_manager and not (tts_manager.audio_handler and tts_manager.audio_handler.interrupt_requested):
@@ -688,58 +1235,75 @@ def llama_chat(user_text: str) -> str:
                     pass
 
             # Signal end/interrupted after last chunk queued
+            interrupted = False
             try:
-                if tts_manager.audio_handler and tts_manager.audio_handler.interrupt_requested:
+                interrupted = bool(tts_manager.audio_handler and tts_manager.audio_handler.interrupt_requested)
+                if interrupted:
                     _notify_dashboard_state('speaking_interrupted')
                 else:
                     _notify_dashboard_state('speaking_ended')
             except Exception:
                 _notify_dashboard_state('speaking_ended')
+
+            # Only complete replies are worth replaying
+            if cache_key and full_response and not interrupted:
+                _cache_response(cache_key, full_response)
             return full_response
     except requests.exceptions.Timeout:
-        return "The language model is taking too long to respond. Please try again."
+        _invalidate_llm_health_cache()
+        return _chain_error_reply(
+            "The language model is taking too long to respond. Please try again.", filler, last_tts_job)
     except requests.exceptions.ConnectionError:
-        return "I can't connect to the language model right now. Please check if the LLM server is running."
+        # The server is not listening; degrade without waiting for a probe
+        _mark_llm_service_down()
+        return _chain_error_reply(
+            "I can't connect to the language model right now. Please check if the LLM server is running.",
+            filler, last_tts_job)
     except Exception as e:
+        _invalidate_llm_health_cache()
         logger.error(f"LLM processing error: {e}")
-        return f"I'm having trouble connecting to the language model: {str(e)}"
+        return _chain_error_reply(
+            f"I'm having trouble connecting to the language model: {str(e)}", filler, last_tts_job)
+    finally:
+        if filler is not None:
+            filler.stop()
+
+# Degraded-mode replies, checked in order; keywords match as substrings of the
+# lowercased text. Built once at import so a fallback turn only scans keywords;
+# time and date replies stay callables because they must be current.
+_DEGRADED_RULES: List[tuple] = [
+    (("hello", "hi", "hey"),
+     "Hello! I'm MacBot, but some of my services aren't available right now."),
+    (("time",), lambda: f"The current time is {time.strftime('%I:%M %p')}."),
+    (("date",), lambda: f"Today is {time.strftime('%A, %B %d, %Y')}."),
+    (("help", "what can you do"),
+     "I can help with basic tasks, but some services are currently unavailable. "
+     "Try asking for the time, date, or basic information."),
+    (("status", "system", "info"),
+     "System monitoring is currently unavailable, but I'm still here to help with basic questions."),
+]
+_DEGRADED_DEFAULT = ("I'm sorry, but some of my services are currently unavailable. "
+                     "I can still help with basic questions about time, date, or general assistance.")
 
 def get_degraded_response(user_text: str) -> str:
     """Provide basic responses when services are unavailable"""
-    user_text_lower = user_text.lower()
-
-    # Basic command recognition without external services
-    if any(word in user_text_lower for word in ["hello", "hi", "hey"]):
-        return "Hello! I'm MacBot, but some of my services aren't available right now."
-
-    elif "time" in user_text_lower:
-        current_time = time.strftime("%I:%M %p")
-        return f"The current time is {current_time}."
-
-    elif "date" in user_text_lower:
-        current_date = time.strftime("%A, %B %d, %Y")
-        return f"Today is {current_date}."
-
-    elif any(word in user_text_lower for word in ["help", "what can you do"]):
-        return ("I can help with basic tasks, but some services are currently unavailable. "
-                "Try asking for the time, date, or basic information.")
-
-    elif any(word in user_text_lower for word in ["status", "system", "info"]):
-        return "System monitoring is currently unavailable, but I'm still here to help with basic questions."
-
-    else:
-        return ("I'm sorry, but some of my services are currently unavailable. "
-                "I can still help with basic questions about time, date, or general assistance.")
+    text = user_text.lower()
+    for words, reply in _DEGRADED_RULES:
+        if any(word in text for word in words):
+            return reply() if callable(reply) else reply
+    return _DEGRADED_DEFAULT
 
 # ---- TTS Setup ----
 # Unified TTS system with proper fallback handling
 class TTSJob:
     """Container for queued TTS work with completion helpers."""
 
-    def __init__(self, text: str, interruptible: bool, notify: bool):
+    def __init__(self, text: str, interruptible: bool, notify: bool, after: Optional['TTSJob'] = None):
         self.text = text
         self.interruptible = interruptible
         self.notify = notify
+        self.after = after  # job that must finish speaking before this one starts
+        self.generation = 0  # TTSManager interrupt generation at enqueue time
         self.done_event = threading.Event()
         self.success: bool = False
         self.error: Optional[Exception] = None
@@ -777,6 +1341,7 @@ class TTSManager:
         self.say_available = False
         self._speak_lock = threading.Lock()
         self._initialized = False  # lazy init to avoid crashes on import
+        self._heartbeat: Optional[threading.Thread] = None
 
         # TTS queue system for resource management
         self._tts_queue: "queue.Queue[Optional[TTSJob]]" = queue.Queue()
@@ -784,6 +1349,8 @@ class TTSManager:
         self._tts_count_lock = threading.Lock()
         self._tts_workers: List[threading.Thread] = []
         self._tts_shutdown = threading.Event()
+        # Bumped by interrupt(); queued jobs from an older generation are dropped
+        self._generation = 0
 
         # Async TTS processing
         self._tts_cache = {}  # Cache for common phrases
@@ -792,6 +1359,9 @@ class TTSManager:
         self._parallel_processing = CFG.get_tts_parallel_processing()
         self._optimize_for_speed = CFG.get_tts_optimize_for_speed()
         self._cache_lock = threading.Lock()
+        # Audio synthesized while an earlier sentence played, keyed by text
+        # and consumed (under _cache_lock) when the sentence's turn comes
+        self._prefetched: Dict[str, np.ndarray] = {}
 
         # Hardware acceleration detection
         self._mps_available = self._detect_mps_support()
@@ -859,6 +1429,22 @@ class TTSManager:
 
     def _execute_job(self, job: TTSJob) -> None:
         """Execute a queued TTS job, handling lifecycle metrics."""
+        # Keep streamed sentences in order even though the pool has several workers;
+        # synthesize while the earlier sentence plays so playback follows gaplessly
+        if job.after is not None:
+            if not job.after.done() and job.generation == self._generation:
+                self._prefetch_audio(job.text)
+            while not job.after.done_event.wait(0.2):
+                if self._tts_shutdown.is_set():
+                    break
+            job.after = None
+
+        if job.generation != self._generation:
+            # Queued before an interrupt: the rest of that reply is not spoken
+            self._take_prefetched(job.text)
+            job.set_result(False)
+            return
+
         with self._tts_count_lock:
             self._active_tts_count += 1
             active_now = self._active_tts_count
@@ -952,25 +1538,32 @@ class TTSManager:
                 self.audio_handler.vad_threshold = INTERRUPT_THRESHOLD
 
         # Start a lightweight heartbeat to reinit Piper if not loaded
-        def _hb():
-            while True:
-                try:
-                    if self.engine is None:
-                        self._initialized = False
-                        self.init_engine()
-                except Exception:
-                    pass
-                time.sleep(max(5, self._reload_sec))
+        self._start_heartbeat()
 
+    def _start_heartbeat(self) -> None:
+        """One heartbeat per manager; init_engine runs again on every retry"""
+        if self._heartbeat is not None:
+            return
         try:
-            threading.Thread(target=_hb, daemon=True).start()
+            self._heartbeat = threading.Thread(target=self._heartbeat_loop, name="tts-heartbeat", daemon=True)
+            self._heartbeat.start()
         except Exception:
-            pass
+            self._heartbeat = None
+
+    def _heartbeat_loop(self) -> None:
+        # Ends with the manager: cleanup() sets _tts_shutdown
+        while not self._tts_shutdown.wait(max(5, self._reload_sec)):
+            try:
+                if self.engine is None:
+                    self._initialized = False
+                    self.init_engine()
+            except Exception:
+                pass
 
     def _ensure_rate(self, audio: np.ndarray, src_sr: int, dst_sr: int) -> np.ndarray:
         try:
             if src_sr == dst_sr:
-                return audio.astype(np.float32)
+                return np.asarray(audio, dtype=np.float32)  # no copy when already float32
             import numpy as _np
             x = _np.arange(len(audio), dtype=_np.float32)
             new_len = max(1, int(len(audio) * (dst_sr / float(src_sr))))
@@ -978,7 +1571,7 @@ class TTSManager:
             res = _np.interp(new_x, x, audio.astype(_np.float32)).astype(_np.float32)
             return res
         except Exception:
-            return audio.astype(np.float32)
+            return np.asarray(audio, dtype=np.float32)
 
     def _process_speak_request(self, text: str, interruptible: bool, notify: bool) -> bool:
         """Internal implementation that performs the actual TTS work."""
@@ -986,27 +1579,27 @@ class TTSManager:
             return True
 
         logger.info(
-            f"🎤 TTS SPEAK START: '{text[:50]}{'...' if len(text) > 50 else ''}' "
-            f"(length: {len(text)} chars)"
+            "🎤 TTS SPEAK START: '%.50s%s' (length: %d chars)",
+            text, '...' if len(text) > 50 else '', len(text)
         )
         logger.info(
-            f"🎤 TTS ENGINE STATUS: type={self.engine_type}, loaded={self.engine is not None}, "
-            f"initialized={self._initialized}"
+            "🎤 TTS ENGINE STATUS: type=%s, loaded=%s, initialized=%s",
+            self.engine_type, self.engine is not None, self._initialized
         )
-        logger.info(f"🎤 TTS PARAMS: interruptible={interruptible}, notify={notify}")
+        logger.info("🎤 TTS PARAMS: interruptible=%s, notify=%s", interruptible, notify)
 
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                logger.info(f"🎤 TTS ATTEMPT {attempt + 1}/{max_retries}")
+                logger.info("🎤 TTS ATTEMPT %s/%s", attempt + 1, max_retries)
                 result = self._speak_attempt(text, interruptible, notify)
-                logger.info(f"🎤 TTS ATTEMPT {attempt + 1} RESULT: {result}")
+                logger.info("🎤 TTS ATTEMPT %s RESULT: %s", attempt + 1, result)
                 return result
             except Exception as e:
                 logger.warning(f"🎤 TTS ATTEMPT {attempt + 1} FAILED: {e}")
                 if attempt < max_retries - 1:
                     try:
-                        logger.info(f"🎤 TTS REINITIALIZING ENGINE (attempt {attempt + 1})")
+                        logger.info("🎤 TTS REINITIALIZING ENGINE (attempt %s)", attempt + 1)
                         self._initialized = False
                         self.init_engine()
                         time.sleep(0.5)
@@ -1025,9 +1618,15 @@ class TTSManager:
                         return False
         return False
 
-    def enqueue_speak(self, text: str, interruptible: bool = False, notify: bool = True) -> TTSJob:
-        """Enqueue a TTS request for asynchronous processing."""
-        job = TTSJob(text, interruptible, notify)
+    def enqueue_speak(self, text: str, interruptible: bool = False, notify: bool = True,
+                      after: Optional[TTSJob] = None) -> TTSJob:
+        """Enqueue a TTS request for asynchronous processing.
+
+        Args:
+            after: Optional earlier job that must finish before this one is spoken
+        """
+        job = TTSJob(text, interruptible, notify, after=after)
+        job.generation = self._generation
 
         if not text.strip():
             job.set_result(True)
@@ -1049,7 +1648,16 @@ class TTSManager:
 
     @track_resource("tts", "speak_operation")
     def speak(self, text: str, interruptible: bool = False, notify: bool = True) -> bool:
-        """Speak text using the configured TTS engine."""
+        """Speak text using the configured TTS engine.
+
+        Multi-clause text is queued as chained per-clause jobs, so playback
+        starts once the first clause is synthesized and later clauses are
+        synthesized while earlier ones play.
+        """
+        clauses = _split_tts_clauses(text)
+        if len(clauses) > 1:
+            return self._speak_clauses(clauses, interruptible, notify)
+
         job = self.enqueue_speak(text, interruptible=interruptible, notify=notify)
         if job.done():
             return job.success
@@ -1064,123 +1672,201 @@ class TTSManager:
 
         return job.success
 
+    def _speak_clauses(self, clauses: List[str], interruptible: bool, notify: bool) -> bool:
+        # Per-clause jobs would flicker the dashboard state; notify once around the run
+        if notify:
+            _notify_dashboard_state('speaking_started')
+        jobs: List[TTSJob] = []
+        last_job: Optional[TTSJob] = None
+        for clause in clauses:
+            last_job = self.enqueue_speak(clause, interruptible=interruptible, notify=False, after=last_job)
+            jobs.append(last_job)
+
+        success = True
+        for job in jobs:
+            if not job.wait() and not job.done():
+                logger.warning("TTS job wait timed out")
+                success = False
+                break
+            if job.error:
+                logger.error(f"TTS job failed: {job.error}")
+            success = success and job.success
+
+        if notify:
+            _notify_dashboard_state('speaking_ended' if success else 'speaking_interrupted')
+        return success
+
     def _speak_attempt(self, text: str, interruptible: bool, notify: bool) -> bool:
         """Single TTS attempt with proper error handling"""
-        logger.info(f"🎤 _speak_attempt START: text='{text[:30]}...', interruptible={interruptible}, notify={notify}")
+        logger.info("🎤 _speak_attempt START: text='%.30s...', interruptible=%s, notify=%s", text, interruptible, notify)
         
         if not self._initialized:
-            logger.info(f"🎤 TTS NOT INITIALIZED, initializing...")
+            logger.info("🎤 TTS NOT INITIALIZED, initializing...")
             self.init_engine()
         
         if not self.engine:
             logger.error(f"🎤 TTS ENGINE NOT LOADED after init attempt")
             raise RuntimeError("TTS engine not loaded")
         
-        logger.info(f"🎤 TTS ENGINE READY: type={self.engine_type}, engine={type(self.engine)}")
+        logger.info("🎤 TTS ENGINE READY: type=%s, engine=%s", self.engine_type, type(self.engine))
         
         if notify:
-            logger.info(f"🎤 NOTIFYING DASHBOARD: speaking_started")
+            logger.info("🎤 NOTIFYING DASHBOARD: speaking_started")
             _notify_dashboard_state('speaking_started')
 
         if self.engine_type in ["piper", "piper_quantized"]:
-            logger.info(f"🎤 USING PIPER TTS: type={self.engine_type}")
+            logger.info("🎤 USING PIPER TTS: type=%s", self.engine_type)
             result = self._speak_with_piper(text, interruptible, notify)
-            logger.info(f"🎤 PIPER TTS RESULT: {result}")
+            logger.info("🎤 PIPER TTS RESULT: %s", result)
             return result
         else:
             logger.error(f"🎤 UNSUPPORTED TTS ENGINE TYPE: {self.engine_type}")
             raise RuntimeError("No TTS engine available")
 
+    def _synthesize_piper(self, text: str) -> Optional[np.ndarray]:
+        """Synthesize ``text`` with Piper at the Piper sample rate, or None if no audio"""
+        from piper import SynthesisConfig
+        config = SynthesisConfig()
+        
+        # Optimize for speed over quality
+        config.length_scale = 1.0 / SPEED if SPEED > 0 else 1.0
+        config.noise_scale = 0.5  # Reduced for faster synthesis
+        try:
+            config.noise_w = 0.6      # type: ignore  # Reduced for faster synthesis
+            config.phoneme_silence_sec = 0.05  # type: ignore  # Reduced silence for faster output
+        except AttributeError:
+            # Some Piper versions don't have these attributes
+            pass
+        
+        logger.info("🎤 PIPER CONFIG: length_scale=%s, noise_scale=%s, noise_w=%s", config.length_scale, config.noise_scale, getattr(config, 'noise_w', 'N/A'))
+        
+        # Synthesize audio (returns generator)
+        logger.info("🎤 CALLING PIPER SYNTHESIZE...")
+        audio_chunks = self.engine.synthesize(text, config)  # type: ignore
+        logger.info("🎤 PIPER SYNTHESIZE RETURNED: %s", type(audio_chunks))
+        
+        # Process audio chunks from generator
+        audio_arrays = []
+        chunk_count = 0
+        for ch in audio_chunks:
+            chunk_count += 1
+            logger.info("🎤 PROCESSING CHUNK %s: %s", chunk_count, type(ch))
+            try:
+                # Convert chunk to numpy array
+                if hasattr(ch, 'audio_float_array'):
+                    audio_arrays.append(ch.audio_float_array)
+                    logger.info("🎤 CHUNK %s: audio_float_array, shape=%s", chunk_count, ch.audio_float_array.shape)
+                elif hasattr(ch, 'audio'):
+                    audio_data = np.array(ch.audio, dtype=np.float32)  # type: ignore
+                    audio_arrays.append(audio_data)
+                    logger.info("🎤 CHUNK %s: audio, shape=%s", chunk_count, audio_data.shape)
+                else:
+                    # Try to convert directly
+                    audio_arrays.append(np.array(ch, dtype=np.float32))
+                    logger.info("🎤 CHUNK %s: direct conversion, shape=%s", chunk_count, audio_arrays[-1].shape)
+            except Exception as e:
+                logger.warning(f"🎤 CHUNK {chunk_count} PROCESSING FAILED: {e}")
+                continue
+        
+        logger.info("🎤 PROCESSED %s CHUNKS, %s SUCCESSFUL", chunk_count, len(audio_arrays))
+        
+        if not audio_arrays:
+            logger.warning("🎤 NO AUDIO GENERATED FROM PIPER")
+            return None
+        
+        # Concatenate all audio arrays
+        logger.info("🎤 CONCATENATING %s AUDIO ARRAYS...", len(audio_arrays))
+        # Piper usually yields one chunk per sentence; only join when needed
+        if len(audio_arrays) == 1:
+            audio_arr = np.asarray(audio_arrays[0], dtype=np.float32)
+        else:
+            audio_arr = np.concatenate(audio_arrays, dtype=np.float32)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("🎤 CONCATENATED AUDIO SHAPE: %s, DURATION: %.2fs",
+                        audio_arr.shape, len(audio_arr) / CFG.get_piper_sample_rate())
+        return audio_arr
+
+    def _synthesize_to_cache(self, text: str) -> Optional[np.ndarray]:
+        """Synthesize ``text`` into the phrase cache unless it is already there.
+
+        Returns the new audio, or None when cached, unavailable or failed;
+        failures are left to the normal speak path, which retries and falls back.
+        """
+        if self.engine is None or self.engine_type not in ("piper", "piper_quantized"):
+            return None
+        if self._get_cached_audio(text) is not None:
+            return None
+        try:
+            audio = self._synthesize_piper(text)
+        except Exception as e:
+            logger.debug("TTS pre-synthesis failed: %s", e)
+            return None
+        if audio is not None:
+            self._cache_audio(text, audio)
+        return audio
+
+    def _prefetch_audio(self, text: str) -> None:
+        """Synthesize a queued sentence ahead of its turn to play"""
+        audio = self._synthesize_to_cache(text)
+        if audio is not None:
+            with self._cache_lock:
+                self._prefetched[text] = audio
+
+    def warm_cache(self, phrases: List[str]) -> None:
+        """Synthesize fixed phrases (e.g. the filler) so their first use plays at once"""
+        for phrase in phrases:
+            if phrase:
+                self._synthesize_to_cache(phrase)
+
+    def _take_prefetched(self, text: str) -> Optional[np.ndarray]:
+        with self._cache_lock:
+            return self._prefetched.pop(text, None)
+
     def _speak_with_piper(self, text: str, interruptible: bool, notify: bool) -> bool:
         """Speak using Piper TTS with error recovery and caching"""
         try:
-            logger.info(f"🎤 PIPER TTS START: text='{text[:50]}...', interruptible={interruptible}, notify={notify}")
+            logger.info("🎤 PIPER TTS START: text='%.50s...', interruptible=%s, notify=%s", text, interruptible, notify)
             
+            prefetched = self._take_prefetched(text)
+            if prefetched is not None:
+                logger.info("🎯 TTS prefetched audio for: '%.30s...'", text)
+                return self._play_cached_audio(prefetched, interruptible, notify)
+
             # Check cache first
             cached_audio = self._get_cached_audio(text)
             if cached_audio is not None:
-                logger.info(f"🎯 TTS Cache HIT for: '{text[:30]}...'")
+                logger.info("🎯 TTS Cache HIT for: '%.30s...'", text)
                 self._log_cache_stats(True)
                 return self._play_cached_audio(cached_audio, interruptible, notify)
             
-            logger.info(f"🔄 TTS Cache MISS for: '{text[:30]}...'")
+            logger.info("🔄 TTS Cache MISS for: '%.30s...'", text)
             self._log_cache_stats(False)
             
-            from piper import SynthesisConfig
             sr = CFG.get_piper_sample_rate()
-            config = SynthesisConfig()
-            
-            # Optimize for speed over quality
-            config.length_scale = 1.0 / SPEED if SPEED > 0 else 1.0
-            config.noise_scale = 0.5  # Reduced for faster synthesis
-            try:
-                config.noise_w = 0.6      # type: ignore  # Reduced for faster synthesis
-                config.phoneme_silence_sec = 0.05  # type: ignore  # Reduced silence for faster output
-            except AttributeError:
-                # Some Piper versions don't have these attributes
-                pass
-            
-            logger.info(f"🎤 PIPER CONFIG: length_scale={config.length_scale}, noise_scale={config.noise_scale}, noise_w={getattr(config, 'noise_w', 'N/A')}")
-            
-            # Synthesize audio (returns generator)
-            logger.info(f"🎤 CALLING PIPER SYNTHESIZE...")
-            audio_chunks = self.engine.synthesize(text, config)  # type: ignore
-            logger.info(f"🎤 PIPER SYNTHESIZE RETURNED: {type(audio_chunks)}")
-            
-            # Process audio chunks from generator
-            audio_arrays = []
-            chunk_count = 0
-            for ch in audio_chunks:
-                chunk_count += 1
-                logger.info(f"🎤 PROCESSING CHUNK {chunk_count}: {type(ch)}")
-                try:
-                    # Convert chunk to numpy array
-                    if hasattr(ch, 'audio_float_array'):
-                        audio_arrays.append(ch.audio_float_array)
-                        logger.info(f"🎤 CHUNK {chunk_count}: audio_float_array, shape={ch.audio_float_array.shape}")
-                    elif hasattr(ch, 'audio'):
-                        audio_data = np.array(ch.audio, dtype=np.float32)  # type: ignore
-                        audio_arrays.append(audio_data)
-                        logger.info(f"🎤 CHUNK {chunk_count}: audio, shape={audio_data.shape}")
-                    else:
-                        # Try to convert directly
-                        audio_arrays.append(np.array(ch, dtype=np.float32))
-                        logger.info(f"🎤 CHUNK {chunk_count}: direct conversion, shape={np.array(ch).shape}")
-                except Exception as e:
-                    logger.warning(f"🎤 CHUNK {chunk_count} PROCESSING FAILED: {e}")
-                    continue
-            
-            logger.info(f"🎤 PROCESSED {chunk_count} CHUNKS, {len(audio_arrays)} SUCCESSFUL")
-            
-            if not audio_arrays:
-                logger.warning("🎤 NO AUDIO GENERATED FROM PIPER")
+            audio_arr = self._synthesize_piper(text)
+            if audio_arr is None:
                 if notify:
                     _notify_dashboard_state('speaking_ended')
                 return False
-            
-            # Concatenate all audio arrays
-            logger.info(f"🎤 CONCATENATING {len(audio_arrays)} AUDIO ARRAYS...")
-            audio_arr = np.concatenate(audio_arrays).astype(np.float32)
-            logger.info(f"🎤 CONCATENATED AUDIO SHAPE: {audio_arr.shape}, DURATION: {len(audio_arr) / sr:.2f}s")
-            
+
             # Cache the audio for future use
             self._cache_audio(text, audio_arr)
             
             # Play audio
-            logger.info(f"🎤 PLAYING AUDIO: interruptible={interruptible}, audio_handler={self.audio_handler is not None}")
+            logger.info("🎤 PLAYING AUDIO: interruptible=%s, audio_handler=%s", interruptible, self.audio_handler is not None)
             if self.audio_handler and interruptible:
-                logger.info(f"🎤 USING INTERRUPTIBLE AUDIO HANDLER")
+                logger.info("🎤 USING INTERRUPTIBLE AUDIO HANDLER")
                 audio_arr = self._ensure_rate(audio_arr, sr, TTS_SAMPLE_RATE)
-                logger.info(f"🎤 AUDIO RATE CONVERTED: {len(audio_arr)} samples at {TTS_SAMPLE_RATE}Hz")
+                logger.info("🎤 AUDIO RATE CONVERTED: %s samples at %sHz", len(audio_arr), TTS_SAMPLE_RATE)
                 ok = self.audio_handler.play_audio(audio_arr)
-                logger.info(f"🎤 INTERRUPTIBLE PLAYBACK RESULT: {ok}")
+                logger.info("🎤 INTERRUPTIBLE PLAYBACK RESULT: %s", ok)
                 if notify:
                     _notify_dashboard_state('speaking_ended' if ok else 'speaking_interrupted')
                 return ok
             else:
-                logger.info(f"🎤 USING SOUNDDEVICE PLAYBACK")
+                logger.info("🎤 USING SOUNDDEVICE PLAYBACK")
                 result = self._play_audio_sounddevice(audio_arr, sr, notify)
-                logger.info(f"🎤 SOUNDDEVICE PLAYBACK RESULT: {result}")
+                logger.info("🎤 SOUNDDEVICE PLAYBACK RESULT: %s", result)
                 return result
                 
         except ImportError as e:
@@ -1193,13 +1879,13 @@ class TTSManager:
     def _play_audio_sounddevice(self, audio_arr: np.ndarray, sample_rate: int, notify: bool) -> bool:
         """Play audio using sounddevice with error recovery"""
         try:
-            logger.info(f"🎤 SOUNDDEVICE PLAY START: shape={audio_arr.shape}, sample_rate={sample_rate}, notify={notify}")
+            logger.info("🎤 SOUNDDEVICE PLAY START: shape=%s, sample_rate=%s, notify=%s", audio_arr.shape, sample_rate, notify)
             import sounddevice as sd
-            logger.info(f"🎤 CALLING sd.play()...")
+            logger.info("🎤 CALLING sd.play()...")
             sd.play(audio_arr, samplerate=sample_rate)
-            logger.info(f"🎤 CALLING sd.wait()...")
+            logger.info("🎤 CALLING sd.wait()...")
             sd.wait()
-            logger.info(f"🎤 SOUNDDEVICE PLAY COMPLETE")
+            logger.info("🎤 SOUNDDEVICE PLAY COMPLETE")
             if notify:
                 _notify_dashboard_state('speaking_ended')
             return True
@@ -1232,7 +1918,11 @@ class TTSManager:
             return False
 
     def interrupt(self):
-        """Interrupt current speech"""
+        """Interrupt current speech and drop any sentences still queued"""
+        with self._tts_count_lock:
+            self._generation += 1
+        with self._cache_lock:
+            self._prefetched.clear()
         if self.audio_handler:
             self.audio_handler.interrupt_playback()
             logger.info("TTS playback interrupted")
@@ -1291,7 +1981,11 @@ class TTSManager:
         if not self._cache_enabled:
             return None
         with self._cache_lock:
-            return self._tts_cache.get(text)
+            audio = self._tts_cache.pop(text, None)
+            if audio is not None:
+                # Re-insert so eviction (oldest first) spares phrases in use
+                self._tts_cache[text] = audio
+            return audio
     
     def _cache_audio(self, text: str, audio: np.ndarray) -> None:
         """Cache audio for text with memory monitoring"""
@@ -1310,12 +2004,14 @@ class TTSManager:
                         del self._tts_cache[key]
                     logger.debug(f"🧹 Removed {remove_count} old cache entries")
 
-                self._tts_cache[text] = audio.copy()
+                # Store without copying; read-only so no player can mutate a shared entry
+                audio.flags.writeable = False
+                self._tts_cache[text] = audio
 
-                # Log memory usage periodically
-                if current_size % 10 == 0:  # Every 10 cache operations
-                    memory_usage = self.get_memory_usage()
-                    logger.debug(f"📊 TTS cache memory usage: {memory_usage}")
+            # Log memory usage periodically (outside the lock: get_memory_usage takes it)
+            if current_size % 10 == 0:  # Every 10 cache operations
+                memory_usage = self.get_memory_usage()
+                logger.debug(f"📊 TTS cache memory usage: {memory_usage}")
 
         except Exception as e:
             logger.warning(f"Failed to cache audio: {e}")
@@ -1506,27 +2202,27 @@ def speak(text: str):
     success = False
     
     try:
-        logger.info(f"🎤 SPEAK FUNCTION START: '{text[:50]}{'...' if len(text) > 50 else ''}' (length: {len(text)} chars)")
-        logger.info(f"🎤 INTERRUPTION_ENABLED: {INTERRUPTION_ENABLED}, conversation_manager: {conversation_manager is not None}")
+        logger.info("🎤 SPEAK FUNCTION START: '%.50s%s' (length: %s chars)", text, '...' if len(text) > 50 else '', len(text))
+        logger.info("🎤 INTERRUPTION_ENABLED: %s, conversation_manager: %s", INTERRUPTION_ENABLED, conversation_manager is not None)
         
         if INTERRUPTION_ENABLED and conversation_manager:
-            logger.info(f"🎤 USING INTERRUPTIBLE TTS PATH")
+            logger.info("🎤 USING INTERRUPTIBLE TTS PATH")
             # Start conversation response tracking
             conversation_manager.start_response(text)
 
             # Use interruptible TTS
             _notify_dashboard_state('speaking_started')
-            logger.info(f"🎤 CALLING tts_manager.speak() with interruptible=True")
+            logger.info("🎤 CALLING tts_manager.speak() with interruptible=True")
             completed = tts_manager.speak(text, interruptible=True, notify=False)
-            logger.info(f"🎤 tts_manager.speak() RESULT: {completed}")
+            logger.info("🎤 tts_manager.speak() RESULT: %s", completed)
 
             if completed:
-                logger.info(f"🎤 TTS COMPLETED SUCCESSFULLY")
+                logger.info("🎤 TTS COMPLETED SUCCESSFULLY")
                 conversation_manager.update_response(text, is_complete=True)
                 _notify_dashboard_state('speaking_ended')
                 success = True
             else:
-                logger.info(f"🎤 TTS WAS INTERRUPTED")
+                logger.info("🎤 TTS WAS INTERRUPTED")
                 # TTS was interrupted - only interrupt if not already interrupted
                 with conversation_manager.lock:
                     if (conversation_manager.current_context and
@@ -1535,12 +2231,12 @@ def speak(text: str):
                 _notify_dashboard_state('speaking_interrupted')
 
         else:
-            logger.info(f"🎤 USING NON-INTERRUPTIBLE TTS PATH")
+            logger.info("🎤 USING NON-INTERRUPTIBLE TTS PATH")
             # Use non-interruptible TTS
             _notify_dashboard_state('speaking_started')
-            logger.info(f"🎤 CALLING tts_manager.speak() with interruptible=False")
+            logger.info("🎤 CALLING tts_manager.speak() with interruptible=False")
             completed = tts_manager.speak(text, interruptible=False, notify=False)
-            logger.info(f"🎤 tts_manager.speak() RESULT: {completed}")
+            logger.info("🎤 tts_manager.speak() RESULT: %s", completed)
             _notify_dashboard_state('speaking_ended')
             success = completed
             
@@ -1576,9 +2272,262 @@ def speak(text: str):
 
 """Web GUI removed from voice_assistant; use web_dashboard service instead."""
 
+def _run_with_deadline(func: Callable[[], Any], label: str, timeout: float = SHUTDOWN_STEP_TIMEOUT) -> bool:
+    """Run a cleanup step on a daemon thread and stop waiting after ``timeout``.
+
+    Returns True if the step finished in time; exceptions it raised are re-raised.
+    """
+    done = threading.Event()
+    errors: List[BaseException] = []
+
+    def _target():
+        try:
+            func()
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            done.set()
+
+    threading.Thread(target=_target, name=f"shutdown-{label}", daemon=True).start()
+    if not done.wait(timeout):
+        logger.warning(f"{label} exceeded {timeout:.1f}s shutdown deadline, abandoning")
+        return False
+    if errors:
+        raise errors[0]
+    return True
+
+class _TurnState:
+    """Per-turn endpointing bookkeeping for the main loop.
+
+    Grouping the fields in one slotted object keeps them together and lets
+    other threads share the state by reference instead of through globals.
+    Times are ``time.monotonic_ns()`` integers, immune to wall-clock jumps.
+    """
+
+    __slots__ = ("voiced", "last_voice", "now", "paused")
+
+    def __init__(self, now: int) -> None:
+        self.voiced = False
+        self.last_voice = now
+        self.now = now
+        self.paused = False  # a pause marker was sent for the current silence
+
+
+def _write_console(text: str) -> None:
+    """Emit a complete console line with a single write and flush"""
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+def _report_audio_status() -> None:
+    """Print and clear the stream status recorded by the audio callback"""
+    global _audio_status
+    status, _audio_status = _audio_status, None
+    if status:
+        sys.stderr.write(f"{status}\n")
+
+# Runs the LLM health probe alongside input validation at turn end
+_turn_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="va-turn")
+
+# Voiced audio for the STT stage, interleaved with the markers below. The
+# audio loop only runs VAD and endpointing; transcription happens on its own
+# thread so a slow Whisper call never delays end-of-turn or barge-in detection
+_stt_queue: "queue.Queue[Any]" = queue.Queue(maxsize=STT_QUEUE_SIZE)
+_STT_PAUSE = "pause"  # short silence: speculate on the partial transcript
+_STT_END = "end"  # confirmed end of turn: flush the transcript
+
+def _stt_worker_loop(stream_tr: StreamingTranscriber) -> None:
+    """Transcribe queued audio and hand finished utterances to the turn worker"""
+    speculative: Optional[_SpeculativeReply] = None
+    while True:
+        item = _stt_queue.get()
+        try:
+            if item is None:
+                break
+            if item is _STT_END:
+                _handle_turn_end(stream_tr, speculative)
+                speculative = None
+            elif item is _STT_PAUSE:
+                if speculative is None:
+                    speculative = _start_speculative_reply(stream_tr.peek())
+            else:
+                if speculative is not None:
+                    # The user kept talking: the partial transcript is stale
+                    speculative.cancel()
+                    speculative = None
+                delta = stream_tr.add_chunk(item)
+                if delta:
+                    _write_console(delta)
+        except Exception as e:
+            logger.error(f"Transcription failed: {e}")
+        finally:
+            _stt_queue.task_done()
+
+# Finished utterances (with any speculative reply started for them) waiting
+# for the LLM/TTS stage; the audio loop never blocks on generation or
+# playback, it only hands transcripts over
+_turn_queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=TURN_QUEUE_SIZE)
+
+def _handle_turn_end(stream_tr: StreamingTranscriber,
+                     speculative: Optional[_SpeculativeReply] = None) -> None:
+    """Flush the finished utterance and hand it to the turn worker"""
+    transcript = stream_tr.flush()
+    if not transcript:
+        if speculative is not None:
+            speculative.cancel()
+        return
+    try:
+        _turn_queue.put_nowait((transcript, speculative))
+    except queue.Full:
+        logger.warning("Turn queue full; dropping utterance")
+        if speculative is not None:
+            speculative.cancel()
+
+def _turn_worker_loop() -> None:
+    """Answer queued utterances one at a time until a None sentinel arrives"""
+    while True:
+        item = _turn_queue.get()
+        try:
+            if item is None:
+                break
+            _process_turn(*item)
+        except Exception as e:
+            logger.error(f"Turn processing failed: {e}")
+        finally:
+            _turn_queue.task_done()
+
+def _process_turn(transcript: str, speculative: Optional[_SpeculativeReply] = None) -> None:
+    """Answer one utterance (LLM or degraded mode), then speak"""
+    try:
+        _answer_turn(transcript, speculative)
+    finally:
+        # Unused or finished speculation must not keep a request open
+        if speculative is not None:
+            speculative.cancel()
+
+# Correlates the va_chat_in/va_chat_out log lines of one turn; a counter
+# avoids an os.urandom() call per utterance
+_turn_ids = itertools.count(1)
+
+def _answer_turn(transcript: str, speculative: Optional[_SpeculativeReply]) -> None:
+    # One write per line: print() issues separate writes for the text and the newline
+    _write_console(f"\n[YOU] {transcript}\n")
+
+    # Check LLM availability in the background while the input is validated
+    service_future = _turn_pool.submit(_llm_service_available_cached)
+
+    # Validate once; everything below uses the sanitized text
+    transcript = prepare_transcript(transcript)
+    if transcript is None:
+        _write_console("[BOT] Invalid input received\n\n")
+        return
+
+    # %-style args defer formatting; the guard also skips the preview slice
+    # and the correlation id when INFO is filtered out
+    log_info = logger.isEnabledFor(logging.INFO)
+    msg_id = next(_turn_ids) if log_info else 0
+    if log_info:
+        logger.info("va_chat_in id=%s len=%d preview=%r", msg_id, len(transcript), transcript[:80])
+
+    if INTERRUPTION_ENABLED and conversation_manager:
+        conversation_manager.begin_turn(transcript)
+
+    # Use degraded mode if the LLM service is unavailable
+    service_available = service_future.result()
+
+    if service_available:
+        if speculative is not None:
+            reply = llama_chat(transcript, speculative=speculative)
+        else:
+            reply = llama_chat(transcript)
+    else:
+        logger.warning("LLM service unavailable, using degraded mode")
+        reply = get_degraded_response(transcript)
+
+    _write_console(f"[BOT] {reply}\n\n")
+    if log_info:
+        logger.info("va_chat_out reply_to=%s len=%d preview=%r", msg_id, len(reply), reply[:80])
+    # Avoid duplicate speech if streaming TTS already occurred
+    if not TTS_STREAMED:
+        speak(reply)
+
+_input_stream = None  # active sd.InputStream, released by _cleanup()
+_pipeline_threads: List[threading.Thread] = []  # STT/turn workers, joined by _cleanup()
+_control_server = None  # werkzeug server for the control API, shut down by _cleanup()
+_cleanup_lock = threading.Lock()
+_cleanup_done = threading.Event()
+
+def _cleanup() -> None:
+    """Release the turn worker, audio stream, message bus and TTS exactly once.
+
+    Registered with atexit and also called from main()'s finally block;
+    whichever runs first does the work and later calls return immediately.
+    """
+    with _cleanup_lock:
+        if _cleanup_done.is_set():
+            return
+        _cleanup_done.set()
+
+    # Let the STT and turn workers exit once their current item is done.
+    # Stopping speech releases a turn waiting on playback, and an in-flight LLM
+    # stream stops at its next delta once _cleanup_done is set; the workers get
+    # one shared deadline and are daemons, so a stuck LLM call cannot block exit
+    _turn_pool.shutdown(wait=False, cancel_futures=True)
+    for worker_queue in (_stt_queue, _turn_queue):
+        try:
+            worker_queue.put_nowait(None)
+        except queue.Full:
+            pass
+    if _pipeline_threads:
+        try:
+            tts_manager.interrupt()
+        except Exception as e:
+            logger.warning(f"Error interrupting speech: {e}")
+        deadline = time.monotonic() + SHUTDOWN_STEP_TIMEOUT
+        for worker in _pipeline_threads:
+            worker.join(max(0.0, deadline - time.monotonic()))
+            if worker.is_alive():
+                logger.warning(f"{worker.name} still busy at shutdown, abandoning")
+
+    # Each step gets a deadline so an unresponsive device or bus server
+    # cannot hold up Ctrl+C
+    stream = _input_stream
+    if stream is not None:
+        def _close_stream():
+            # abort() drops pending input buffers; stop() would wait for them
+            stream.abort()
+            stream.close()
+
+        try:
+            _run_with_deadline(_close_stream, "audio stream close")
+        except Exception:
+            pass
+
+    server = _control_server
+    if server is not None:
+        try:
+            _run_with_deadline(server.shutdown, "control server shutdown")
+        except Exception as e:
+            logger.warning(f"Error stopping control server: {e}")
+
+    # Clean up message bus client
+    if INTERRUPTION_ENABLED and bus_client:
+        try:
+            if _run_with_deadline(bus_client.stop, "message bus stop"):
+                print("✅ Message bus client disconnected")
+        except Exception as e:
+            logger.warning(f"Error stopping message bus client: {e}")
+
+    # Clean up TTS manager to prevent memory leaks
+    try:
+        tts_manager.cleanup()
+        print("✅ TTS manager cleaned up")
+    except Exception as e:
+        logger.warning(f"Error cleaning up TTS manager: {e}")
+
 # ---- Main loop ----
 def main():
-    global TTS_STREAMED
+    global TTS_STREAMED, _input_stream, _control_server
+    atexit.register(_cleanup)
     # Ensure ResponseState is available
     from .conversation_manager import ResponseState
     print("🚀 Starting MacBot Voice Assistant...")
@@ -1597,6 +2546,10 @@ def main():
         print(f"✅ TTS engine ready: {tts_manager.engine_type}")
     except Exception as e:
         print(f"❌ TTS engine init failed: {e}")
+    if FILLER_ENABLED and FILLER_PHRASE:
+        threading.Thread(target=tts_manager.warm_cache, args=([FILLER_PHRASE],),
+                         name="TTSWarmup", daemon=True).start()
+    threading.Thread(target=check_llm_quantization, name="LLMQuantCheck", daemon=True).start()
 
     # Initialize message bus client for interruption signals (if enabled)
     global bus_client
@@ -1617,6 +2570,14 @@ def main():
                     print(f"🎤 Conversation interrupted by {source}")
 
             bus_client.register_handler('interruption', handle_interruption_message)
+
+            def handle_service_down_message(message: Dict):
+                """Switch to degraded mode as soon as the orchestrator reports the LLM down"""
+                if message.get('service') in ('llama', 'llm'):
+                    logger.warning("LLM service reported down; using degraded mode")
+                    _mark_llm_service_down()
+
+            bus_client.register_handler('service_down', handle_service_down_message)
             print("✅ Message bus client connected")
 
         except Exception as e:
@@ -1668,7 +2629,7 @@ def main():
             try:
                 data = request.get_json() or {}
                 text = str(data.get('text', '')).strip()
-                logger.info(f"TTS request received: '{text[:50]}{'...' if len(text) > 50 else ''}'")
+                logger.info("TTS request received: '%.50s%s'", text, '...' if len(text) > 50 else '')
                 if not text:
                     return jsonify({'ok': False, 'error': 'text required'}), 400
                 # ensure TTS is ready
@@ -1902,13 +2863,11 @@ def main():
                 logger.error(f"Control info error: {e}")
                 return jsonify({'error': str(e)}), 500
 
-        def _run_control():
-            try:
-                control_app.run(host=VA_HOST, port=VA_PORT, debug=False, use_reloader=False)
-            except Exception as e:
-                logger.warning(f"Voice assistant control server failed to start: {e}")
-
-        threading.Thread(target=_run_control, daemon=True).start()
+        # Thread-per-request so a slow /speak or /info never delays /interrupt
+        # (barge-in latency); the server handle lets _cleanup() shut it down
+        from werkzeug.serving import make_server
+        _control_server = make_server(VA_HOST, VA_PORT, control_app, threaded=True)
+        threading.Thread(target=_control_server.serve_forever, name="VAControl", daemon=True).start()
         logger.info(f"Voice assistant control server on http://{VA_HOST}:{VA_PORT}")
     except Exception as e:
         logger.warning(f"Voice assistant control server not started: {e}")
@@ -1937,134 +2896,104 @@ def main():
             channels=1,
             samplerate=SAMPLE_RATE,
             dtype="float32",
-            blocksize=int(SAMPLE_RATE * BLOCK_DUR),
+            blocksize=_AUDIO_BLOCK_SIZE,
             callback=_callback,
         )
         stream.start()
+        _input_stream = stream
         logger.info("Audio input stream started")
     except Exception as e:
         logger.warning(f"Audio initialization failed; running in text-only mode: {e}")
 
-    voiced = False
     stream_tr = StreamingTranscriber(sample_rate=SAMPLE_RATE)
-    last_voice = time.time()
+    turn = _TurnState(time.monotonic_ns())
+    # Bind the per-block methods once; the loop runs every BLOCK_DUR seconds
+    ring_wait = _audio_ring.wait
+    ring_peek = _audio_ring.peek
+    ring_advance = _audio_ring.advance
+    ring_available = _audio_ring.available
+    stt_put = _stt_queue.put
+    vad_runs = voiced_frame_runs
+    monotonic_ns = time.monotonic_ns
+    block_size = _AUDIO_BLOCK_SIZE
+    # Candidate end-of-turn: the turn detector confirms after a short fixed
+    # delay, plain VAD waits for the configured silence hang
+    end_delay_ns = TURNING_DELAY_NS if HAS_TURN_DETECT else SILENCE_HANG_NS
+    # A shorter pause starts the LLM on the partial transcript; the reply is
+    # only spoken if the turn then ends with the same transcript
+    speculate_ns = (SPECULATIVE_SILENCE_NS
+                    if SPECULATIVE_REPLY and SPECULATIVE_SILENCE_NS < end_delay_ns else None)
+    watch_barge_in = bool(INTERRUPTION_ENABLED and conversation_manager)
+    prefill = _prefill_llm_cache if LLM_PREFILL_WARMUP else None
+
+    # Transcription, LLM generation and TTS each run on their own threads so
+    # the audio loop keeps draining the ring (and detecting speech) while an
+    # utterance is transcribed or a reply is in progress
+    stt_worker = threading.Thread(target=_stt_worker_loop, args=(stream_tr,), name="SttWorker", daemon=True)
+    stt_worker.start()
+    turn_worker = threading.Thread(target=_turn_worker_loop, name="TurnWorker", daemon=True)
+    turn_worker.start()
+    _pipeline_threads[:] = [stt_worker, turn_worker]
 
     try:
         while True:
             if stream is None:
                 time.sleep(1.0)
                 continue
-            block = audio_q.get()
-            # Optimize: avoid reshape by working with the original shape
-            # is_voiced can handle multi-dimensional arrays
-            v = is_voiced(block)
-            now = time.time()
+            if not ring_wait(timeout=0.5):
+                continue
+            if _audio_status is not None:
+                _report_audio_status()
+            # Zero-copy view of everything queued (cut at the ring's wrap point);
+            # VAD and the transcriber (which copies what it keeps) are done with
+            # it long before the producer laps it. When the loop has fallen
+            # behind, one vectorised VAD pass covers all the queued blocks.
+            span = ring_peek(ring_available())
+            frame_len = block_size if len(span) >= block_size else len(span)
+            if frame_len == 0:
+                continue
+            span = span[:len(span) - len(span) % frame_len]
+            ring_advance(len(span))
+            runs = vad_runs(span, frame_len)
+            turn.now = monotonic_ns()
             
-            # Performance optimization: skip processing if we're in a speaking state and not interrupted
-            if (INTERRUPTION_ENABLED and conversation_manager and 
-                conversation_manager.current_context and
-                conversation_manager.current_context.current_state == ConversationState.SPEAKING and
-                conversation_manager.current_context.response_state != ResponseState.INTERRUPTED):
+            # While the assistant speaks, only listen for barge-in; skip transcription
+            context = conversation_manager.current_context if watch_barge_in else None
+            if (context and
+                context.current_state == ConversationState.SPEAKING and
+                context.response_state != ResponseState.INTERRUPTED):
+                handler = tts_manager.audio_handler
+                if handler:
+                    for start in range(0, len(span), frame_len):
+                        if handler.check_voice_activity(span[start:start + frame_len]):
+                            conversation_manager.interrupt_response()
+                            break
                 continue
 
-            if v:
-                voiced = True
-                last_voice = now
-                # Only reshape when needed for the transcriber
-                block_flat = block.reshape(-1)
-                delta = stream_tr.add_chunk(block_flat)
-                if delta:
-                    print(delta, end="", flush=True)
-            elif voiced:
-                # candidate end-of-turn
-                if HAS_TURN_DETECT:
-                    # simple delay + confirm (for demo)
-                    if now - last_voice > TURNING_DELAY:
-                        transcript = stream_tr.flush()
-                        voiced = False
-                        if transcript:
-                            print(f"\n[YOU] {transcript}")
-                            msg_id = str(uuid.uuid4())
-                            logger.info(f"va_chat_in id={msg_id} len={len(transcript)} preview={transcript[:80]!r}")
-                            
-                            # Validate input before processing
-                            if not validate_input(transcript):
-                                print("[BOT] Invalid input received\n")
-                                continue
-                                
-                            if INTERRUPTION_ENABLED and conversation_manager:
-                                conversation_manager.start_conversation()
-                                conversation_manager.add_user_input(transcript)
-
-                            # Check if LLM service is available, otherwise use degraded mode
-                            service_available = check_llm_service_available()
-
-                            if service_available:
-                                reply = llama_chat(transcript)
-                            else:
-                                logger.warning("LLM service unavailable, using degraded mode")
-                                reply = get_degraded_response(transcript)
-
-                            print(f"[BOT] {reply}\n")
-                            logger.info(f"va_chat_out reply_to={msg_id} len={len(reply)} preview={reply[:80]!r}")
-                            # Avoid duplicate speech if streaming TTS already occurred
-                            if not TTS_STREAMED:
-                                speak(reply)
-                else:
-                    if now - last_voice > SILENCE_HANG:
-                        transcript = stream_tr.flush()
-                        voiced = False
-                        if transcript:
-                            print(f"\n[YOU] {transcript}")
-                            msg_id = str(uuid.uuid4())
-                            logger.info(f"va_chat_in id={msg_id} len={len(transcript)} preview={transcript[:80]!r}")
-                            
-                            # Validate input before processing
-                            if not validate_input(transcript):
-                                print("[BOT] Invalid input received\n")
-                                continue
-                                
-                            if INTERRUPTION_ENABLED and conversation_manager:
-                                conversation_manager.start_conversation()
-                                conversation_manager.add_user_input(transcript)
-
-                            # Check if LLM service is available, otherwise use degraded mode
-                            service_available = check_llm_service_available()
-
-                            if service_available:
-                                reply = llama_chat(transcript)
-                            else:
-                                logger.warning("LLM service unavailable, using degraded mode")
-                                reply = get_degraded_response(transcript)
-
-                            print(f"[BOT] {reply}\n")
-                            logger.info(f"va_chat_out reply_to={msg_id} len={len(reply)} preview={reply[:80]!r}")
-                            if not TTS_STREAMED:
-                                speak(reply)
+            if len(runs):
+                if not turn.voiced and prefill is not None:
+                    # Utterance onset: warm the prompt cache while the user talks
+                    prefill()
+                turn.voiced = True
+                turn.paused = False
+                turn.last_voice = turn.now
+                # Silent frames are not transcribed; each voiced run is queued
+                # as one copy, since the ring will overwrite the span
+                for start, end in runs:
+                    stt_put(span[start * frame_len:end * frame_len].copy())
+            elif turn.voiced:
+                silent_ns = turn.now - turn.last_voice
+                if silent_ns > end_delay_ns:
+                    turn.voiced = False
+                    stt_put(_STT_END)
+                elif (speculate_ns is not None and not turn.paused
+                      and silent_ns > speculate_ns):
+                    turn.paused = True
+                    stt_put(_STT_PAUSE)
     except KeyboardInterrupt:
         print("\nExiting...")
     finally:
-        if stream is not None:
-            try:
-                stream.stop()
-                stream.close()
-            except Exception:
-                pass
-
-        # Clean up message bus client
-        if INTERRUPTION_ENABLED and bus_client:
-            try:
-                bus_client.stop()
-                print("✅ Message bus client disconnected")
-            except Exception as e:
-                logger.warning(f"Error stopping message bus client: {e}")
-
-        # Clean up TTS manager to prevent memory leaks
-        try:
-            tts_manager.cleanup()
-            print("✅ TTS manager cleaned up")
-        except Exception as e:
-            logger.warning(f"Error cleaning up TTS manager: {e}")
+        _cleanup()
 
 if __name__ == "__main__":
     try:
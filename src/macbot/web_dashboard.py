@@ -2,15 +2,37 @@
 """
 MacBot Web Dashboard - Live monitoring and control interface
 """
+from . import config as CFG
+
+# Cooperative servers must patch the stdlib before anything opens a socket
+_ASYNC_MODE = CFG.get_web_dashboard_async_mode()
+try:
+    if _ASYNC_MODE == 'eventlet':
+        import eventlet  # type: ignore
+        eventlet.monkey_patch()
+    elif _ASYNC_MODE == 'gevent':
+        from gevent import monkey  # type: ignore
+        monkey.patch_all()
+except ImportError:
+    _ASYNC_MODE = 'threading'
+
+import atexit
 import os
 import sys
 import time
+import itertools
 import json
+import multiprocessing
+import queue
+import re
+import shutil
 import psutil
 import threading
 import subprocess
+import tempfile
 import uuid
-from collections import deque
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Optional
 
@@ -18,11 +40,13 @@ from typing import Optional
 from .utils import setup_path
 setup_path()
 import requests
+from urllib3.util.retry import Retry
 from flask import Flask, render_template, jsonify, request, Response, stream_with_context
-from flask_socketio import SocketIO, emit  # type: ignore
+from flask_socketio import SocketIO, emit, join_room, leave_room  # type: ignore
 import logging
 from .logging_utils import setup_logger
 from . import tools as tools_mod
+from .document_text import DocumentTextError, document_kind, extract_text as extract_document_text
 
 from .health_monitor import get_health_monitor
 
@@ -39,8 +63,36 @@ try:
 except ImportError:
     pass
 
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
-from . import config as CFG
+# orjson encodes the stats/status payloads several times faster than Flask's
+# stdlib-based provider when installed
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+# orjson>=3.9 embeds an already-encoded Fragment verbatim
+_orjson_fragment = getattr(_orjson, 'Fragment', None)
+
+def _unfragment(obj):
+    if _orjson_fragment is not None and isinstance(obj, _orjson_fragment):
+        return json.loads(obj.contents)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class _OrjsonPackets:
+    """``json`` stand-in for Socket.IO/Engine.IO packet encoding"""
+
+    @staticmethod
+    def dumps(obj, **kwargs) -> str:
+        try:
+            return _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            return json.dumps(obj, default=_unfragment, **kwargs)
+
+    @staticmethod
+    def loads(data):
+        return _orjson.loads(data)
+
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=_ASYNC_MODE,
+                    json=_OrjsonPackets if _orjson is not None else None)
 from .auth import require_auth, optional_auth, get_auth_manager
 from .validation import validate_chat_message, validate_tts_request, validate_voice_request
 
@@ -56,6 +108,12 @@ system_stats = {
 _cpu_percent_lock = threading.Lock()
 _cpu_percent_initialized = False
 
+# Callers within this many seconds of the last psutil sample (dashboard
+# tabs, SSE streams, the background monitor) share it instead of re-sampling
+_STATS_MIN_INTERVAL = 1.0
+_stats_lock = threading.Lock()
+_stats_sampled_at = float('-inf')
+
 # Conversation state management
 conversation_state = {
     'active': False,
@@ -69,8 +127,77 @@ conversation_state = {
 # Conversation history (in-memory for now, could be persisted to database)
 conversation_history = deque(maxlen=100)  # Keep last 100 messages
 
-# Connected WebSocket clients
-websocket_clients = set()
+# Every connect sends the full history; share one list copy (and with orjson,
+# one encoding) until the history changes instead of rebuilding it each time
+_history_lock = threading.RLock()
+_history_snapshot: dict = {'list': None, 'json': None}
+# 'seq' counts every append and clear and never goes back; 'cleared_at' is
+# the seq of the last clear. Clients track the seq they hold so the monitor
+# can ship only new entries
+_history_marks: dict = {'seq': 0, 'cleared_at': 0}
+
+def _append_history(item: dict) -> None:
+    with _history_lock:
+        conversation_history.append(item)
+        _history_snapshot['list'] = _history_snapshot['json'] = None
+        _history_marks['seq'] += 1
+
+def _clear_history() -> None:
+    with _history_lock:
+        conversation_history.clear()
+        _history_snapshot['list'] = _history_snapshot['json'] = None
+        _history_marks['seq'] += 1
+        _history_marks['cleared_at'] = _history_marks['seq']
+
+def _history_list() -> list:
+    """Snapshot of the conversation history; treat it as read-only"""
+    with _history_lock:
+        snap = _history_snapshot['list']
+        if snap is None:
+            snap = _history_snapshot['list'] = list(conversation_history)
+        return snap
+
+def _history_payload():
+    """Full history for a Socket.IO payload: a cached orjson Fragment when
+    available, so packets embed the encoded bytes instead of re-encoding"""
+    if _orjson_fragment is None:
+        return _history_list()
+    with _history_lock:
+        frag = _history_snapshot['json']
+        if frag is None:
+            frag = _history_snapshot['json'] = _orjson_fragment(
+                _orjson.dumps(list(conversation_history), option=_orjson.OPT_NON_STR_KEYS))
+        return frag
+
+def _history_state() -> tuple:
+    """Full history payload and the seq it reflects, read together"""
+    with _history_lock:
+        return _history_payload(), _history_marks['seq']
+
+def _history_delta(since: Optional[int]) -> tuple:
+    """Entries appended after seq `since` as (seq, delta); delta is None when
+    nothing changed.
+
+    ``added`` holds the appends numbered ``delta['since'] + 1`` through
+    ``delta['seq']``. A client holding seq ``h`` ignores the delta when
+    ``h >= seq``, appends ``added[h - since:]`` when ``h >= since``, and
+    otherwise replaces its history with ``added``. After a clear or an
+    overrun of the deque, ``since`` moves up to the oldest entry still held,
+    so clients that are further behind start over.
+    """
+    with _history_lock:
+        seq = _history_marks['seq']
+        if since == seq:
+            return seq, None
+        size = len(conversation_history)
+        # Oldest point the current entries can be replayed from
+        floor = max(_history_marks['cleared_at'], seq - size)
+        base = floor if since is None else max(since, floor)
+        added = list(itertools.islice(conversation_history, size - (seq - base), None))
+    return seq, {'added': added, 'since': base, 'seq': seq}
+
+# Socket.IO session ids of connected clients
+websocket_clients: set = set()
 
 llm_models_endpoint = CFG.get_llm_models_endpoint()
 rag_host, rag_port = CFG.get_rag_host_port()
@@ -85,25 +212,97 @@ service_status = {
     'web_gui': {'status': 'running', 'port': wd_port, 'endpoint': f'http://{wd_host}:{wd_port}'}
 }
 
-# Small helper to improve resiliency of proxied HTTP calls
-def _request_with_retry(method: str, url: str, *, json_body=None, timeout: float = 5.0, retries: int = 2, backoff: float = 0.2):
-    last_exc = None
-    for i in range(max(1, retries + 1)):
+# One keep-alive pool for every outbound call (health probes, proxies, RAG).
+# urllib3 retries a failed connect (nothing was sent yet) once, and a GET
+# answered 502-504 once; a request that reached the server is never resent,
+# so a slow POST surfaces as ReadTimeout instead of running twice. The final
+# response is returned rather than raised, as before
+_http_retry = Retry(
+    total=1,
+    connect=1,
+    read=False,
+    backoff_factor=0.2,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset(['GET']),
+    raise_on_status=False,
+)
+_http = requests.Session()
+_http.mount("http://", requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=_http_retry))
+# Fallback health probes run concurrently, so a sweep takes the slowest probe, not the sum
+_health_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="wd-health")
+
+# Transcription (ffmpeg + whisper) and generation run on their own bounded
+# pools so they never hold a Socket.IO handler; one LLM worker keeps replies
+# in order. Past _WORK_QUEUE_MAX queued or running jobs, new ones are refused
+_WORK_QUEUE_MAX = 8
+_VOICE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="wd-voice")
+_LLM_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wd-llm")
+_voice_slots = threading.BoundedSemaphore(_WORK_QUEUE_MAX)
+_llm_slots = threading.BoundedSemaphore(_WORK_QUEUE_MAX)
+
+def _submit_bounded(pool: ThreadPoolExecutor, slots: threading.BoundedSemaphore, fn, *args, **kwargs):
+    """Queue ``fn`` on ``pool``; returns None when ``slots`` are exhausted"""
+    if not slots.acquire(blocking=False):
+        return None
+    try:
+        future = pool.submit(fn, *args, **kwargs)
+    except Exception:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _f: slots.release())
+    return future
+
+# Document text extraction is CPU-bound, so uploads are parsed in worker
+# processes; created on first upload so idle dashboards spawn nothing.
+# Workers fork from a forkserver that has only document_text loaded, rather
+# than forking this threaded process or spawning a fresh interpreter. A
+# spawned or forkserver child still re-imports the parent's __main__ module,
+# so run the dashboard through macbot.cli (as the orchestrator does), not
+# ``python -m macbot.web_dashboard``, to keep this module out of the workers
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            ctx = multiprocessing.get_context('forkserver')
+            ctx.set_forkserver_preload(['macbot.document_text'])
+            _parse_pool = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1), mp_context=ctx)
+        return _parse_pool
+
+# Local services accept a connection in well under a millisecond; a short
+# connect timeout makes a stopped service fail fast while ``timeout`` still
+# bounds the (possibly slow) response
+_CONNECT_TIMEOUT = 0.3
+
+# Proxied HTTP call; retries are handled by the session's adapter
+def _request_with_retry(method: str, url: str, *, json_body=None, timeout: float = 5.0):
+    if method not in ('GET', 'POST'):
+        raise ValueError('unsupported method')
+    return _http.request(
+        method, url,
+        json=(json_body or {}) if method == 'POST' else None,
+        timeout=(_CONNECT_TIMEOUT, timeout),
+    )
+
+def _json_dumps(obj) -> str:
+    if _orjson is not None:
         try:
-            if method == 'GET':
-                return requests.get(url, timeout=timeout)
-            elif method == 'POST':
-                return requests.post(url, json=json_body or {}, timeout=timeout)
-            else:
-                raise ValueError('unsupported method')
-        except Exception as e:
-            last_exc = e
-            try:
-                time.sleep(backoff)
-            except Exception:
-                pass
-            backoff *= 2
-    raise last_exc if last_exc else RuntimeError('request failed')
+            return _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj)
+
+def _jsonify(obj) -> Response:
+    """``jsonify`` replacement that encodes with orjson when available"""
+    if _orjson is None:
+        return jsonify(obj)
+    try:
+        body = _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        return jsonify(obj)  # types only Flask's provider knows how to encode
+    return Response(body, mimetype='application/json')
 
 # API response helpers (non-breaking): include normalized fields while preserving legacy keys
 def _api_ok(payload: dict | None = None, message: str = "OK", extra: dict | None = None, status: int = 200):
@@ -115,7 +314,7 @@ def _api_ok(payload: dict | None = None, message: str = "OK", extra: dict | None
         resp['data'] = payload
     if extra:
         resp.update(extra)
-    return jsonify(resp), status
+    return _jsonify(resp), status
 
 def _api_error(message: str, code: str = 'bad_request', status: int = 400, details: dict | None = None, extra: dict | None = None):
     resp = {
@@ -127,7 +326,7 @@ def _api_error(message: str, code: str = 'bad_request', status: int = 400, detai
         resp['details'] = details
     if extra:
         resp.update(extra)
-    return jsonify(resp), status
+    return _jsonify(resp), status
 
 
 def _prime_cpu_percent_baseline():
@@ -145,7 +344,22 @@ def _prime_cpu_percent_baseline():
 
 
 def get_system_stats():
-    """Get current system statistics without blocking for CPU sampling."""
+    """Get current system statistics without blocking for CPU sampling.
+
+    Samples at most once per _STATS_MIN_INTERVAL; callers in between get the
+    cached snapshot.
+    """
+    global system_stats, _stats_sampled_at
+    with _stats_lock:
+        now = time.monotonic()
+        if now - _stats_sampled_at < _STATS_MIN_INTERVAL:
+            return system_stats
+        _stats_sampled_at = now
+        return _sample_system_stats()
+
+
+def _sample_system_stats():
+    global system_stats
     try:
         _prime_cpu_percent_baseline()
         cpu_percent = psutil.cpu_percent(interval=None)
@@ -165,7 +379,6 @@ def get_system_stats():
         }
 
         # Keep legacy global in sync for any external consumers.
-        global system_stats
         system_stats = stats_snapshot
         return stats_snapshot
     except Exception as e:
@@ -176,12 +389,39 @@ def get_system_stats():
 # Prime CPU stats baseline early so that the first live request has cached data
 _prime_cpu_percent_baseline()
 
+def _probe_service(url: str) -> bool:
+    """Return True if ``url`` answers 200 within the probe timeout"""
+    try:
+        return _http.get(url, timeout=(_CONNECT_TIMEOUT, 2)).status_code == 200
+    except Exception:
+        return False
+
+# Page loads, /api/services, SSE streams and the monitor share one sweep per
+# TTL, so probe traffic does not grow with the number of open dashboards
+_HEALTH_TTL = 3.0
+_health_lock = threading.Lock()
+_health_checked_at = float('-inf')
+
 def check_service_health():
+    """Refresh service_status unless it was checked within _HEALTH_TTL"""
+    global _health_checked_at
+    with _health_lock:
+        if time.monotonic() - _health_checked_at < _HEALTH_TTL:
+            return
+        _refresh_service_health()
+        _health_checked_at = time.monotonic()
+
+def _invalidate_service_health():
+    """Make the next check_service_health() probe again (e.g. after a restart)"""
+    global _health_checked_at
+    _health_checked_at = float('-inf')
+
+def _refresh_service_health():
     """Check health of all services"""
     try:
         orchestrator_ok = False
         try:
-            orc_resp = _request_with_retry('GET', f"http://{orc_host}:{orc_port}/services", timeout=1.5, retries=1)
+            orc_resp = _request_with_retry('GET', f"http://{orc_host}:{orc_port}/services", timeout=1.5)
             if orc_resp.status_code == 200:
                 data = orc_resp.json().get('services', {})
                 for name in service_status.keys():
@@ -192,23 +432,16 @@ def check_service_health():
             orchestrator_ok = False
 
         if not orchestrator_ok:
-            try:
-                response = requests.get(llm_models_endpoint, timeout=2)
-                service_status['llama']['status'] = 'running' if response.status_code == 200 else 'stopped'
-            except Exception:
-                service_status['llama']['status'] = 'stopped'
-
-            try:
-                va_resp = requests.get(f"http://{va_host}:{va_port}/health", timeout=2)
-                service_status['voice_assistant']['status'] = 'running' if va_resp.status_code == 200 else 'stopped'
-            except Exception:
-                service_status['voice_assistant']['status'] = 'stopped'
-
-            try:
-                response = requests.get(f"http://{rag_host}:{rag_port}/health", timeout=2)
-                service_status['rag']['status'] = 'running' if response.status_code == 200 else 'stopped'
-            except Exception:
-                service_status['rag']['status'] = 'stopped'
+            probes = {
+                _health_pool.submit(_probe_service, url): name
+                for name, url in (
+                    ('llama', llm_models_endpoint),
+                    ('voice_assistant', f"http://{va_host}:{va_port}/health"),
+                    ('rag', f"http://{rag_host}:{rag_port}/health"),
+                )
+            }
+            for future in as_completed(probes):
+                service_status[probes[future]]['status'] = 'running' if future.result() else 'stopped'
 
             # Web GUI is this dashboard
             service_status['web_gui']['status'] = 'running'
@@ -223,18 +456,43 @@ def dashboard():
     check_service_health()
     return render_template('dashboard.html', services=service_status, wd_host=wd_host, wd_port=wd_port)
 
-@app.route('/favicon.ico')
-def favicon():
-    """Serve favicon - return empty response to avoid 404"""
-    return '', 204
+class _FaviconMiddleware:
+    """Answer /favicon.ico before Flask routing; browsers request it on every page"""
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        if environ.get('PATH_INFO') == '/favicon.ico':
+            start_response('204 No Content', [('Cache-Control', 'public, max-age=86400')])
+            return [b'']
+        return self.wsgi_app(environ, start_response)
+
+app.wsgi_app = _FaviconMiddleware(app.wsgi_app)
+
+# Static URLs carry the file's mtime, so browsers may cache them indefinitely
+# and still pick up a changed dashboard.js on the next page load
+_STATIC_IMMUTABLE = 'public, max-age=31536000, immutable'
+
+@app.url_defaults
+def _version_static_urls(endpoint, values):
+    if endpoint == 'static' and 'filename' in values and 'v' not in values:
+        try:
+            values['v'] = int(os.path.getmtime(os.path.join(app.static_folder, values['filename'])))
+        except OSError:
+            pass
+
+@app.after_request
+def _cache_static(response):
+    if request.endpoint == 'static' and 'v' in request.args and response.status_code == 200:
+        response.headers['Cache-Control'] = _STATIC_IMMUTABLE
+    return response
 
 @app.route('/api/stats')
 def api_stats():
     """API endpoint for system statistics"""
-    global system_stats
-    system_stats = get_system_stats()
-    # lightweight stats API
-    return jsonify(system_stats)
+    # lightweight stats API; shares the cached sample
+    return _jsonify(get_system_stats())
 
 @app.route('/api/services')
 def api_services():
@@ -243,34 +501,32 @@ def api_services():
         check_service_health()
     except Exception as e:
         logger.error(f"Error checking service status: {e}")
-    return jsonify(service_status)
+    return _jsonify(service_status)
 
 @app.route('/api/metrics')
 def api_metrics():
     """Proxy to orchestrator metrics for UI consumption"""
     try:
-        host, port = CFG.get_orchestrator_host_port()
         # Allow a slightly higher timeout due to process introspection
-        r = _request_with_retry('GET', f"http://{host}:{port}/metrics", timeout=5, retries=1)
+        r = _request_with_retry('GET', f"http://{orc_host}:{orc_port}/metrics", timeout=5)
         if r.ok:
-            return jsonify(r.json())
-        return jsonify({'success': False, 'error': f'orc responded {r.status_code}'}), 502
+            return _jsonify(r.json())
+        return _jsonify({'success': False, 'error': f'orc responded {r.status_code}'}), 502
     except Exception as e:
         logger.error(f"Metrics proxy error: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/pipeline-check')
 def api_pipeline_check():
     """Proxy orchestrator pipeline-check for UI."""
     try:
-        host, port = CFG.get_orchestrator_host_port()
-        r = _request_with_retry('GET', f"http://{host}:{port}/pipeline-check", timeout=5, retries=1)
+        r = _request_with_retry('GET', f"http://{orc_host}:{orc_port}/pipeline-check", timeout=5)
         if r.ok:
-            return jsonify(r.json())
-        return jsonify({'success': False, 'error': f'orc responded {r.status_code}'}), 502
+            return _jsonify(r.json())
+        return _jsonify({'success': False, 'error': f'orc responded {r.status_code}'}), 502
     except Exception as e:
         logger.error(f"Pipeline proxy error: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _jsonify({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/service/<name>/restart', methods=['POST'])
@@ -278,26 +534,89 @@ def api_pipeline_check():
 def api_service_restart(name: str):
     """Proxy restart requests to orchestrator."""
     try:
-        host, port = CFG.get_orchestrator_host_port()
-        r = _request_with_retry('POST', f"http://{host}:{port}/service/{name}/restart", timeout=10, retries=1)
-        return jsonify(r.json()), r.status_code
+        r = _request_with_retry('POST', f"http://{orc_host}:{orc_port}/service/{name}/restart", timeout=10)
+        _invalidate_service_health()
+        return _jsonify(r.json()), r.status_code
     except Exception as e:
         logger.error(f"Service restart proxy error: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _jsonify({'success': False, 'error': str(e)}), 500
+
+# One producer samples and serializes the SSE payload for every /stream
+# client; each client only drains its own small queue
+_SSE_INTERVAL = 5.0
+_SSE_KEEPALIVE = 15.0  # idle comment lets a dead client be noticed on write
+_sse_subscribers: set = set()
+_sse_lock = threading.Lock()
+_sse_state = {'running': False, 'last': None}
+# Encoded payload keyed by the stats sample and health check it was built from
+_sse_encoded: dict = {'key': None, 'payload': None}
+
+def _sse_payload() -> str:
+    check_service_health()
+    stats = get_system_stats()
+    key = (_stats_sampled_at, _health_checked_at)
+    if key != _sse_encoded['key']:
+        _sse_encoded['payload'] = _json_dumps({
+            'system_stats': stats,
+            'service_status': service_status
+        })
+        _sse_encoded['key'] = key
+    return _sse_encoded['payload']
+
+def _sse_broadcast_loop():
+    """Publish one payload per interval to all subscribers; exits when none remain"""
+    while True:
+        try:
+            payload = _sse_payload()
+        except Exception as e:
+            logger.error(f"SSE broadcast error: {e}")
+            payload = None
+        with _sse_lock:
+            if not _sse_subscribers:
+                _sse_state['running'] = False
+                return
+            if payload is not None:
+                _sse_state['last'] = payload
+            subscribers = list(_sse_subscribers)
+        if payload is not None:
+            for q in subscribers:
+                try:
+                    q.put_nowait(payload)
+                except queue.Full:
+                    pass  # slow client: it gets the next payload instead
+        socketio.sleep(_SSE_INTERVAL)
+
+def _sse_subscribe() -> queue.Queue:
+    q: queue.Queue = queue.Queue(maxsize=4)
+    with _sse_lock:
+        _sse_subscribers.add(q)
+        if _sse_state['last'] is not None:
+            q.put_nowait(_sse_state['last'])
+        start = not _sse_state['running']
+        _sse_state['running'] = True
+    if start:
+        socketio.start_background_task(_sse_broadcast_loop)
+    return q
+
+def _sse_unsubscribe(q: queue.Queue) -> None:
+    with _sse_lock:
+        _sse_subscribers.discard(q)
 
 @app.route('/stream')
 def stream():
     """SSE stream for system stats and service status"""
     def event_stream():
-        while True:
-            stats = get_system_stats()
-            check_service_health()
-            data = json.dumps({
-                'system_stats': stats,
-                'service_status': service_status
-            })
-            yield f"data: {data}\n\n"
-            time.sleep(5)
+        q = _sse_subscribe()
+        try:
+            while True:
+                try:
+                    data = q.get(timeout=_SSE_KEEPALIVE)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {data}\n\n"
+        finally:
+            _sse_unsubscribe(q)
 
     return Response(stream_with_context(event_stream()), mimetype='text/event-stream')
 
@@ -305,7 +624,7 @@ def stream():
 def test_endpoint():
     """Test endpoint to verify web dashboard is responding"""
     # test endpoint
-    return jsonify({"status": "ok", "message": "Web dashboard test endpoint working", "timestamp": datetime.now().isoformat()})
+    return _jsonify({"status": "ok", "message": "Web dashboard test endpoint working", "timestamp": datetime.now().isoformat()})
 
 @app.route('/api/chat', methods=['POST'])
 @optional_auth
@@ -314,23 +633,23 @@ def api_chat():
     try:
         data = request.get_json() or {}
         message = data.get('message', '').strip()
-        print(f"🔵 WEB DASHBOARD: Chat API called with message: '{message}'")
-        logger.info(f"Chat API called with message: {message}")
+        logger.debug("Chat API called with message: %r", message)
 
         try:
             message = validate_chat_message(message)
         except Exception as e:
-            return jsonify({'success': False, 'error': f'Invalid message: {e}', 'code': 'validation_error'}), 400
+            return _jsonify({'success': False, 'error': f'Invalid message: {e}', 'code': 'validation_error'}), 400
 
         # Use unified processing path used by WebSocket handler
         # Avoid duplicating the user message in UI for HTTP fallback
-        response = _handle_chat_message_and_broadcast(message, emit_user=False)
-        print(f"🟢 WEB DASHBOARD: Chat API response: '{response}'")
-        return jsonify({'success': True, 'message': 'ok', 'data': {'response': response}, 'response': response})
+        future = _submit_bounded(_LLM_POOL, _llm_slots, _handle_chat_message_and_broadcast, message, emit_user=False)
+        if future is None:
+            return _jsonify({'success': False, 'error': 'Assistant is busy, try again shortly', 'code': 'busy'}), 503
+        response = future.result()
+        return _jsonify({'success': True, 'message': 'ok', 'data': {'response': response}, 'response': response})
     except Exception as e:
-        print(f"🔴 WEB DASHBOARD: Chat API error: {e}")
         logger.error(f"Chat API error: {e}")
-        return jsonify({'success': False, 'error': 'Internal server error', 'code': 'internal_error'}), 500
+        return _jsonify({'success': False, 'error': 'Internal server error', 'code': 'internal_error'}), 500
 
 @app.route('/api/llm', methods=['POST'])
 @optional_auth
@@ -341,25 +660,25 @@ def api_llm():
         message = data.get('message', '')
         
         if not message:
-            return jsonify({'success': False, 'error': 'Message is required', 'code': 'validation_error'}), 400
+            return _jsonify({'success': False, 'error': 'Message is required', 'code': 'validation_error'}), 400
         
         response = process_with_llm(message)
-        return jsonify({'success': True, 'message': 'ok', 'data': {'response': response}, 'response': response})
+        return _jsonify({'success': True, 'message': 'ok', 'data': {'response': response}, 'response': response})
         
     except Exception as e:
         logger.error(f"LLM API error: {e}")
-        return jsonify({'success': False, 'error': str(e), 'code': 'internal_error'}), 500
+        return _jsonify({'success': False, 'error': str(e), 'code': 'internal_error'}), 500
 
 @app.route('/api/mic-check', methods=['POST'])
 def api_mic_check():
     """Proxy mic check to the voice assistant control server.
     Helps trigger OS mic permission prompt and report status to UI."""
     try:
-        r = _request_with_retry('POST', f"http://{va_host}:{va_port}/mic-check", timeout=3, retries=1)
-        return (jsonify(r.json()), r.status_code)
+        r = _request_with_retry('POST', f"http://{va_host}:{va_port}/mic-check", timeout=3)
+        return (_jsonify(r.json()), r.status_code)
     except Exception as e:
         logger.warning(f"Mic check proxy failed: {e}")
-        return jsonify({'success': False, 'error': str(e), 'code': 'proxy_error'}), 500
+        return _jsonify({'success': False, 'error': str(e), 'code': 'proxy_error'}), 500
 
 @app.route('/api/assistant-speak', methods=['POST'])
 @optional_auth
@@ -371,12 +690,12 @@ def api_assistant_speak():
             data = validate_tts_request(data)
             text = data['text']
         except Exception as e:
-            return jsonify({'success': False, 'error': f'Invalid request: {e}', 'code': 'validation_error'}), 400
-        r = _request_with_retry('POST', f"http://{va_host}:{va_port}/speak", json_body={'text': text}, timeout=5, retries=1)
-        return jsonify(r.json()), r.status_code
+            return _jsonify({'success': False, 'error': f'Invalid request: {e}', 'code': 'validation_error'}), 400
+        r = _request_with_retry('POST', f"http://{va_host}:{va_port}/speak", json_body={'text': text}, timeout=5)
+        return _jsonify(r.json()), r.status_code
     except Exception as e:
         logger.warning(f"assistant speak proxy failed: {e}")
-        return jsonify({'success': False, 'error': str(e), 'code': 'proxy_error'}), 500
+        return _jsonify({'success': False, 'error': str(e), 'code': 'proxy_error'}), 500
 
 @app.route('/api/llm-settings')
 def api_llm_settings():
@@ -389,10 +708,10 @@ def api_llm_settings():
             'temperature': CFG.get_llm_temperature(),
             'max_tokens': CFG.get_llm_max_tokens(),
         }
-        return jsonify({'success': True, 'data': payload})
+        return _jsonify({'success': True, 'data': payload})
     except Exception as e:
         logger.error(f"llm-settings error: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/set-llm-max-tokens', methods=['POST'])
 @optional_auth
@@ -402,7 +721,7 @@ def api_set_llm_max_tokens():
         data = request.get_json() or {}
         mt = int(data.get('max_tokens', 0))
         if mt <= 0 or mt > 8192:
-            return jsonify({'success': False, 'error': 'max_tokens must be in (0, 8192]'}), 400
+            return _jsonify({'success': False, 'error': 'max_tokens must be in (0, 8192]'}), 400
         # persist
         try:
             import yaml
@@ -422,13 +741,13 @@ def api_set_llm_max_tokens():
             logger.warning(f"Failed to persist max_tokens: {e}")
         # ask VA to update runtime if available
         try:
-            _request_with_retry('POST', f"http://{va_host}:{va_port}/set-llm-max-tokens", json_body={'max_tokens': mt}, timeout=3, retries=1)
+            _request_with_retry('POST', f"http://{va_host}:{va_port}/set-llm-max-tokens", json_body={'max_tokens': mt}, timeout=3)
         except Exception as e:
             logger.debug(f"VA set-llm-max-tokens failed: {e}")
-        return jsonify({'success': True, 'max_tokens': mt})
+        return _jsonify({'success': True, 'max_tokens': mt})
     except Exception as e:
         logger.error(f"set-llm-max-tokens error: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/assistant-event', methods=['POST'])
 def api_assistant_event():
@@ -441,7 +760,7 @@ def api_assistant_event():
         message = str(data.get('message', '')).strip()
 
         if not event_type:
-            return jsonify({'success': False, 'error': 'type is required', 'code': 'validation_error'}), 400
+            return _jsonify({'success': False, 'error': 'type is required', 'code': 'validation_error'}), 400
 
         # Broadcast to clients
         payload = {'type': event_type, 'timestamp': datetime.now().isoformat()}
@@ -452,10 +771,10 @@ def api_assistant_event():
         except Exception as e:
             logger.warning(f"Failed to emit assistant_state: {e}")
 
-        return jsonify({'success': True, 'status': 'ok'})
+        return _jsonify({'success': True, 'status': 'ok'})
     except Exception as e:
         logger.error(f"Assistant event error: {e}")
-        return jsonify({'success': False, 'error': str(e), 'code': 'internal_error'}), 500
+        return _jsonify({'success': False, 'error': str(e), 'code': 'internal_error'}), 500
 
 @app.route('/api/voice', methods=['POST'])
 @optional_auth
@@ -467,142 +786,128 @@ def api_voice():
             data = validate_voice_request(data)
             audio_data = data['audio']
         except Exception as e:
-            return jsonify({'success': False, 'error': f'Invalid request: {e}', 'code': 'validation_error'}), 400
+            return _jsonify({'success': False, 'error': f'Invalid request: {e}', 'code': 'validation_error'}), 400
         
         # Process audio with Whisper
-        transcription = process_voice_with_whisper(audio_data)
+        future = _submit_bounded(_VOICE_POOL, _voice_slots, process_voice_with_whisper, audio_data)
+        if future is None:
+            return _jsonify({'success': False, 'error': 'Voice processing is busy, try again shortly', 'code': 'busy'}), 503
+        transcription = future.result()
         
         # Check if transcription is actually an error message
         if transcription and transcription.startswith('Audio conversion failed'):
             logger.error(f"FFmpeg error: {transcription}")
-            return jsonify({'success': False, 'error': 'Audio processing failed', 'code': 'audio_processing_error'}), 500
+            return _jsonify({'success': False, 'error': 'Audio processing failed', 'code': 'audio_processing_error'}), 500
         
         if transcription and transcription.startswith('ffmpeg not found'):
             logger.error(f"FFmpeg not found: {transcription}")
-            return jsonify({'success': False, 'error': 'Audio processing not available', 'code': 'ffmpeg_not_found'}), 503
+            return _jsonify({'success': False, 'error': 'Audio processing not available', 'code': 'ffmpeg_not_found'}), 503
         
         # Update conversation state
-        conversation_state['last_activity'] = datetime.now()
+        now = datetime.now()
+        conversation_state['last_activity'] = now
         conversation_state['current_speaker'] = 'user'
         conversation_state['message_count'] += 1
         
         # Broadcast conversation update only if we have speech-like content
         if transcription and transcription.strip().lower() != 'no speech detected':
-            socketio.emit('conversation_update', {
+            _broadcast_update({
                 'type': 'voice_transcription',
                 'transcription': transcription,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now.isoformat()
             })
         
-        return jsonify({'success': True, 'message': 'ok', 'data': {'transcription': transcription}, 'transcription': transcription})
+        return _jsonify({'success': True, 'message': 'ok', 'data': {'transcription': transcription}, 'transcription': transcription})
         
     except Exception as e:
         logger.error(f"Voice API error: {e}")
-        return jsonify({'success': False, 'error': str(e), 'code': 'internal_error'}), 500
+        return _jsonify({'success': False, 'error': str(e), 'code': 'internal_error'}), 500
 
 @app.route('/api/upload-documents', methods=['POST'])
 @optional_auth
 def upload_documents():
     """Upload documents and forward to RAG server.
-    Supports .txt natively; attempts .pdf (PyPDF2) and .docx (python-docx) when available.
+    Supports .txt natively; attempts .pdf (pypdfium2, else PyPDF2) and .docx (python-docx) when available.
     """
     try:
         if 'files' not in request.files:
-            return jsonify({'success': False, 'error': 'No files provided'}), 400
+            return _jsonify({'success': False, 'error': 'No files provided'}), 400
 
         files = request.files.getlist('files')
         if not files or files[0].filename == '':
-            return jsonify({'success': False, 'error': 'No files selected'}), 400
+            return _jsonify({'success': False, 'error': 'No files selected'}), 400
 
         success_count = 0
         errors = []
         forwarded = []
         token_list = CFG.get_rag_api_tokens()
         api_token = token_list[0] if token_list else 'change-me'
+        rag_url = f"http://{rag_host}:{rag_port}/api/documents"
+
+        def forward(filename: str, kind: str, content: str) -> None:
+            nonlocal success_count
+            resp = _http.post(
+                rag_url,
+                json={'content': content, 'title': filename, 'type': kind},
+                headers={'Authorization': f'Bearer {api_token}'},
+                timeout=10 if kind == 'text' else 15
+            )
+            if resp.status_code == 200:
+                success_count += 1
+                forwarded.append(filename)
+            else:
+                errors.append(f"{filename}: RAG responded {resp.status_code}")
 
-        for file in files:
-            if not file or not file.filename:
-                continue
-            filename = file.filename
-            name_lower = filename.lower()
-            try:
-                if name_lower.endswith('.txt'):
-                    # Read text content
-                    content_bytes = file.read()
-                    try:
-                        content = content_bytes.decode('utf-8', errors='ignore')
-                    except Exception:
-                        content = content_bytes.decode('latin-1', errors='ignore')
-
-                    rag_url = f"http://{rag_host}:{rag_port}/api/documents"
-                    resp = requests.post(
-                        rag_url,
-                        json={'content': content, 'title': filename, 'type': 'text'},
-                        headers={'Authorization': f'Bearer {api_token}'},
-                        timeout=10
-                    )
-                    if resp.status_code == 200:
-                        success_count += 1
-                        forwarded.append(filename)
-                    else:
-                        errors.append(f"{filename}: RAG responded {resp.status_code}")
-                elif name_lower.endswith('.pdf'):
-                    try:
-                        import PyPDF2  # type: ignore
-                    except Exception:
-                        errors.append(f"{filename}: PDF support requires PyPDF2")
-                        continue
-                    # Read PDF bytes and extract text
-                    from io import BytesIO
-                    pdf_reader = PyPDF2.PdfReader(BytesIO(file.read()))
-                    content = "\n".join([page.extract_text() or '' for page in pdf_reader.pages])
-                    content = content.strip()
-                    if not content:
-                        errors.append(f"{filename}: no extractable text")
-                        continue
-                    rag_url = f"http://{rag_host}:{rag_port}/api/documents"
-                    resp = requests.post(
-                        rag_url,
-                        json={'content': content, 'title': filename, 'type': 'pdf'},
-                        headers={'Authorization': f'Bearer {api_token}'},
-                        timeout=15
-                    )
-                    if resp.status_code == 200:
-                        success_count += 1
-                        forwarded.append(filename)
-                    else:
-                        errors.append(f"{filename}: RAG responded {resp.status_code}")
-                elif name_lower.endswith('.docx'):
-                    try:
-                        import docx  # type: ignore
-                    except Exception:
-                        errors.append(f"{filename}: DOCX support requires python-docx")
-                        continue
-                    document = docx.Document(file.stream)
-                    paras = [p.text for p in document.paragraphs]
-                    content = "\n".join([p for p in paras if p]).strip()
-                    if not content:
-                        errors.append(f"{filename}: empty or unreadable document")
-                        continue
-                    rag_url = f"http://{rag_host}:{rag_port}/api/documents"
-                    resp = requests.post(
-                        rag_url,
-                        json={'content': content, 'title': filename, 'type': 'docx'},
-                        headers={'Authorization': f'Bearer {api_token}'},
-                        timeout=15
-                    )
-                    if resp.status_code == 200:
-                        success_count += 1
-                        forwarded.append(filename)
+        # PDF/DOCX uploads are spooled to temp files and parsed in worker
+        # processes, in parallel and off this request's interpreter
+        parsing = {}
+        try:
+            for file in files:
+                if not file or not file.filename:
+                    continue
+                filename = file.filename
+                kind = document_kind(filename)
+                try:
+                    if kind is None:
+                        errors.append(f"{filename}: unsupported file type (txt, pdf, docx supported)")
+                    elif kind == 'text':
+                        forward(filename, kind, file.read().decode('utf-8', errors='ignore'))
                     else:
-                        errors.append(f"{filename}: RAG responded {resp.status_code}")
-                else:
-                    errors.append(f"{filename}: unsupported file type (txt, pdf, docx supported)")
-            except Exception as e:
-                logger.error(f"Failed to forward {filename} to RAG: {e}")
-                errors.append(f"{filename}: {e}")
+                        fd, tmp_path = tempfile.mkstemp(suffix=os.path.splitext(filename)[1])
+                        os.close(fd)
+                        try:
+                            file.save(tmp_path)
+                            future = _get_parse_pool().submit(extract_document_text, tmp_path, kind)
+                        except Exception:
+                            os.unlink(tmp_path)
+                            raise
+                        parsing[future] = (filename, kind, tmp_path)
+                except Exception as e:
+                    logger.error(f"Failed to forward {filename} to RAG: {e}")
+                    errors.append(f"{filename}: {e}")
+
+            for future in as_completed(parsing):
+                filename, kind, _ = parsing[future]
+                try:
+                    forward(filename, kind, future.result())
+                except DocumentTextError as e:
+                    errors.append(f"{filename}: {e}")
+                except Exception as e:
+                    logger.error(f"Failed to forward {filename} to RAG: {e}")
+                    errors.append(f"{filename}: {e}")
+        finally:
+            for _, _, tmp_path in parsing.values():
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+        if success_count:
+            # New documents can change the answer to a recently cached query
+            with _rag_cache_lock:
+                _rag_cache.clear()
 
-        return jsonify({
+        return _jsonify({
             'success': success_count > 0 and len(errors) == 0,
             'uploaded': forwarded,
             'errors': errors,
@@ -611,7 +916,7 @@ def upload_documents():
 
     except Exception as e:
         logger.error(f"Document upload error: {e}")
-        return jsonify({'success': False, 'error': str(e), 'code': 'internal_error'}), 500
+        return _jsonify({'success': False, 'error': str(e), 'code': 'internal_error'}), 500
 
 @app.route('/health')
 def health_check():
@@ -619,10 +924,10 @@ def health_check():
     try:
         health_monitor = get_health_monitor()
         health_status = health_monitor.get_health_status()
-        return jsonify(health_status)
+        return _jsonify(health_status)
     except Exception as e:
         logger.error(f"Health check error: {e}")
-        return jsonify({
+        return _jsonify({
             'overall_status': 'unhealthy',
             'error': str(e),
             'timestamp': datetime.now().isoformat()
@@ -639,80 +944,181 @@ def _serialize_conversation_state():
     except Exception:
         return conversation_state
 
+# Dashboard pages join this room on connect; conversation broadcasts target it
+_DASHBOARD_ROOM = 'dashboard'
+# Monitor ticks go only to clients that asked for them with 'subscribe_state'
+_STATE_ROOM = 'state'
+
+def _full_state() -> dict:
+    history, seq = _history_state()
+    return {
+        'conversation_state': _serialize_conversation_state(),
+        'system_stats': get_system_stats(),
+        'service_status': service_status,
+        'conversation_history': history,
+        'conversation_history_seq': seq
+    }
+
+def _has_state_subscribers() -> bool:
+    # Read the room table directly: older python-socketio 5.x releases raise
+    # KeyError from get_participants() for a room nobody has joined yet
+    return bool(socketio.server.manager.rooms.get('/', {}).get(_STATE_ROOM))
+
 @socketio.on('connect')
 def handle_connect(auth=None):
     """Handle WebSocket connection"""
-    # In Flask-SocketIO, we can get the client ID from the socketio context
-    logger.info("Client connected")
-    websocket_clients.add(id(request))
+    # Flask-SocketIO exposes the stable session id on the request context
+    websocket_clients.add(request.sid)
+    logger.info("Client connected (%d open)", len(websocket_clients))
+    join_room(_DASHBOARD_ROOM)
     
     # Send current state to new client
-    emit('state_update', {
-        'conversation_state': _serialize_conversation_state(),
-        'system_stats': get_system_stats(),
-        'service_status': service_status,
-        'conversation_history': list(conversation_history)
-    })
+    emit('state_update', _full_state())
+
+@socketio.on('subscribe_state')
+def handle_subscribe_state():
+    """Start receiving the monitor's periodic state_update diffs"""
+    join_room(_STATE_ROOM)
+    # Diffs are relative to the last tick, so start the subscriber from full state
+    emit('state_update', _full_state())
+
+@socketio.on('unsubscribe_state')
+def handle_unsubscribe_state():
+    leave_room(_STATE_ROOM)
+
+def _state_update_delta(last: dict) -> dict:
+    """Monitor tick payload: fresh system_stats plus only the fields that
+    changed since the previous tick; `last` carries the previous encodings"""
+    payload = {'system_stats': get_system_stats()}
+    for field, value in (('service_status', service_status),
+                         ('conversation_state', _serialize_conversation_state())):
+        encoded = _json_dumps(value)
+        if encoded != last.get(field):
+            last[field] = encoded
+            payload[field] = value
+    mark, delta = _history_delta(last.get('history'))
+    last['history'] = mark
+    if delta is not None:
+        payload['conversation_history_delta'] = delta
+    return payload
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle WebSocket disconnection"""
-    logger.info("Client disconnected")
-    websocket_clients.discard(id(request))
+    websocket_clients.discard(request.sid)
+    logger.info("Client disconnected (%d open)", len(websocket_clients))
+
+# Broadcast conversation updates are coalesced: events queued within
+# _EMIT_COALESCE_SEC go out as one 'conversation_batch' frame
+_EMIT_COALESCE_SEC = 0.02
+_emit_queue: queue.SimpleQueue = queue.SimpleQueue()
+_emit_lock = threading.Lock()
+_emit_state = {'running': False}
+
+def _broadcast_update(payload: dict, skip_sid: Optional[str] = None) -> None:
+    """Queue a conversation_update event for all dashboard clients except ``skip_sid``"""
+    _emit_queue.put((payload, skip_sid))
+    with _emit_lock:
+        if _emit_state['running']:
+            return
+        _emit_state['running'] = True
+    socketio.start_background_task(_emit_coalescer)
 
-def _handle_chat_message_and_broadcast(message: str, emit_user: bool = True) -> str:
+def _emit_coalescer() -> None:
+    while True:
+        socketio.sleep(_EMIT_COALESCE_SEC)
+        events = []
+        while True:
+            try:
+                events.append(_emit_queue.get_nowait())
+            except queue.Empty:
+                break
+        if events:
+            # Consecutive events with the same excluded client share one frame
+            start = 0
+            while start < len(events):
+                skip_sid = events[start][1]
+                end = start + 1
+                while end < len(events) and events[end][1] == skip_sid:
+                    end += 1
+                try:
+                    socketio.emit('conversation_batch',
+                                  {'events': [payload for payload, _ in events[start:end]]},
+                                  to=_DASHBOARD_ROOM, skip_sid=skip_sid)
+                except Exception as e:
+                    logger.warning(f"Conversation broadcast failed: {e}")
+                start = end
+            continue
+        with _emit_lock:
+            if _emit_queue.empty():
+                _emit_state['running'] = False
+                return
+
+def _handle_chat_message_and_broadcast(message: str, emit_user: bool = True, origin_sid: Optional[str] = None) -> str:
     """Unified chat processing path. Updates state/history and emits WebSocket events.
+    The user message is not echoed to ``origin_sid``, which already shows it.
     Returns assistant response or error message."""
+    # Correlation IDs
+    user_msg_id = str(uuid.uuid4())
     try:
-        # Correlation IDs
-        user_msg_id = str(uuid.uuid4())
         # Update user message state
         conversation_state['active'] = True
         conversation_state['current_speaker'] = 'user'
-        conversation_state['last_activity'] = datetime.now()
+        # One timestamp per message, shared by its history entry and broadcast
+        now = datetime.now()
+        user_ts = now.isoformat()
+        conversation_state['last_activity'] = now
         conversation_state['message_count'] += 1
 
-        conversation_history.append({
+        _append_history({
             'type': 'user_message',
             'content': message,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': user_ts,
             'source': 'web',
             'id': user_msg_id
         })
 
         if emit_user:
             try:
-                socketio.emit('conversation_update', {
+                _broadcast_update({
                     'type': 'user_message',
                     'content': message,
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': user_ts,
                     'id': user_msg_id
-                })
+                }, skip_sid=origin_sid)
             except Exception:
                 pass
 
         logger.info(f"chat_in id={user_msg_id} len={len(message)} preview={message[:80]!r}")
 
+        def emit_token(delta: str) -> None:
+            # Dashboards draft one reply bubble per user message id
+            try:
+                socketio.emit('llm_token', {'text': delta, 'reply_to': user_msg_id}, to=_DASHBOARD_ROOM)
+            except Exception:
+                pass
+
         # Process message
-        response = process_with_llm(message)
+        response = process_with_llm(message, on_token=emit_token)
 
         # Update assistant state
         conversation_state['current_speaker'] = 'assistant'
         assistant_msg_id = str(uuid.uuid4())
-        conversation_history.append({
+        reply_ts = datetime.now().isoformat()
+        _append_history({
             'type': 'assistant_message',
             'content': response,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': reply_ts,
             'source': 'llm',
             'id': assistant_msg_id,
             'reply_to': user_msg_id
         })
 
         try:
-            socketio.emit('conversation_update', {
+            _broadcast_update({
                 'type': 'assistant_message',
                 'content': response,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': reply_ts,
                 'id': assistant_msg_id,
                 'reply_to': user_msg_id
             })
@@ -725,16 +1131,18 @@ def _handle_chat_message_and_broadcast(message: str, emit_user: bool = True) ->
     except Exception as e:
         logger.error(f"Chat processing error: {e}")
         error_msg = f"Error processing message: {str(e)}"
-        conversation_history.append({
+        error_ts = datetime.now().isoformat()
+        _append_history({
             'type': 'error_message',
             'content': error_msg,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': error_ts
         })
         try:
-            socketio.emit('conversation_update', {
+            _broadcast_update({
                 'type': 'error_message',
                 'content': error_msg,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': error_ts,
+                'reply_to': user_msg_id
             })
         except Exception:
             pass
@@ -746,28 +1154,23 @@ def handle_chat_message(data):
     message = (data or {}).get('message', '').strip()
     if not message:
         return
-    _handle_chat_message_and_broadcast(message, emit_user=True)
+    # The reply is broadcast from the worker; this handler returns at once
+    future = _submit_bounded(_LLM_POOL, _llm_slots, _handle_chat_message_and_broadcast,
+                             message, emit_user=True, origin_sid=getattr(request, 'sid', None))
+    if future is None:
+        emit('conversation_update', {
+            'type': 'error_message',
+            'content': 'Assistant is busy, try again shortly',
+            'timestamp': datetime.now().isoformat()
+        })
 
-@socketio.on('interrupt_conversation')
-def handle_interrupt_conversation():
-    """Handle manual conversation interruption from web interface"""
-    logger.info("Manual conversation interruption requested from web interface")
-    
-    conversation_state['interruption_count'] += 1
-    conversation_state['last_activity'] = datetime.now()
-    
-    # Broadcast interruption event
-    socketio.emit('conversation_update', {
-        'type': 'interruption',
-        'source': 'web_manual',
-        'timestamp': datetime.now().isoformat()
-    })
-    
+def _send_interrupt() -> None:
+    """Deliver a manual interruption to the voice assistant"""
     # Preferred: HTTP call to voice assistant control endpoint
     sent = False
     try:
         va_url = f"http://{va_host}:{va_port}/interrupt"
-        r = requests.post(va_url, timeout=2)
+        r = _http.post(va_url, timeout=2)
         if r.status_code == 200:
             sent = True
             logger.info("Interruption sent via HTTP to voice assistant")
@@ -792,6 +1195,25 @@ def handle_interrupt_conversation():
             logger.info("Interruption signal attempted via message bus")
         except Exception as e:
             logger.warning(f"Failed to send interruption via message bus: {e}")
+
+@socketio.on('interrupt_conversation')
+def handle_interrupt_conversation():
+    """Handle manual conversation interruption from web interface"""
+    logger.info("Manual conversation interruption requested from web interface")
+    
+    now = datetime.now()
+    conversation_state['interruption_count'] += 1
+    conversation_state['last_activity'] = now
+    
+    # Broadcast interruption event
+    _broadcast_update({
+        'type': 'interruption',
+        'source': 'web_manual',
+        'timestamp': now.isoformat()
+    })
+
+    # The voice assistant round trip can take seconds; keep it off the handler
+    socketio.start_background_task(_send_interrupt)
     
     emit('system_status', {
         'type': 'interruption_sent',
@@ -805,10 +1227,10 @@ def api_interrupt():
     """HTTP fallback to request conversation interruption"""
     try:
         handle_interrupt_conversation()
-        return jsonify({'success': True, 'status': 'ok'}), 200
+        return _jsonify({'success': True, 'status': 'ok'}), 200
     except Exception as e:
         logger.error(f"HTTP interrupt error: {e}")
-        return jsonify({'success': False, 'status': 'error', 'error': str(e), 'code': 'internal_error'}), 500
+        return _jsonify({'success': False, 'status': 'error', 'error': str(e), 'code': 'internal_error'}), 500
 
 @socketio.on('start_voice_recording')
 def handle_start_voice_recording():
@@ -824,19 +1246,20 @@ def handle_start_voice_recording():
 @socketio.on('stop_voice_recording')
 def handle_stop_voice_recording():
     """Handle voice recording stop from web interface"""
-    conversation_state['last_activity'] = datetime.now()
+    now = datetime.now()
+    conversation_state['last_activity'] = now
     
     emit('conversation_update', {
         'type': 'voice_recording_stopped',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': now.isoformat()
     })
 
 @socketio.on('clear_conversation')
 def handle_clear_conversation():
     """Handle conversation history clearing"""
-    global conversation_history, conversation_state
-    
-    conversation_history.clear()
+    global conversation_state
+
+    _clear_history()
     conversation_state['message_count'] = 0
     conversation_state['interruption_count'] = 0
     conversation_state['active'] = False
@@ -848,72 +1271,268 @@ def handle_clear_conversation():
         'timestamp': datetime.now().isoformat()
     })
 
+def _decode_audio_pyav(audio_bytes: bytes, as_float: bool = False) -> Optional[bytes]:
+    """Decode any container PyAV understands to 16kHz mono PCM16 (float32
+    samples with ``as_float``).
+
+    Returns None when PyAV is not installed or cannot decode the input, so
+    callers can fall back to the ffmpeg CLI.
+    """
+    try:
+        import av  # type: ignore
+    except ImportError:
+        return None
+    import io
+    try:
+        with av.open(io.BytesIO(audio_bytes)) as container:
+            resampler = av.audio.resampler.AudioResampler(
+                format='flt' if as_float else 's16', layout='mono', rate=16000)
+            chunks = []
+            for frame in container.decode(audio=0):
+                for out in resampler.resample(frame):
+                    chunks.append(out.to_ndarray().tobytes())
+            for out in resampler.resample(None):
+                chunks.append(out.to_ndarray().tobytes())
+        return b''.join(chunks)
+    except Exception as e:
+        logger.warning(f"PyAV decode failed, falling back to ffmpeg: {e}")
+        return None
+
+def _pcm16_wav_bytes(pcm: bytes) -> bytes:
+    import io
+    import wave
+    buf = io.BytesIO()
+    with wave.open(buf, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(pcm)
+    return buf.getvalue()
+
+class _WhisperServer:
+    """Long-lived whisper.cpp server so browser clips skip the per-request model load"""
+
+    START_TIMEOUT = 15.0
+
+    def __init__(self, bin_path: str, port: int):
+        self.bin_path = bin_path
+        self.port = port
+        self.url = f"http://127.0.0.1:{port}"
+        self._proc: Optional[subprocess.Popen] = None
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def _healthy(self) -> bool:
+        try:
+            return _http.get(self.url + '/', timeout=(_CONNECT_TIMEOUT, 1)).status_code == 200
+        except Exception:
+            return False
+
+    def _ensure_started(self, model_path: str) -> bool:
+        with self._lock:
+            if self._proc is not None and self._proc.poll() is None:
+                return True
+            if self._failed or not self.port or not os.path.exists(self.bin_path):
+                return False
+            try:
+                self._proc = subprocess.Popen(
+                    [self.bin_path, '-m', model_path, '--host', '127.0.0.1', '--port', str(self.port)],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                )
+            except OSError as e:
+                logger.warning(f"whisper-server failed to start: {e}")
+                self._failed = True
+                return False
+            deadline = time.monotonic() + self.START_TIMEOUT
+            while time.monotonic() < deadline and self._proc.poll() is None:
+                if self._healthy():
+                    logger.info(f"whisper-server ready on port {self.port}")
+                    return True
+                time.sleep(0.2)
+            logger.warning("whisper-server did not become healthy; using whisper-cli")
+            self._failed = True
+            self.stop()
+            return False
+
+    def transcribe(self, wav_bytes: bytes, model_path: str) -> Optional[str]:
+        """Return the transcript, or None when the caller should fall back to the CLI"""
+        if not self._ensure_started(model_path):
+            return None
+        try:
+            r = _http.post(
+                self.url + '/inference',
+                files={'file': ('audio.wav', wav_bytes, 'audio/wav')},
+                data={'response_format': 'json'},
+                timeout=(_CONNECT_TIMEOUT, 60),
+            )
+            if r.status_code != 200:
+                logger.warning(f"whisper-server responded {r.status_code}")
+                return None
+            return str(r.json().get('text', '')).strip()
+        except Exception as e:
+            logger.warning(f"whisper-server request failed: {e}")
+            return None
+
+    def stop(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+
+_whisper_server = _WhisperServer(CFG.get_stt_server_bin(), CFG.get_stt_server_port())
+atexit.register(_whisper_server.stop)
+
+# whisper.cpp binary and model, resolved once rather than stat'ed per request
+_WHISPER_BIN = os.path.abspath("models/whisper.cpp/build/bin/whisper-cli")
+_WHISPER_MODEL = os.path.abspath("models/whisper.cpp/models/ggml-base.en.bin")
+_HAS_WHISPER_CLI = False
+
+def refresh_whisper_paths() -> bool:
+    """Re-check for the whisper.cpp CLI and model, e.g. after installing
+    them while the dashboard runs; returns whether the CLI is usable"""
+    global _HAS_WHISPER_CLI
+    _HAS_WHISPER_CLI = os.path.exists(_WHISPER_BIN) and os.path.exists(_WHISPER_MODEL)
+    return _HAS_WHISPER_CLI
+
+refresh_whisper_paths()
+
+# CPython spawns a child with posix_spawn (no fork of this large process)
+# only for an executable given by path, with close_fds=False and no
+# preexec_fn/cwd/new session. Descriptors Python opens are non-inheritable,
+# so leaving close_fds off hands the child nothing but its pipes
+_FFMPEG = shutil.which('ffmpeg') or 'ffmpeg'
+_SPAWN_KWARGS = {'close_fds': False}
+
+# python-whisper fallback model, loaded by the first voice request that needs it
+_whisper_model = None
+_whisper_lock = threading.Lock()
+
+def _get_whisper_model():
+    global _whisper_model
+    if _whisper_model is None:
+        with _whisper_lock:
+            if _whisper_model is None:
+                import whisper
+                _whisper_model = _quantize_whisper(whisper.load_model("tiny"))
+    return _whisper_model
+
+def _quantize_whisper(model):
+    """Dynamic int8 for the Linear layers; the model runs on CPU here"""
+    try:
+        import torch
+        from torch.ao.nn.quantized.dynamic import Linear as DynamicQuantizedLinear
+        # whisper's layers subclass nn.Linear (only to cast weights to the
+        # input dtype) and torch quantizes by exact module type, so make them
+        # plain nn.Linear first; the fp32 weights are left as they are
+        for module in model.modules():
+            if isinstance(module, torch.nn.Linear) and type(module) is not torch.nn.Linear:
+                module.__class__ = torch.nn.Linear
+        quantized = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        if not any(isinstance(m, DynamicQuantizedLinear) for m in quantized.modules()):
+            logger.warning("Whisper int8 quantization found no Linear layers, using fp32")
+        return quantized
+    except Exception as e:
+        logger.warning(f"Whisper int8 quantization unavailable, using fp32: {e}")
+        return model
+
 def process_voice_with_whisper(base64_audio: str) -> str:
     """Process voice input.
     - Accepts either a raw base64 string or a full DataURL (e.g. data:audio/webm;...;base64,XXXX)
     - Detects container type for better ffmpeg compatibility
     - Converts to 16kHz mono WAV and transcribes with whisper.cpp CLI when available,
-      otherwise falls back to python-whisper if installed.
+      otherwise falls back to python-whisper if installed, fed raw float32 samples.
     """
     wav_path = None
+    src_path = None
 
-    import base64
+    import binascii
     import tempfile
     import os
 
     try:
         # Determine if this is a DataURL and extract mime + payload
-        src_suffix = '.webm'
-        payload = base64_audio
-        if ',' in base64_audio and base64_audio.strip().startswith('data:'):
-            header, payload = base64_audio.split(',', 1)
+        src_suffix, src_format = '.webm', 'webm'
+        payload_start = 0
+        # A DataURL header is short and base64 has no commas, so only the
+        # head of a (possibly multi-MB) payload is scanned
+        comma = base64_audio.find(',', 0, 256)
+        if comma != -1 and base64_audio[:comma].lstrip().startswith('data:'):
+            header, payload_start = base64_audio[:comma], comma + 1
             # Try to recognize container extension from header
             if 'audio/ogg' in header:
-                src_suffix = '.ogg'
+                src_suffix, src_format = '.ogg', 'ogg'
             elif 'audio/mp4' in header or 'audio/m4a' in header:
-                src_suffix = '.mp4'
+                src_suffix, src_format = '.mp4', 'mp4'
             elif 'audio/mpeg' in header or 'audio/mp3' in header:
-                src_suffix = '.mp3'
+                src_suffix, src_format = '.mp3', 'mp3'
             elif 'audio/wav' in header or 'audio/x-wav' in header:
-                src_suffix = '.wav'
-            else:
-                src_suffix = '.webm'
+                src_suffix, src_format = '.wav', 'wav'
 
-        # Decode incoming base64 payload
-        audio_bytes = base64.b64decode(payload)
-
-        # Write raw container to a temp file
-        with tempfile.NamedTemporaryFile(suffix=src_suffix, delete=False) as src_file:
-            src_file.write(audio_bytes)
-            src_path = src_file.name
-
-        # Convert to WAV (16kHz mono PCM16) using ffmpeg
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as wav_file:
-            wav_path = wav_file.name
-
-        ffmpeg_cmd = [
-            'ffmpeg', '-y', '-i', src_path,
-            '-ac', '1', '-ar', '16000', '-f', 'wav', wav_path
-        ]
-        try:
-            conv = subprocess.run(ffmpeg_cmd, capture_output=True, text=True, timeout=30)
-            if conv.returncode != 0:
-                logger.error(f"ffmpeg conversion failed: {conv.stderr}")
-                return "Audio conversion failed (ffmpeg). Ensure ffmpeg is installed."
-        except FileNotFoundError:
-            return "ffmpeg not found. Please install ffmpeg for voice input."
+        # Decode incoming base64 payload: one ASCII copy of the string, then
+        # a zero-copy view past the header (b64decode would copy it again)
+        encoded = memoryview(base64_audio.encode('ascii'))
+        audio_bytes = binascii.a2b_base64(encoded[payload_start:])
 
         # Prefer Whisper CLI if available
-        whisper_bin = os.path.abspath("models/whisper.cpp/build/bin/whisper-cli")
-        whisper_model = os.path.abspath("models/whisper.cpp/models/ggml-base.en.bin")
+        use_cli = _HAS_WHISPER_CLI
+
+        # Convert to 16kHz mono in memory: a PCM16 WAV for whisper.cpp, raw
+        # float32 samples (python-whisper's native dtype) for the fallback.
+        # In-process with PyAV when installed, otherwise with an ffmpeg
+        # subprocess writing to stdout
+        pcm = _decode_audio_pyav(audio_bytes, as_float=not use_cli)
+        if pcm is not None:
+            audio_out = _pcm16_wav_bytes(pcm) if use_cli else pcm
+        else:
+            # Stream the container to ffmpeg's stdin, naming the demuxer so
+            # ffmpeg need not probe the pipe; MP4 may keep its index at the
+            # end of the file, so it still needs a seekable temp file
+            if src_suffix == '.mp4':
+                with tempfile.NamedTemporaryFile(suffix=src_suffix, delete=False) as src_file:
+                    src_file.write(audio_bytes)
+                    src_path = src_file.name
+                input_args = ['-i', src_path]
+            else:
+                input_args = ['-f', src_format, '-i', 'pipe:0']
+
+            # Only errors go to stderr: no banner or per-frame progress to
+            # pipe through and buffer on every clip
+            ffmpeg_cmd = [
+                _FFMPEG, '-hide_banner', '-nostats', '-loglevel', 'error', '-y', *input_args,
+                '-ac', '1', '-ar', '16000', '-f', 'wav' if use_cli else 'f32le', 'pipe:1'
+            ]
+            try:
+                conv = subprocess.run(
+                    ffmpeg_cmd,
+                    input=None if src_path else audio_bytes,
+                    capture_output=True,
+                    timeout=30,
+                    **_SPAWN_KWARGS,
+                )
+                if conv.returncode != 0:
+                    logger.error(f"ffmpeg conversion failed: {conv.stderr.decode('utf-8', errors='replace')}")
+                    return "Audio conversion failed (ffmpeg). Ensure ffmpeg is installed."
+                audio_out = conv.stdout
+            except FileNotFoundError:
+                return "ffmpeg not found. Please install ffmpeg for voice input."
+
+        if use_cli:
+            wav_bytes = audio_out
+            transcription = _whisper_server.transcribe(wav_bytes, _WHISPER_MODEL)
+            if transcription is not None:
+                if '[BLANK_AUDIO]' in transcription:
+                    transcription = ''
+                return transcription or "No speech detected"
 
-        if os.path.exists(whisper_bin) and os.path.exists(whisper_model):
+            # Only the CLI needs the WAV on disk
+            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as wav_file:
+                wav_path = wav_file.name
+                wav_file.write(wav_bytes)
             try:
                 # Use whisper.cpp proper flags: -otxt to write txt, -of to set output base (without extension)
                 base = os.path.splitext(wav_path)[0]
                 result = subprocess.run([
-                    whisper_bin, '-m', whisper_model, '-f', wav_path, '-otxt', '-of', base
-                ], capture_output=True, text=True, timeout=60)
+                    _WHISPER_BIN, '-m', _WHISPER_MODEL, '-f', wav_path, '-otxt', '-of', base
+                ], capture_output=True, text=True, timeout=60, **_SPAWN_KWARGS)
 
                 if result.returncode == 0:
                     txt_file = base + '.txt'
@@ -937,51 +1556,52 @@ def process_voice_with_whisper(base64_audio: str) -> str:
                     pass
         else:
             # Fallback to Python whisper if available
+            import numpy as np
             try:
-                import numpy as np
-                import soundfile as sf
-                try:
-                    import whisper
-                except Exception:
-                    return "Neither Whisper CLI nor python-whisper are available."
-
-                # Load wav and transcribe
-                data, sr = sf.read(wav_path)
-                if sr != 16000:
-                    # Should not happen due to ffmpeg, but guard anyway
-                    logger.warning(f"Unexpected sample rate {sr}, continuing")
-                model = whisper.load_model("tiny")
-                result = model.transcribe(data, language="en")
-                transcription = str(result.get("text", "")).strip()
-                return transcription or "No speech detected"
-            finally:
-                try:
-                    os.unlink(wav_path)
-                except Exception:
-                    pass
+                import whisper
+            except Exception:
+                return "Neither Whisper CLI nor python-whisper are available."
+
+            # The raw f32le samples are already 16kHz mono; view them in place
+            data = np.frombuffer(audio_out, dtype=np.float32)
+            model = _get_whisper_model()
+            result = model.transcribe(data, language="en", fp16=False)
+            transcription = str(result.get("text", "")).strip()
+            return transcription or "No speech detected"
     except subprocess.TimeoutExpired:
         return "Transcription timed out. Audio might be too long."
     except Exception as e:
         logger.error(f"Voice processing error: {e}")
         return f"Voice processing error: {str(e)}"
     finally:
-        try:
-            if 'wav_path' in locals() and wav_path is not None and os.path.exists(wav_path):
-                os.unlink(wav_path)
-        except Exception:
-            pass
+        for path in (wav_path, src_path):
+            try:
+                if path is not None and os.path.exists(path):
+                    os.unlink(path)
+            except Exception:
+                pass
 
-def process_with_llm(message: str) -> str:
-    """Process message with the LLM and tools"""
-    try:
-        # Check if llama server is running
+def _iter_llm_deltas(response):
+    """Yield content deltas from an OpenAI-style streaming chat response"""
+    loads = _orjson.loads if _orjson is not None else json.loads
+    for line in response.iter_lines():
+        if not line.startswith(b'data: '):
+            continue
+        data = line[6:]
+        if data.strip() == b'[DONE]':
+            return
         try:
-            response = requests.get(llm_models_endpoint, timeout=2)
-            if response.status_code != 200:
-                return "LLM server is not running. Please start the orchestrator first."
-        except:
-            return "LLM server is not accessible. Please start the orchestrator first."
-        
+            choices = loads(data).get('choices') or []
+        except ValueError:
+            continue
+        delta = (choices[0].get('delta') or {}).get('content') if choices else None
+        if delta:
+            yield delta
+
+def process_with_llm(message: str, on_token=None) -> str:
+    """Process message with the LLM and tools; ``on_token`` receives each
+    streamed piece of the reply as it is generated"""
+    try:
         # Check if user is requesting tool usage
         tool_result = process_tools(message)
         if tool_result:
@@ -1005,26 +1625,53 @@ def process_with_llm(message: str) -> str:
             "max_tokens": int(CFG.get_llm_max_tokens())
         }
         
+        # Stream the completion so callers can show tokens as they are generated
+        payload["stream"] = True
         chat_endpoint = CFG.get_llm_chat_endpoint()
-        response = requests.post(
-            chat_endpoint,
-            json=payload,
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            return result['choices'][0]['message']['content']
-        else:
-            logger.error(f"LLM request failed: {response.status_code}")
-            return f"LLM processing failed (HTTP {response.status_code})"
+        with _http.post(chat_endpoint, json=payload, stream=True, timeout=(_CONNECT_TIMEOUT, 30)) as response:
+            if response.status_code != 200:
+                logger.error(f"LLM request failed: {response.status_code}")
+                return f"LLM processing failed (HTTP {response.status_code})"
+            parts = []
+            for delta in _iter_llm_deltas(response):
+                parts.append(delta)
+                if on_token is not None:
+                    on_token(delta)
+            return "".join(parts)
             
+    except requests.exceptions.ConnectionError:
+        # No separate liveness ping: a refused connect is the "not running" signal
+        return "LLM server is not accessible. Please start the orchestrator first."
     except requests.exceptions.Timeout:
         return "LLM request timed out. The model might be processing a large request."
     except Exception as e:
         logger.error(f"LLM processing error: {e}")
         return f"LLM processing error: {str(e)}"
 
+# Tool routing keywords, matched as plain substrings of the lowercased message.
+# One zero-width-lookahead scan finds every keyword (longest first at each
+# position, then expanded to keywords it contains) instead of one scan each.
+_TOOL_KEYWORDS = (
+    "weather", "search", "for", "web", "browse", "open website", "go to",
+    "open app", " app", "screenshot", "take picture",
+    "system info", "system status", "system", "info",
+)
+_TOOL_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(_TOOL_KEYWORDS, key=len, reverse=True)) + "))"
+)
+_TOOL_KEYWORD_IMPLIES = {k: frozenset(j for j in _TOOL_KEYWORDS if j in k) for k in _TOOL_KEYWORDS}
+_WEB_SEARCH_STRIP_RE = re.compile("search|for|web")
+_BROWSE_STRIP_RE = re.compile("browse|open website|go to")
+# A whitespace-delimited word starting with a URL scheme or "www."
+_URL_RE = re.compile(r"(?<!\S)(?:https?://|www\.)\S*")
+
+def _match_tool_keywords(text_lower: str) -> frozenset:
+    """Return every routing keyword that occurs in ``text_lower``"""
+    hits = set()
+    for match in _TOOL_KEYWORD_RE.finditer(text_lower):
+        hits |= _TOOL_KEYWORD_IMPLIES[match.group(1)]
+    return frozenset(hits)
+
 def process_tools(message: str) -> Optional[str]:
     """Process message for tool usage via shared tools module.
 
@@ -1036,36 +1683,37 @@ def process_tools(message: str) -> Optional[str]:
         return None
 
     ml = msg.lower()
+    kw = _match_tool_keywords(ml)
     try:
         # Weather-specific search
-        if "weather" in ml and "search" in ml:
+        if "weather" in kw and "search" in kw:
             # Delegate to search; tools.get_weather uses configured default location
             return tools_mod.get_weather()
 
         # Generic web search
-        if "search" in ml and ("for" in ml or "web" in ml):
-            q = ml.replace("search", "").replace("for", "").replace("web", "").strip()
+        if "search" in kw and ("for" in kw or "web" in kw):
+            q = _WEB_SEARCH_STRIP_RE.sub("", ml).strip()
             return tools_mod.web_search(q)
 
         # Website browsing
-        if any(k in ml for k in ["browse", "open website", "go to"]):
-            for word in msg.split():
-                if word.startswith(("http://", "https://", "www.")):
-                    return tools_mod.browse_website(word)
+        if kw & {"browse", "open website", "go to"}:
+            url = _URL_RE.search(msg)
+            if url:
+                return tools_mod.browse_website(url.group(0))
             # If no explicit URL, fall back to search
-            return tools_mod.web_search(msg.replace("browse", "").replace("open website", "").replace("go to", "").strip())
+            return tools_mod.web_search(_BROWSE_STRIP_RE.sub("", msg).strip())
 
         # App opening
-        if ("open app" in ml) or (ml.startswith("open ") and " app" in ml):
+        if ("open app" in kw) or (ml.startswith("open ") and " app" in kw):
             app_name = ml.replace("open app", "").strip()
             return tools_mod.open_app(app_name)
 
         # Screenshot
-        if ("screenshot" in ml) or ("take picture" in ml):
+        if kw & {"screenshot", "take picture"}:
             return tools_mod.take_screenshot()
 
         # System info
-        if "system info" in ml or "system status" in ml or ("system" in ml and "info" in ml):
+        if kw & {"system info", "system status"} or {"system", "info"} <= kw:
             return tools_mod.get_system_info()
 
         # No tool match found
@@ -1074,19 +1722,41 @@ def process_tools(message: str) -> Optional[str]:
         logger.error(f"Tool processing error: {e}")
         return f"Tool execution failed: {str(e)}"
 
+# Recent RAG lookups keyed by normalized query; repeated questions within
+# _RAG_CACHE_TTL skip the round trip. Failed lookups are not cached.
+_RAG_CACHE_TTL = 60.0
+_RAG_CACHE_MAX = 256
+_rag_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_rag_cache_lock = threading.Lock()
+
 def get_rag_context(query: str) -> Optional[str]:
     """Get relevant context from RAG system"""
+    key = ' '.join(query.lower().split())
+    now = time.monotonic()
+    with _rag_cache_lock:
+        hit = _rag_cache.get(key)
+        if hit is not None and now - hit[0] < _RAG_CACHE_TTL:
+            _rag_cache.move_to_end(key)
+            return hit[1]
+
+    found, context = _fetch_rag_context(query)
+    if found:
+        with _rag_cache_lock:
+            _rag_cache[key] = (now, context)
+            _rag_cache.move_to_end(key)
+            while len(_rag_cache) > _RAG_CACHE_MAX:
+                _rag_cache.popitem(last=False)
+    return context
+
+def _fetch_rag_context(query: str) -> tuple:
+    """Query the RAG service; returns (answered, context)"""
+    # service_status is kept fresh by the health monitor; skip a service it
+    # last saw down rather than pinging /health before every search
+    if service_status['rag']['status'] == 'stopped':
+        return False, None
     try:
-        # Check if RAG service is running
-        try:
-            response = requests.get(f"http://{rag_host}:{rag_port}/health", timeout=2)
-            if response.status_code != 200:
-                return None
-        except:
-            return None
-        
         # Search RAG system
-        rag_response = requests.post(
+        rag_response = _http.post(
             f"http://{rag_host}:{rag_port}/api/search",
             json={'query': query},
             timeout=5
@@ -1097,13 +1767,16 @@ def get_rag_context(query: str) -> Optional[str]:
             if results:
                 # Return the most relevant result
                 best_result = results[0]
-                return f"{best_result['metadata']['title']}: {best_result['content'][:200]}..."
+                return True, f"{best_result['metadata']['title']}: {best_result['content'][:200]}..."
+            return True, None
         
-        return None
+        return False, None
         
+    except requests.exceptions.ConnectionError:
+        return False, None
     except Exception as e:
         logger.error(f"RAG context error: {e}")
-        return None
+        return False, None
 
 def start_dashboard(host='0.0.0.0', port=3000):
     """Start the web dashboard with WebSocket support"""
@@ -1111,23 +1784,22 @@ def start_dashboard(host='0.0.0.0', port=3000):
     
     # Start background monitoring
     def background_monitor():
+        last: dict = {}
         while True:
             try:
                 check_service_health()
-                # Emit real-time updates to all connected clients
-                socketio.emit('state_update', {
-                    'system_stats': get_system_stats(),
-                    'service_status': service_status,
-                    'conversation_state': _serialize_conversation_state(),
-                    'conversation_history': list(conversation_history)
-                })
-                time.sleep(5)  # Update every 5 seconds
+                # Emit real-time updates to subscribed clients; unchanged
+                # fields are left out and history arrives as an append delta.
+                # With no subscribers, stats are not even sampled
+                if _has_state_subscribers():
+                    socketio.emit('state_update', _state_update_delta(last), to=_STATE_ROOM)
+                socketio.sleep(5)  # Update every 5 seconds
             except Exception as e:
                 logger.error(f"Background monitoring error: {e}")
-                time.sleep(10)
-    
-    monitor_thread = threading.Thread(target=background_monitor, daemon=True)
-    monitor_thread.start()
+                socketio.sleep(10)
+
+    # A green thread under eventlet/gevent, a daemon thread otherwise
+    socketio.start_background_task(background_monitor)
     
     try:
         socketio.run(app, host=host, port=port, debug=False, use_reloader=False, allow_unsafe_werkzeug=True)
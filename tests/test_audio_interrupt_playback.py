@@ -0,0 +1,90 @@
+import os
+import sys
+import threading
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from macbot import audio_interrupt
+
+
+class _FakeOutputStream:
+    """Drives the playback callback from a thread like PortAudio would"""
+
+    instances = []
+
+    def __init__(self, samplerate, channels, dtype, blocksize, callback, device):
+        self.dtype = dtype
+        self.blocksize = blocksize
+        self.callback = callback
+        self.written = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        _FakeOutputStream.instances.append(self)
+
+    def _run(self):
+        out = np.empty((self.blocksize, 1), dtype=np.int16)
+        while not self._stop.wait(0.001):
+            self.callback(out, self.blocksize, None, None)
+            self.written.append(out[:, 0].copy())
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+    def close(self):
+        pass
+
+
+def test_playback_reuses_one_int16_stream(monkeypatch):
+    _FakeOutputStream.instances.clear()
+    monkeypatch.delenv("MACBOT_NO_AUDIO", raising=False)
+    monkeypatch.setattr(audio_interrupt, "sd", type("FakeSD", (), {"OutputStream": _FakeOutputStream}))
+
+    handler = audio_interrupt.AudioInterruptHandler(sample_rate=1000)
+    try:
+        clip = np.full(120, 0.5, dtype=np.float32)
+        assert handler.play_audio(clip) is True
+        assert handler.play_audio(clip) is True
+    finally:
+        handler.stop()
+
+    assert len(_FakeOutputStream.instances) == 1
+    stream = _FakeOutputStream.instances[0]
+    assert stream.dtype == 'int16'
+    played = np.concatenate(stream.written)
+    assert np.count_nonzero(played == 16383) == 240
+
+
+def test_interrupt_ends_playback_early(monkeypatch):
+    _FakeOutputStream.instances.clear()
+    monkeypatch.delenv("MACBOT_NO_AUDIO", raising=False)
+    monkeypatch.setattr(audio_interrupt, "sd", type("FakeSD", (), {"OutputStream": _FakeOutputStream}))
+
+    handler = audio_interrupt.AudioInterruptHandler(sample_rate=1000)
+    timer = threading.Timer(0.05, handler.interrupt_playback)
+    timer.start()
+    try:
+        # 60 seconds of audio; only the interrupt can end this quickly
+        assert handler.play_audio(np.ones(60000, dtype=np.float32)) is False
+    finally:
+        timer.join()
+        handler.stop()
+    assert handler.get_playback_status()['is_playing'] is False
+
+
+def test_voice_activity_window_tracks_recent_audio():
+    handler = audio_interrupt.AudioInterruptHandler(sample_rate=1000)  # 100-sample window
+    handler.vad_threshold = 0.1
+    window = handler.vad_buffer
+
+    assert handler.check_voice_activity(np.full((30, 1), 0.5, dtype=np.float32)) is True
+    # 90 quiet samples leave 10 loud ones: RMS ~0.16 is still above threshold
+    assert handler.check_voice_activity(np.zeros(90, dtype=np.float32)) is True
+    assert handler.check_voice_activity(np.zeros(30, dtype=np.float32)) is False
+    assert handler.check_voice_activity(np.full(250, 0.5, dtype=np.float32)) is True
+    assert handler.vad_buffer is window
@@ -0,0 +1,68 @@
+import os
+import sys
+import threading
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from macbot.audio_ring import AudioRingBuffer
+
+
+def test_ring_round_trips_samples_across_wraparound():
+    ring = AudioRingBuffer(8)
+    out = np.empty(5, dtype=np.float32)
+
+    ring.write(np.arange(5, dtype=np.float32))
+    assert ring.read_into(out) == 5
+    assert out.tolist() == [0, 1, 2, 3, 4]
+
+    # Next write straddles the end of the backing store
+    ring.write(np.arange(5, 10, dtype=np.float32))
+    assert ring.available() == 5
+    assert ring.read_into(out) == 5
+    assert out.tolist() == [5, 6, 7, 8, 9]
+    assert ring.available() == 0
+
+
+def test_ring_drops_oldest_audio_on_overrun():
+    ring = AudioRingBuffer(4)
+    out = np.empty(4, dtype=np.float32)
+
+    ring.write(np.arange(3, dtype=np.float32))
+    ring.write(np.arange(3, 6, dtype=np.float32))
+
+    assert ring.read_into(out) == 4
+    assert out.tolist() == [2, 3, 4, 5]
+    assert ring.overruns == 1
+
+
+def test_ring_wait_wakes_on_write():
+    ring = AudioRingBuffer(16)
+    assert ring.wait(timeout=0.01) is False
+
+    writer = threading.Timer(0.05, ring.write, args=(np.ones(4, dtype=np.float32),))
+    writer.start()
+    try:
+        assert ring.wait(timeout=1.0) is True
+    finally:
+        writer.join()
+    assert ring.available() == 4
+
+
+def test_ring_peek_returns_views_split_at_wraparound():
+    ring = AudioRingBuffer(6)
+    ring.write(np.arange(4, dtype=np.float32))
+    ring.advance(len(ring.peek(4)))
+
+    ring.write(np.arange(4, 8, dtype=np.float32))
+    first = ring.peek(4)
+    assert first.tolist() == [4, 5]
+    assert np.shares_memory(first, ring._buf)
+    ring.advance(len(first))
+
+    second = ring.peek(4)
+    assert second.tolist() == [6, 7]
+    ring.advance(len(second))
+    assert ring.available() == 0
+    assert len(ring.peek(4)) == 0
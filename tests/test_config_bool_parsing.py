@@ -60,3 +60,15 @@ def test_tts_config_invalid_string_falls_back_to_default(monkeypatch: pytest.Mon
     assert cfg.get_tts_cache_enabled() is True
     assert cfg.get_tts_parallel_processing() is True
     assert cfg.get_tts_optimize_for_speed() is True
+
+
+def test_stt_quantized_model_only_used_when_present(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    model = tmp_path / "ggml-base.en-q5_1.bin"
+    _set_config(monkeypatch, {"models": {"stt": {"quantized_model": str(model)}}})
+    assert cfg.get_stt_quantized_model() is None
+
+    model.write_bytes(b"ggml")
+    assert cfg.get_stt_quantized_model() == str(model)
+
+    _set_config(monkeypatch, {"models": {"stt": {"quantized_model": ""}}})
+    assert cfg.get_stt_quantized_model() is None
@@ -38,3 +38,22 @@ def test_service_output_is_drained():
         assert proc.returncode == 0
     finally:
         orchestrator.stop_all()
+
+
+def test_dead_process_is_announced_before_restart(monkeypatch):
+    from unittest.mock import MagicMock
+
+    orchestrator = MacBotOrchestrator()
+    orchestrator.bus_client = MagicMock()
+    dead = MagicMock()
+    dead.poll.return_value = 1
+    dead.stdout = dead.stderr = None
+    orchestrator.processes = {"llama": dead}
+    monkeypatch.setattr(orchestrator, "_log_process_output", lambda *args, **kwargs: None)
+    restart = MagicMock()
+    monkeypatch.setattr(orchestrator, "restart_process", restart)
+
+    orchestrator.check_process_health()
+
+    orchestrator.bus_client.send_message.assert_called_once_with({'type': 'service_down', 'service': 'llama'})
+    restart.assert_called_once_with("llama")
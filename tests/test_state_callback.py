@@ -29,3 +29,18 @@ def test_state_callback_no_deadlock():
     summary = manager.get_conversation_summary()
     assert summary["current_state"] == ConversationState.ERROR.value
     assert call_count == 2
+
+
+def test_begin_turn_notifies_once():
+    manager = ConversationManager()
+    states = []
+    manager.register_state_callback(lambda ctx: states.append(ctx.current_state))
+
+    conv_id = manager.begin_turn("hello there", conversation_id="turns")
+    manager.begin_turn("and again", conversation_id="turns")
+
+    assert conv_id == "turns"
+    assert states == [ConversationState.PROCESSING, ConversationState.PROCESSING]
+    assert manager.current_context.turn_count == 2
+    assert manager.current_context.user_input == "and again"
+    assert [m["content"] for m in manager.get_recent_history()] == ["hello there", "and again"]
@@ -19,15 +19,6 @@ def test_rag_search_sends_authorization_header(monkeypatch):
     token = "test-token-123"
     captured = {}
 
-    def fake_get(url, *args, **kwargs):
-        class _Response:
-            status_code = 200
-
-            def json(self):
-                return {"status": "ok"}
-
-        return _Response()
-
     def fake_post(url, *args, **kwargs):
         captured["headers"] = kwargs.get("headers")
 
@@ -47,10 +38,18 @@ def test_rag_search_sends_authorization_header(monkeypatch):
         return _Response()
 
     monkeypatch.setattr(tools.cfg, "get_rag_api_tokens", lambda: [token])
-    monkeypatch.setattr(tools.requests, "get", fake_get)
-    monkeypatch.setattr(tools.requests, "post", fake_post)
+    monkeypatch.setattr(tools._http, "post", fake_post)
 
     result = tools.rag_search("query")
 
     assert "Top results" in result
     assert captured["headers"]["Authorization"] == f"Bearer {token}"
+
+
+def test_rag_search_reports_unreachable_server(monkeypatch):
+    def refuse(url, *args, **kwargs):
+        raise tools.requests.exceptions.ConnectionError("refused")
+
+    monkeypatch.setattr(tools._http, "post", refuse)
+
+    assert tools.rag_search("query") == "Knowledge base is unavailable"
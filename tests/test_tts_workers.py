@@ -91,3 +91,224 @@ def test_tts_cleanup_blocks_until_workers_finish(monkeypatch):
         release.set()
         if manager._tts_workers:
             manager.cleanup()
+
+
+def test_chained_tts_jobs_run_in_order(monkeypatch):
+    spoken = []
+    first_started = threading.Event()
+    release_first = threading.Event()
+
+    def ordered_process(self, text, interruptible, notify):
+        if text == "first":
+            first_started.set()
+            assert release_first.wait(timeout=1.5)
+        spoken.append(text)
+        return True
+
+    monkeypatch.setattr(
+        voice_assistant.TTSManager,
+        "_process_speak_request",
+        ordered_process,
+        raising=False,
+    )
+
+    manager = voice_assistant.TTSManager()
+    try:
+        first = manager.enqueue_speak("first", interruptible=True, notify=False)
+        second = manager.enqueue_speak("second", interruptible=True, notify=False, after=first)
+
+        assert first_started.wait(timeout=1.5)
+        # A free worker picked up the second job but must wait for the first
+        time.sleep(0.1)
+        assert spoken == []
+
+        release_first.set()
+        assert second.wait(timeout=1.5)
+        assert spoken == ["first", "second"]
+    finally:
+        release_first.set()
+        manager.cleanup()
+
+
+def test_interrupt_drops_queued_sentences(monkeypatch):
+    spoken = []
+    first_started = threading.Event()
+    release_first = threading.Event()
+
+    def blocking_process(self, text, interruptible, notify):
+        if text == "first":
+            first_started.set()
+            assert release_first.wait(timeout=1.5)
+        spoken.append(text)
+        return True
+
+    monkeypatch.setattr(
+        voice_assistant.TTSManager,
+        "_process_speak_request",
+        blocking_process,
+        raising=False,
+    )
+
+    manager = voice_assistant.TTSManager()
+    try:
+        first = manager.enqueue_speak("first", interruptible=True, notify=False)
+        second = manager.enqueue_speak("second", interruptible=True, notify=False, after=first)
+        third = manager.enqueue_speak("third", interruptible=True, notify=False, after=second)
+        assert first_started.wait(timeout=1.5)
+
+        manager.interrupt()
+        release_first.set()
+
+        assert third.done_event.wait(timeout=1.5)
+        assert second.success is False and third.success is False
+        assert spoken == ["first"]
+
+        # Speech queued after the interrupt plays normally
+        assert manager.enqueue_speak("next", interruptible=True, notify=False).wait(timeout=1.5)
+        assert spoken == ["first", "next"]
+    finally:
+        release_first.set()
+        manager.cleanup()
+
+
+def test_tts_audio_is_cached_and_passed_without_copies():
+    import numpy as np
+
+    manager = voice_assistant.TTSManager()
+    try:
+        manager._cache_enabled = True
+        audio = np.linspace(-1.0, 1.0, 480, dtype=np.float32)
+
+        manager._cache_audio("hello", audio)
+        cached = manager._get_cached_audio("hello")
+
+        assert cached is audio
+        assert not cached.flags.writeable
+        assert manager._ensure_rate(cached, 24000, 24000) is cached
+    finally:
+        manager.cleanup()
+
+
+def test_speak_queues_multi_sentence_text_per_clause(monkeypatch):
+    spoken = []
+
+    def record_process(self, text, interruptible, notify):
+        spoken.append((text, notify))
+        return True
+
+    monkeypatch.setattr(
+        voice_assistant.TTSManager,
+        "_process_speak_request",
+        record_process,
+        raising=False,
+    )
+    states = []
+    monkeypatch.setattr(voice_assistant, "_notify_dashboard_state", states.append)
+
+    manager = voice_assistant.TTSManager()
+    try:
+        assert manager.speak("Sure. It costs 3.5 dollars today. Anything else?", notify=True)
+        assert spoken == [
+            ("Sure. It costs 3.5 dollars today.", False),
+            ("Anything else?", False),
+        ]
+        assert states == ["speaking_started", "speaking_ended"]
+
+        assert manager.speak("Just one clause.", notify=False)
+        assert spoken[-1] == ("Just one clause.", False)
+    finally:
+        manager.cleanup()
+
+
+def test_chained_sentence_is_synthesized_during_playback(monkeypatch):
+    import numpy as np
+
+    events = []
+    first_playing = threading.Event()
+    release_first = threading.Event()
+
+    def fake_synthesize(self, text):
+        events.append(("synth", text))
+        return np.full(160, 1.0 if text == "first" else 2.0, dtype=np.float32)
+
+    def fake_play(self, audio, sample_rate, notify):
+        if not first_playing.is_set():
+            first_playing.set()
+            assert release_first.wait(timeout=1.5)
+        events.append(("play", float(audio[0])))
+        return True
+
+    monkeypatch.setattr(voice_assistant.TTSManager, "_synthesize_piper", fake_synthesize)
+    monkeypatch.setattr(voice_assistant.TTSManager, "_play_audio_sounddevice", fake_play)
+
+    manager = voice_assistant.TTSManager()
+    try:
+        manager.engine = object()
+        manager.engine_type = "piper"
+        manager._initialized = True
+        manager._cache_enabled = False
+
+        first = manager.enqueue_speak("first", interruptible=True, notify=False)
+        second = manager.enqueue_speak("second", interruptible=True, notify=False, after=first)
+
+        assert first_playing.wait(timeout=1.5)
+        deadline = time.time() + 1.5
+        while ("synth", "second") not in events and time.time() < deadline:
+            time.sleep(0.01)
+        # The second sentence was synthesized while the first one was still playing
+        assert sorted(events) == [("synth", "first"), ("synth", "second")]
+
+        release_first.set()
+        assert second.wait(timeout=1.5)
+        assert events[2:] == [("play", 1.0), ("play", 2.0)]
+        assert manager._prefetched == {}
+    finally:
+        release_first.set()
+        manager.cleanup()
+
+
+def test_tts_logs_truncate_text_lazily(monkeypatch, caplog):
+    import logging
+
+    import numpy as np
+
+    played = []
+    monkeypatch.setattr(
+        voice_assistant.TTSManager,
+        "_play_cached_audio",
+        lambda self, audio, interruptible, notify: played.append(audio) or True,
+    )
+
+    manager = voice_assistant.TTSManager()
+    try:
+        manager._cache_enabled = True
+        text = "a" * 40 + "b" * 40
+        manager._cache_audio(text, np.zeros(160, dtype=np.float32))
+
+        with caplog.at_level(logging.INFO, logger=voice_assistant.logger.name):
+            assert manager._speak_with_piper(text, interruptible=False, notify=False)
+
+        assert played
+        assert "TTS Cache HIT for: '" + "a" * 30 + "...'" in caplog.text
+        assert "b" not in caplog.text.split("Cache HIT for:")[1].splitlines()[0]
+    finally:
+        manager.cleanup()
+
+
+def test_tts_heartbeat_starts_once_and_stops_on_cleanup(monkeypatch):
+    inits = []
+    monkeypatch.setattr(voice_assistant.TTSManager, "init_engine", lambda self: inits.append(1))
+
+    manager = voice_assistant.TTSManager()
+    try:
+        manager._start_heartbeat()
+        heartbeat = manager._heartbeat
+        # init_engine retries call this again; no second thread is started
+        manager._start_heartbeat()
+        assert manager._heartbeat is heartbeat and heartbeat.is_alive()
+    finally:
+        manager.cleanup()
+
+    heartbeat.join(timeout=2)
+    assert not heartbeat.is_alive()
+    assert inits == []
@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from macbot.validation import InputValidator, ValidationError, validate_chat_message
+
+
+@pytest.mark.parametrize("text", [
+    "what's the weather like today",
+    "tell me a joke\tplease\n",
+    "café au lait, s'il vous plaît",
+])
+def test_plain_text_is_returned_unchanged(text):
+    assert validate_chat_message(text) == text.strip()
+
+
+def test_fast_paths_match_full_sanitization():
+    validator = InputValidator()
+    samples = [
+        "hi <script>alert(1)</script> there",
+        "open javascript:void(0) now",
+        "img onerror = boom",
+        "ratio 3:2 and a=b",
+        "bell\x07 and null\x00 chars",
+        "no tricks here",
+    ]
+
+    for text in samples:
+        expected = text
+        for pattern in validator.COMPILED_PATTERNS:
+            expected = pattern.sub('', expected)
+        expected = "".join(
+            ch for ch in expected
+            if not (ord(ch) < 0x20 and ch not in "\t\n\r") and ch != "\x7f"
+        ).strip()
+        assert validator.validate_text_input(text) == expected
+
+
+def test_empty_and_oversized_text_are_rejected():
+    validator = InputValidator()
+    with pytest.raises(ValidationError):
+        validator.validate_text_input("   ")
+    with pytest.raises(ValidationError):
+        validator.validate_text_input("x" * 11, max_length=10)
@@ -0,0 +1,93 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from macbot import voice_assistant as va
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    va._invalidate_llm_health_cache()
+    yield
+    va._invalidate_llm_health_cache()
+
+
+def test_health_result_is_reused_within_ttl(monkeypatch):
+    probes = []
+
+    def fake_check():
+        probes.append(1)
+        return True
+
+    monkeypatch.setattr(va, "check_llm_service_available", fake_check)
+
+    assert va._llm_service_available_cached() is True
+    assert va._llm_service_available_cached() is True
+    assert len(probes) == 1
+
+
+def test_health_is_reprobed_after_invalidation(monkeypatch):
+    results = [True, False]
+
+    monkeypatch.setattr(va, "check_llm_service_available", lambda: results.pop(0))
+
+    assert va._llm_service_available_cached() is True
+    va._invalidate_llm_health_cache()
+    assert va._llm_service_available_cached() is False
+    assert results == []
+
+
+def test_failed_probe_uses_shorter_ttl(monkeypatch):
+    results = [False, True]
+    clock = [100.0]
+
+    monkeypatch.setattr(va, "check_llm_service_available", lambda: results.pop(0))
+    monkeypatch.setattr(va.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(va, "HEALTH_CHECK_CACHE_TTL", 5.0)
+    monkeypatch.setattr(va, "HEALTH_CHECK_NEGATIVE_TTL", 1.0)
+
+    assert va._llm_service_available_cached() is False
+    clock[0] += 0.5
+    assert va._llm_service_available_cached() is False
+    clock[0] += 1.0
+    assert va._llm_service_available_cached() is True
+    assert results == []
+
+
+def test_mark_down_skips_probe(monkeypatch):
+    probes = []
+    monkeypatch.setattr(va, "check_llm_service_available", lambda: probes.append(1) or True)
+
+    assert va._llm_service_available_cached() is True
+    va._mark_llm_service_down()
+    assert va._llm_service_available_cached() is False
+    assert len(probes) == 1
+
+
+def test_gguf_quantization_parses_file_names():
+    assert va.gguf_quantization("/m/Qwen_Qwen3-4B-Instruct-2507-Q4_K_M.gguf") == "Q4_K_M"
+    assert va.gguf_quantization("llama-3.2-3b-instruct-f16.gguf") == "F16"
+    assert va.gguf_quantization("phi-3-mini.IQ3_XS.gguf") == "IQ3_XS"
+    assert va.gguf_quantization("model.gguf") is None
+
+
+@pytest.mark.parametrize("model_path, expected, warned", [
+    ("/m/qwen3-4b-f16.gguf", "", True),
+    ("/m/qwen3-4b-Q4_K_M.gguf", "Q4_K_M", False),
+    ("/m/qwen3-4b-Q8_0.gguf", "Q4_K_M", True),
+])
+def test_quantization_check_only_warns(monkeypatch, model_path, expected, warned):
+    from unittest.mock import MagicMock
+
+    response = MagicMock()
+    response.json.return_value = {"model_path": model_path}
+    monkeypatch.setattr(va._http, "get", MagicMock(return_value=response))
+    monkeypatch.setattr(va, "LLM_EXPECTED_QUANT", expected)
+    warning = MagicMock()
+    monkeypatch.setattr(va.logger, "warning", warning)
+
+    assert va.check_llm_quantization() == va.gguf_quantization(model_path)
+    assert warning.called is warned
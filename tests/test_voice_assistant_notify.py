@@ -0,0 +1,39 @@
+import os
+import sys
+import threading
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from macbot import voice_assistant as va
+
+
+def test_dashboard_events_are_sent_in_order_and_coalesced(monkeypatch):
+    sent = []
+    gate = threading.Event()
+
+    def fake_post(url, json, timeout):
+        gate.wait(timeout=1.0)
+        sent.append(json["type"])
+        return MagicMock()
+
+    monkeypatch.setattr(va._http, "post", fake_post)
+
+    # The first event holds the worker so the rest pile up behind it
+    va._notify_dashboard_state("speaking_started")
+    for event in ("speaking_ended", "speaking_ended", "speaking_started", "speaking_ended"):
+        va._notify_dashboard_state(event)
+    gate.set()
+    va._notify_q.join()
+
+    assert sent == ["speaking_started", "speaking_ended", "speaking_started", "speaking_ended"]
+
+
+def test_notify_never_blocks_when_queue_is_full(monkeypatch):
+    monkeypatch.setattr(va, "_notify_q", va.queue.Queue(maxsize=1))
+    monkeypatch.setattr(va, "_notify_worker", object())  # no consumer running
+
+    va._notify_dashboard_state("speaking_started")
+    va._notify_dashboard_state("speaking_ended")
+
+    assert va._notify_q.get_nowait() == ("speaking_started", "")
@@ -0,0 +1,69 @@
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from macbot import voice_assistant as va
+
+
+class _DummyResponse:
+    def raise_for_status(self):
+        return None
+
+    def iter_lines(self, decode_unicode=False):
+        yield b'data: {"choices": [{"delta": {"content": "Hi"}}]}'
+        yield b'data: [DONE]'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+@pytest.fixture(autouse=True)
+def _stub_environment(monkeypatch):
+    monkeypatch.setattr(va, "_notify_dashboard_state", lambda *args, **kwargs: None)
+    monkeypatch.setattr(va, "INTERRUPTION_ENABLED", False)
+    monkeypatch.setattr(va.CFG, "get_enabled_tools", lambda: [])
+    monkeypatch.setattr(va, "tool_caller", va.ToolCaller())
+    monkeypatch.setattr(va.tts_manager, "audio_handler", None, raising=False)
+    monkeypatch.setattr(va.tts_manager, "enqueue_speak", lambda *args, **kwargs: MagicMock())
+    va._response_cache.clear()
+    yield
+    va._response_cache.clear()
+
+
+@pytest.fixture
+def llm_post(monkeypatch):
+    post_mock = MagicMock(side_effect=lambda *args, **kwargs: _DummyResponse())
+    monkeypatch.setattr(va._http, "post", post_mock)
+    return post_mock
+
+
+def test_repeated_utterance_is_served_from_cache(llm_post):
+    assert va.llama_chat("Tell me a joke") == "Hi"
+    assert va.llama_chat("  tell me a JOKE? ") == "Hi"
+
+    assert llm_post.call_count == 1
+    # The cached reply was not streamed, so the caller must speak it
+    assert va.TTS_STREAMED is False
+
+
+def test_time_sensitive_utterances_bypass_cache(llm_post):
+    va.llama_chat("what's the news")
+    va.llama_chat("what's the news")
+
+    assert llm_post.call_count == 2
+
+
+def test_cache_evicts_oldest_entry(monkeypatch, llm_post):
+    monkeypatch.setattr(va, "RESPONSE_CACHE_SIZE", 2)
+
+    for text in ("one", "two", "three"):
+        va.llama_chat(text)
+
+    assert list(va._response_cache) == ["two", "three"]
@@ -0,0 +1,191 @@
+import os
+import sys
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from macbot import voice_assistant as va
+
+
+class _StreamResponse:
+    def __init__(self, contents, gate=None):
+        self._contents = contents
+        self._gate = gate
+
+    def raise_for_status(self):
+        return None
+
+    def iter_lines(self, decode_unicode=False):
+        for idx, content in enumerate(self._contents):
+            if idx and self._gate is not None:
+                assert self._gate.wait(timeout=1.5)
+            yield ('data: {"choices": [{"delta": {"content": "%s"}}]}' % content).encode()
+        yield b'data: [DONE]'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+@pytest.fixture(autouse=True)
+def _stub_environment(monkeypatch):
+    monkeypatch.setattr(va, "_notify_dashboard_state", lambda *args, **kwargs: None)
+    monkeypatch.setattr(va, "INTERRUPTION_ENABLED", False)
+    monkeypatch.setattr(va, "RESPONSE_CACHE_ENABLED", False)
+    monkeypatch.setattr(va.CFG, "get_enabled_tools", lambda: [])
+    monkeypatch.setattr(va, "tool_caller", va.ToolCaller())
+    monkeypatch.setattr(va.tts_manager, "enqueue_speak", lambda *args, **kwargs: MagicMock())
+
+
+def test_matching_speculative_reply_is_reused(monkeypatch):
+    gate = threading.Event()
+    post = MagicMock(side_effect=lambda *args, **kwargs: _StreamResponse(["Hi", " there"], gate))
+    monkeypatch.setattr(va._http, "post", post)
+
+    speculative = va._SpeculativeReply("hello")
+    # The second delta arrives only after the turn has been confirmed
+    threading.Timer(0.05, gate.set).start()
+
+    assert va.llama_chat("hello", speculative=speculative) == "Hi there"
+    assert post.call_count == 1
+    assert speculative.cancelled
+
+
+def test_mismatched_speculative_reply_is_cancelled(monkeypatch):
+    gate = threading.Event()
+    post = MagicMock(side_effect=[
+        _StreamResponse(["stale", " reply"], gate),
+        _StreamResponse(["Fresh"]),
+    ])
+    monkeypatch.setattr(va._http, "post", post)
+
+    speculative = va._SpeculativeReply("hello")
+    try:
+        reply = va.llama_chat("hello world", speculative=speculative)
+    finally:
+        gate.set()
+    speculative._thread.join(timeout=1.5)
+
+    assert reply == "Fresh"
+    assert speculative.cancelled
+    assert post.call_args_list[1].kwargs["json"]["messages"][1]["content"] == "hello world"
+
+
+def test_speculative_request_errors_surface_on_reuse(monkeypatch):
+    monkeypatch.setattr(va, "_mark_llm_service_down", lambda: None)
+    monkeypatch.setattr(
+        va._http, "post", MagicMock(side_effect=va.requests.exceptions.ConnectionError())
+    )
+
+    speculative = va._SpeculativeReply("hello")
+
+    assert "can't connect" in va.llama_chat("hello", speculative=speculative)
+
+
+def test_tool_requests_are_never_speculated(monkeypatch):
+    post = MagicMock()
+    monkeypatch.setattr(va._http, "post", post)
+    monkeypatch.setattr(va.CFG, "get_enabled_tools", lambda: ["screenshot"])
+    monkeypatch.setattr(va, "tool_caller", va.ToolCaller())
+
+    assert va._start_speculative_reply("take a screenshot") is None
+    assert va._start_speculative_reply("") is None
+    post.assert_not_called()
+
+
+
+def test_speculative_reply_uses_sanitized_text(monkeypatch):
+    started = []
+    monkeypatch.setattr(va, "_SpeculativeReply", lambda text: started.append(text) or text)
+
+    assert va._start_speculative_reply("  <b>hello</b>\x07 ") == va.prepare_transcript("<b>hello</b>")
+    assert started == [va.prepare_transcript("<b>hello</b>")]
+    assert va._start_speculative_reply("   ") is None
+    assert va._start_speculative_reply("x" * 10001) is None
+    assert len(started) == 1
+
+def test_prompt_cache_warmup_is_throttled(monkeypatch):
+    posted = threading.Event()
+    post = MagicMock(side_effect=lambda *args, **kwargs: posted.set() or MagicMock())
+    monkeypatch.setattr(va._http, "post", post)
+    monkeypatch.setattr(va, "_prefill_state", {"busy": False, "last": float("-inf")})
+    monkeypatch.setattr(va, "LLM_PREFILL_INTERVAL", 60.0)
+
+    va._prefill_llm_cache()
+    assert posted.wait(timeout=1.5)
+    va._prefill_llm_cache()
+
+    assert post.call_count == 1
+    payload = post.call_args.kwargs["json"]
+    assert payload["max_tokens"] == 1 and payload["cache_prompt"] is True
+    assert payload["messages"][0]["content"] == va.SYSTEM_PROMPT
+
+
+def test_filler_plays_only_when_first_token_is_slow(monkeypatch):
+    filler_queued = threading.Event()
+    filler_job = MagicMock()
+    calls = []
+
+    def fake_enqueue(text, interruptible=True, notify=False, after=None):
+        calls.append((text, after))
+        if text == va.FILLER_PHRASE:
+            filler_queued.set()
+            return filler_job
+        return MagicMock()
+
+    def slow_post(*args, **kwargs):
+        assert filler_queued.wait(timeout=1.5)
+        return _StreamResponse(["Here it is."])
+
+    monkeypatch.setattr(va.tts_manager, "enqueue_speak", fake_enqueue)
+    monkeypatch.setattr(va, "FILLER_ENABLED", True)
+    monkeypatch.setattr(va, "FILLER_DELAY", 0.01)
+    monkeypatch.setattr(va._http, "post", MagicMock(side_effect=slow_post))
+
+    assert va.llama_chat("hello") == "Here it is."
+    # The reply is chained after the acknowledgement instead of talking over it
+    assert calls == [(va.FILLER_PHRASE, None), ("Here it is.", filler_job)]
+
+    calls.clear()
+    monkeypatch.setattr(va, "FILLER_DELAY", 0.5)
+    monkeypatch.setattr(va._http, "post", MagicMock(return_value=_StreamResponse(["Quick."])))
+
+    assert va.llama_chat("hello") == "Quick."
+    assert calls == [("Quick.", None)]
+
+
+def test_error_reply_is_chained_after_a_queued_filler(monkeypatch):
+    import requests
+
+    filler_queued = threading.Event()
+    filler_job = MagicMock()
+    calls = []
+
+    def fake_enqueue(text, interruptible=True, notify=False, after=None):
+        calls.append((text, after))
+        if text == va.FILLER_PHRASE:
+            filler_queued.set()
+            return filler_job
+        return MagicMock()
+
+    def failing_post(*args, **kwargs):
+        assert filler_queued.wait(timeout=1.5)
+        raise requests.exceptions.Timeout("slow")
+
+    monkeypatch.setattr(va.tts_manager, "enqueue_speak", fake_enqueue)
+    monkeypatch.setattr(va, "FILLER_ENABLED", True)
+    monkeypatch.setattr(va, "FILLER_DELAY", 0.01)
+    monkeypatch.setattr(va, "_invalidate_llm_health_cache", lambda: None)
+    monkeypatch.setattr(va._http, "post", MagicMock(side_effect=failing_post))
+
+    reply = va.llama_chat("hello")
+
+    assert "taking too long" in reply
+    assert calls == [(va.FILLER_PHRASE, None), (reply, filler_job)]
+    # Already queued, so the caller must not speak it a second time
+    assert va.TTS_STREAMED is True
@@ -13,14 +13,14 @@ class _DummyResponse:
     def __init__(self):
         self.status_code = 200
         self._lines = [
-            'data: {"choices": [{"delta": {"content": "Hi"}}]}',
-            'data: [DONE]'
+            b'data: {"choices": [{"delta": {"content": "Hi"}}]}',
+            b'data: [DONE]'
         ]
 
     def raise_for_status(self):
         return None
 
-    def iter_lines(self, decode_unicode=True):
+    def iter_lines(self, decode_unicode=False):
         for line in self._lines:
             yield line
 
@@ -38,12 +38,13 @@ def _stub_environment(monkeypatch):
     dummy_audio = type("DummyAudio", (), {"interrupt_requested": False, "check_voice_activity": lambda *args, **kwargs: False})()
     monkeypatch.setattr(va.tts_manager, "audio_handler", dummy_audio, raising=False)
     monkeypatch.setattr(va.tts_manager, "speak", lambda *args, **kwargs: None)
+    monkeypatch.setattr(va.tts_manager, "enqueue_speak", lambda *args, **kwargs: MagicMock())
 
 
 @pytest.fixture
 def llm_post(monkeypatch):
     post_mock = MagicMock(side_effect=lambda *args, **kwargs: _DummyResponse())
-    monkeypatch.setattr(va.requests, "post", post_mock)
+    monkeypatch.setattr(va._http, "post", post_mock)
     return post_mock
 
 
@@ -84,3 +85,96 @@ def test_llama_chat_skips_disabled_tools(monkeypatch, llm_post, tool_name, user_
     assert tool_mock.call_count == 0
     # Should fall back to LLM streaming when tools are disabled
     assert llm_post.call_count == 1
+
+
+def test_tool_keyword_scan_keeps_substring_semantics():
+    hits = va._match_tool_keywords("open website with information")
+
+    # Overlapping and nested keywords are all reported
+    assert {"open website", "open", "website", "web", "info", "for"} <= hits
+    assert "search" not in hits
+    assert va._match_tool_keywords("") == frozenset()
+
+
+def test_browse_uses_first_url_word(monkeypatch, llm_post):
+    monkeypatch.setattr(va.CFG, "get_enabled_tools", lambda: ["web_search"])
+    monkeypatch.setattr(va, "tool_caller", va.ToolCaller())
+    browse = MagicMock(return_value="PAGE")
+    monkeypatch.setattr(va.tool_caller, "browse_website", browse)
+
+    reply = va.llama_chat("browse to mywww.example then https://example.com/a?b=1 please")
+
+    browse.assert_called_once_with("https://example.com/a?b=1")
+    assert reply == "I browsed https://example.com/a?b=1. PAGE"
+    assert llm_post.call_count == 0
+
+
+@pytest.mark.parametrize("use_stdlib", [False, True])
+def test_llama_chat_parses_byte_sse_lines(monkeypatch, llm_post, use_stdlib):
+    if use_stdlib:
+        monkeypatch.setattr(va, "_json_loads", va.json.loads)
+    monkeypatch.setattr(va.CFG, "get_enabled_tools", lambda: [])
+    monkeypatch.setattr(va, "tool_caller", va.ToolCaller())
+    monkeypatch.setattr(va, "RESPONSE_CACHE_ENABLED", False)
+    monkeypatch.setattr(va.tts_manager, "enqueue_speak", lambda *args, **kwargs: MagicMock())
+
+    assert va.llama_chat("hello") == "Hi"
+
+
+def _stream_split(deltas):
+    spoken, buf = [], ""
+    for delta in deltas:
+        scan_from = len(buf)
+        buf += delta
+        ready, buf = va._split_tts_buffer(buf, scan_from)
+        if ready:
+            spoken.append(ready)
+    return spoken, buf
+
+
+def test_tts_batching_waits_for_clause_boundaries():
+    spoken, rest = _stream_split(
+        ["Sure", ". It", " costs 3", ".5 dollars", " today.", " Anything", " else?"]
+    )
+
+    # "Sure." alone is too short; "3.5" is not a boundary; the trailing
+    # sentence waits for the end of the stream
+    assert spoken == ["Sure. It costs 3.5 dollars today."]
+    assert rest == " Anything else?"
+
+
+def test_tts_batching_cuts_long_runs_at_a_space(monkeypatch):
+    monkeypatch.setattr(va, "TTS_BUFFER_SIZE", 20)
+
+    spoken, rest = _stream_split(["one two three four five six seven"])
+
+    assert spoken == ["one two three four"]
+    assert rest == "five six seven"
+
+
+def test_first_tts_chunk_uses_the_shorter_limit(monkeypatch):
+    monkeypatch.setattr(va.CFG, "get_enabled_tools", lambda: [])
+    monkeypatch.setattr(va, "tool_caller", va.ToolCaller())
+    monkeypatch.setattr(va, "RESPONSE_CACHE_ENABLED", False)
+    monkeypatch.setattr(va, "FILLER_ENABLED", False)
+    monkeypatch.setattr(va, "TTS_FIRST_CHUNK_SIZE", 20)
+    monkeypatch.setattr(va, "TTS_BUFFER_SIZE", 1000)
+    spoken = []
+    monkeypatch.setattr(
+        va.tts_manager, "enqueue_speak",
+        lambda text, *args, **kwargs: spoken.append(text) or MagicMock(),
+    )
+
+    words = "well the answer depends on a few things like the size of the file"
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.iter_lines.return_value = [
+        ('data: {"choices": [{"delta": {"content": "%s "}}]}' % word).encode()
+        for word in words.split()
+    ]
+    monkeypatch.setattr(va._http, "post", MagicMock(return_value=response))
+
+    va.llama_chat("how long will it take")
+
+    # Only the opening chunk is cut early; the rest waits for the stream end
+    assert spoken == ["well the answer", "depends on a few things like the size of the file"]
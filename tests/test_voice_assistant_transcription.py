@@ -14,18 +14,12 @@ def _make_chunk(duration_sec, sample_rate=16000, amplitude=0.1):
     return np.full(samples, amplitude, dtype=np.float32)
 
 
-def test_transcribe_cli_reads_cli_output(monkeypatch):
-    transcript_text = "mock transcript"
-    created_paths = []
-
-    def fake_run(cmd, capture_output, text, timeout):
-        base_index = cmd.index("-of") + 1
-        base_path = cmd[base_index]
-        output_path = f"{base_path}.txt"
-        created_paths.append(output_path)
-        with open(output_path, "w") as handle:
-            handle.write(transcript_text)
-        return SimpleNamespace(returncode=0, stdout="", stderr="")
+def test_transcribe_cli_pipes_audio_through_cli(monkeypatch):
+    calls = []
+
+    def fake_run(cmd, input, capture_output, timeout):
+        calls.append((cmd, input))
+        return SimpleNamespace(returncode=0, stdout=b" mock\n transcript \n", stderr=b"")
 
     monkeypatch.setattr(va.subprocess, "run", fake_run)
     monkeypatch.setattr(va, "_WHISPER_IMPL", "cli")
@@ -35,9 +29,25 @@ def test_transcribe_cli_reads_cli_output(monkeypatch):
     audio = np.zeros(1600, dtype=np.float32)
     result = va.transcribe(audio)
 
-    assert result == transcript_text
-    for path in created_paths:
-        assert not os.path.exists(path)
+    assert result == "mock transcript"
+    cmd, wav_bytes = calls[0]
+    assert cmd[cmd.index("-f") + 1] == "-"
+    assert "-otxt" not in cmd
+    assert wav_bytes.startswith(b"RIFF")
+    # 16-bit mono payload follows the 44-byte header
+    assert len(wav_bytes) == 44 + 2 * len(audio)
+
+
+def test_transcribe_cli_reports_failure(monkeypatch):
+    monkeypatch.setattr(
+        va.subprocess,
+        "run",
+        lambda cmd, input, capture_output, timeout: SimpleNamespace(returncode=1, stdout=b"", stderr=b"boom"),
+    )
+    monkeypatch.setattr(va, "_WHISPER_IMPL", "cli")
+    monkeypatch.setattr(va, "_WHISPER_CTX", None)
+
+    assert va.transcribe(np.zeros(160, dtype=np.float32)) == ""
 
 
 def test_streaming_transcriber_avoids_reprocessing(monkeypatch):
@@ -71,3 +81,111 @@ def test_streaming_transcriber_avoids_reprocessing(monkeypatch):
     assert transcriber._segments[1]["end"] == 17600
 
     assert transcriber.flush() == "hello world"
+
+
+def test_streaming_transcriber_reuses_arena_across_trims(monkeypatch):
+    monkeypatch.setattr(va, "transcribe", lambda audio: "x")
+
+    transcriber = va.StreamingTranscriber(max_buffer_duration=1.0, sample_rate=16000)
+    transcriber._transcription_interval = 0.0
+    arena = transcriber._arena
+
+    # Push well past the arena size; trimming and compaction keep it bounded
+    for i in range(40):
+        transcriber.add_chunk(_make_chunk(0.1, amplitude=float(i)))
+
+    assert transcriber._arena is arena
+    assert len(transcriber._buffer) <= transcriber._max_buffer_samples
+    assert np.shares_memory(transcriber._buffer, arena)
+    assert transcriber._buffer[-1] == 39.0
+    assert transcriber._buffer_offset + len(transcriber._buffer) == transcriber._next_sample_index
+
+
+def test_is_voiced_matches_rms_threshold():
+    quiet = _make_chunk(0.03, amplitude=0.004)
+    loud = _make_chunk(0.03, amplitude=0.006)
+
+    assert not va.is_voiced(quiet, thresh=0.005)
+    assert va.is_voiced(loud, thresh=0.005)
+    assert va.is_voiced(loud.reshape(-1, 1), thresh=0.005)
+    assert not va.is_voiced(np.zeros(0, dtype=np.float32), thresh=0.005)
+
+
+def test_frame_voicing_matches_per_block_vad():
+    rng = np.random.default_rng(0)
+    block = 320
+    amplitudes = [0.0, 0.5, 0.001, 0.2, 0.2, 0.0]
+    samples = np.concatenate(
+        [rng.uniform(-a, a, block).astype(np.float32) for a in amplitudes]
+    )
+
+    flags = va.frame_voicing(samples, block)
+
+    expected = [va.is_voiced(samples[i:i + block]) for i in range(0, len(samples), block)]
+    assert flags.tolist() == expected
+    assert va.voiced_runs(flags).tolist() == [[1, 2], [3, 5]]
+    assert va.voiced_runs(np.zeros(3, dtype=bool)).tolist() == []
+
+
+def test_frame_voicing_numpy_fallback_matches(monkeypatch):
+    rng = np.random.default_rng(1)
+    samples = rng.uniform(-0.1, 0.1, 320 * 8).astype(np.float32)
+    samples[320:640] *= 0.05
+
+    fast = va.frame_voicing(samples, 320)
+    monkeypatch.setattr(va, "HAS_NUMBA_VAD", False)
+    slow = va.frame_voicing(samples, 320)
+
+    assert fast.tolist() == slow.tolist()
+    assert va.is_voiced(samples[:320]) == bool(slow[0])
+
+
+def test_audio_callback_defers_status_reporting(monkeypatch, capsys):
+    monkeypatch.setattr(va, "MIC_MUTE_WHILE_TTS", True)
+    monkeypatch.setattr(va.tts_manager, "audio_handler", SimpleNamespace(is_playing=True), raising=False)
+    monkeypatch.setattr(va, "_audio_status", None)
+
+    va._callback(np.zeros((160, 1), dtype=np.float32), 160, None, "input overflow")
+    assert capsys.readouterr().err == ""
+
+    va._report_audio_status()
+    assert capsys.readouterr().err == "input overflow\n"
+    assert va._audio_status is None
+
+
+def test_streaming_transcriber_flush_rewinds_without_reallocating(monkeypatch):
+    outputs = iter(["one", "", "two", "three"])
+    monkeypatch.setattr(va, "transcribe", lambda audio: next(outputs))
+
+    transcriber = va.StreamingTranscriber(max_buffer_duration=5.0, sample_rate=16000)
+    transcriber._transcription_interval = 0.0
+    arena = transcriber._arena
+
+    assert transcriber.add_chunk(_make_chunk(0.5)) == "one"
+    # A silent window adds nothing to the transcript
+    assert transcriber.add_chunk(_make_chunk(0.5)) == ""
+    assert transcriber.add_chunk(_make_chunk(0.5)) == "two"
+    assert transcriber.peek() == "one two"
+    assert transcriber.flush() == "one two"
+
+    assert transcriber._arena is arena
+    assert len(transcriber._buffer) == 0
+    assert transcriber.peek() == ""
+    assert transcriber.add_chunk(_make_chunk(0.5)) == "three"
+    assert transcriber.flush() == "three"
+
+
+def test_voiced_frame_runs_matches_two_pass_detection(monkeypatch):
+    rng = np.random.default_rng(2)
+    amplitudes = [0.2, 0.0, 0.0, 0.3, 0.001, 0.2, 0.2]
+    samples = np.concatenate(
+        [rng.uniform(-a, a, 320).astype(np.float32) for a in amplitudes]
+    )
+
+    expected = va.voiced_runs(va.frame_voicing(samples, 320)).tolist()
+    assert expected == [[0, 1], [3, 4], [5, 7]]
+    assert va.voiced_frame_runs(samples, 320).tolist() == expected
+    assert va.voiced_frame_runs(np.zeros(640, dtype=np.float32), 320).tolist() == []
+
+    monkeypatch.setattr(va, "HAS_NUMBA_VAD", False)
+    assert va.voiced_frame_runs(samples, 320).tolist() == expected
@@ -0,0 +1,310 @@
+import os
+import sys
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from macbot import voice_assistant as va
+
+_prepare_transcript = va.prepare_transcript
+
+
+class _FakeTranscriber:
+    def __init__(self, text):
+        self._text = text
+
+    def flush(self):
+        return self._text
+
+
+def _drain_turn_queue():
+    for worker_queue in (va._stt_queue, va._turn_queue):
+        while True:
+            try:
+                worker_queue.get_nowait()
+            except va.queue.Empty:
+                break
+            worker_queue.task_done()
+
+
+@pytest.fixture(autouse=True)
+def _stub_environment(monkeypatch):
+    monkeypatch.setattr(va, "INTERRUPTION_ENABLED", False)
+    monkeypatch.setattr(va, "TTS_STREAMED", False)
+    monkeypatch.setattr(va, "prepare_transcript", lambda text: text)
+
+
+def test_turn_end_uses_llm_when_service_available(monkeypatch):
+    chat = MagicMock(return_value="llm reply")
+    speak = MagicMock()
+    monkeypatch.setattr(va, "_llm_service_available_cached", lambda: True)
+    monkeypatch.setattr(va, "llama_chat", chat)
+    monkeypatch.setattr(va, "speak", speak)
+
+    va._process_turn("hello there")
+
+    chat.assert_called_once_with("hello there")
+    speak.assert_called_once_with("llm reply")
+
+
+def test_turn_end_falls_back_to_degraded_response(monkeypatch):
+    chat = MagicMock()
+    speak = MagicMock()
+    monkeypatch.setattr(va, "_llm_service_available_cached", lambda: False)
+    monkeypatch.setattr(va, "llama_chat", chat)
+    monkeypatch.setattr(va, "get_degraded_response", lambda text: "degraded")
+    monkeypatch.setattr(va, "speak", speak)
+
+    va._process_turn("hello there")
+
+    chat.assert_not_called()
+    speak.assert_called_once_with("degraded")
+
+
+def test_degraded_responses_keep_keyword_priority(monkeypatch):
+    monkeypatch.setattr(va.time, "strftime", lambda fmt: "NOW")
+
+    assert va.get_degraded_response("Hey, what time is it?").startswith("Hello!")
+    assert va.get_degraded_response("What TIME is it") == "The current time is NOW."
+    assert va.get_degraded_response("what's the date") == "Today is NOW."
+    assert va.get_degraded_response("system status please").startswith("System monitoring")
+    assert va.get_degraded_response("tell me a joke") == va._DEGRADED_DEFAULT
+
+
+def test_turn_end_ignores_invalid_transcripts(monkeypatch):
+    speak = MagicMock()
+    monkeypatch.setattr(va, "speak", speak)
+    monkeypatch.setattr(va, "prepare_transcript", lambda text: None)
+
+    va._process_turn("bad input")
+
+    speak.assert_not_called()
+
+
+def test_turn_uses_sanitized_transcript(monkeypatch):
+    monkeypatch.setattr(va, "prepare_transcript", _prepare_transcript)
+    chat = MagicMock(return_value="reply")
+    monkeypatch.setattr(va, "_llm_service_available_cached", lambda: True)
+    monkeypatch.setattr(va, "llama_chat", chat)
+    monkeypatch.setattr(va, "speak", MagicMock())
+
+    va._process_turn("  open <script>alert(1)</script>the notes  ")
+
+    chat.assert_called_once_with("open the notes")
+
+
+def test_turn_end_queues_transcript_for_worker():
+    _drain_turn_queue()
+    try:
+        va._handle_turn_end(_FakeTranscriber(""))
+        assert va._turn_queue.empty()
+
+        va._handle_turn_end(_FakeTranscriber("hello there"))
+        assert va._turn_queue.get_nowait() == ("hello there", None)
+        va._turn_queue.task_done()
+    finally:
+        _drain_turn_queue()
+
+
+def test_turn_end_hands_over_or_cancels_speculative_reply():
+    _drain_turn_queue()
+    try:
+        unused = MagicMock()
+        va._handle_turn_end(_FakeTranscriber(""), unused)
+        unused.cancel.assert_called_once()
+
+        speculative = MagicMock()
+        va._handle_turn_end(_FakeTranscriber("hello there"), speculative)
+        assert va._turn_queue.get_nowait() == ("hello there", speculative)
+        va._turn_queue.task_done()
+        speculative.cancel.assert_not_called()
+    finally:
+        _drain_turn_queue()
+
+
+def test_process_turn_passes_speculative_reply_to_llm(monkeypatch):
+    chat = MagicMock(return_value="llm reply")
+    monkeypatch.setattr(va, "_llm_service_available_cached", lambda: True)
+    monkeypatch.setattr(va, "llama_chat", chat)
+    monkeypatch.setattr(va, "speak", MagicMock())
+    speculative = MagicMock()
+
+    va._process_turn("hello there", speculative)
+
+    chat.assert_called_once_with("hello there", speculative=speculative)
+    speculative.cancel.assert_called_once()
+
+
+def test_turn_worker_processes_until_sentinel(monkeypatch):
+    processed = []
+    monkeypatch.setattr(va, "_process_turn", lambda text, speculative=None: processed.append(text))
+    _drain_turn_queue()
+
+    va._turn_queue.put_nowait(("first", None))
+    va._turn_queue.put_nowait(("second", None))
+    va._turn_queue.put_nowait(None)
+    worker = threading.Thread(target=va._turn_worker_loop)
+    worker.start()
+    worker.join(timeout=2.0)
+
+    assert not worker.is_alive()
+    assert processed == ["first", "second"]
+
+
+def test_stt_worker_transcribes_and_hands_over_turns(monkeypatch):
+    class _RecordingTranscriber:
+        def __init__(self):
+            self.chunks = []
+
+        def add_chunk(self, chunk):
+            self.chunks.append(chunk)
+            return ""
+
+        def peek(self):
+            return "hello"
+
+    speculated = []
+    handed_over = []
+
+    def fake_speculate(text):
+        speculated.append(text)
+        return MagicMock()
+
+    monkeypatch.setattr(va, "_start_speculative_reply", fake_speculate)
+    monkeypatch.setattr(va, "_handle_turn_end", lambda tr, spec: handed_over.append(spec))
+    _drain_turn_queue()
+
+    transcriber = _RecordingTranscriber()
+    va._stt_queue.put_nowait("chunk 1")
+    va._stt_queue.put_nowait(va._STT_PAUSE)
+    va._stt_queue.put_nowait("chunk 2")  # speech resumed: speculation is stale
+    va._stt_queue.put_nowait(va._STT_PAUSE)
+    va._stt_queue.put_nowait(va._STT_END)
+    va._stt_queue.put_nowait(None)
+    worker = threading.Thread(target=va._stt_worker_loop, args=(transcriber,))
+    worker.start()
+    worker.join(timeout=2.0)
+
+    assert not worker.is_alive()
+    assert transcriber.chunks == ["chunk 1", "chunk 2"]
+    assert speculated == ["hello", "hello"]
+    assert len(handed_over) == 1 and handed_over[0] is not None
+
+
+def test_run_with_deadline_abandons_slow_steps():
+    release = threading.Event()
+    try:
+        assert va._run_with_deadline(lambda: release.wait(2.0), "slow", timeout=0.05) is False
+    finally:
+        release.set()
+    assert va._run_with_deadline(lambda: None, "fast", timeout=1.0) is True
+
+
+def test_run_with_deadline_reraises_step_errors():
+    def boom():
+        raise RuntimeError("stop failed")
+
+    with pytest.raises(RuntimeError):
+        va._run_with_deadline(boom, "boom", timeout=1.0)
+
+
+def test_cleanup_runs_only_once(monkeypatch):
+    tts_cleanup = MagicMock()
+    control_server = MagicMock()
+    monkeypatch.setattr(va.tts_manager, "cleanup", tts_cleanup)
+    monkeypatch.setattr(va, "_input_stream", None)
+    monkeypatch.setattr(va, "_control_server", control_server)
+    monkeypatch.setattr(va, "_cleanup_done", threading.Event())
+    monkeypatch.setattr(va, "_turn_pool", MagicMock())
+
+    try:
+        va._cleanup()
+        va._cleanup()
+    finally:
+        _drain_turn_queue()
+
+    tts_cleanup.assert_called_once()
+    control_server.shutdown.assert_called_once()
+
+
+def test_cleanup_stops_pipeline_workers(monkeypatch):
+    monkeypatch.setattr(va.tts_manager, "cleanup", MagicMock())
+    interrupt = MagicMock()
+    monkeypatch.setattr(va.tts_manager, "interrupt", interrupt)
+    monkeypatch.setattr(va, "_input_stream", None)
+    monkeypatch.setattr(va, "_control_server", None)
+    monkeypatch.setattr(va, "_cleanup_done", threading.Event())
+    monkeypatch.setattr(va, "_turn_pool", MagicMock())
+    monkeypatch.setattr(va, "_process_turn", lambda text, speculative=None: None)
+    _drain_turn_queue()
+
+    stt_worker = threading.Thread(target=va._stt_worker_loop, args=(_FakeTranscriber(""),))
+    turn_worker = threading.Thread(target=va._turn_worker_loop)
+    stt_worker.start()
+    turn_worker.start()
+    monkeypatch.setattr(va, "_pipeline_threads", [stt_worker, turn_worker])
+
+    try:
+        va._cleanup()
+    finally:
+        _drain_turn_queue()
+
+    interrupt.assert_called_once()
+    assert not stt_worker.is_alive()
+    assert not turn_worker.is_alive()
+
+
+def test_cleanup_aborts_input_stream_and_turn_pool(monkeypatch):
+    stream = MagicMock()
+    pool = MagicMock()
+    monkeypatch.setattr(va.tts_manager, "cleanup", MagicMock())
+    monkeypatch.setattr(va, "_input_stream", stream)
+    monkeypatch.setattr(va, "_control_server", None)
+    monkeypatch.setattr(va, "_cleanup_done", threading.Event())
+    monkeypatch.setattr(va, "_turn_pool", pool)
+
+    try:
+        va._cleanup()
+    finally:
+        _drain_turn_queue()
+
+    pool.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+    stream.abort.assert_called_once()
+    stream.stop.assert_not_called()
+    stream.close.assert_called_once()
+
+
+def test_llm_reply_stops_streaming_at_shutdown(monkeypatch):
+    done = threading.Event()
+    seen = []
+
+    class _Response:
+        def raise_for_status(self):
+            return None
+
+        def iter_lines(self):
+            for word in ("one", "two", "three"):
+                seen.append(word)
+                if word == "two":
+                    done.set()
+                yield ('data: {"choices": [{"delta": {"content": "%s "}}]}' % word).encode()
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+    monkeypatch.setattr(va, "_cleanup_done", done)
+    monkeypatch.setattr(va, "FILLER_ENABLED", False)
+    monkeypatch.setattr(va, "RESPONSE_CACHE_ENABLED", False)
+    monkeypatch.setattr(va.CFG, "get_enabled_tools", lambda: [])
+    monkeypatch.setattr(va, "tool_caller", va.ToolCaller())
+    monkeypatch.setattr(va.tts_manager, "enqueue_speak", lambda *args, **kwargs: MagicMock())
+    monkeypatch.setattr(va._http, "post", MagicMock(return_value=_Response()))
+
+    assert va.llama_chat("count to three").strip() == "one"
+    assert seen == ["one", "two"]
@@ -2,6 +2,8 @@ import os
 import sys
 from types import SimpleNamespace
 
+import pytest
+
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
 
@@ -27,6 +29,7 @@ def test_get_system_stats_uses_non_blocking_cpu(monkeypatch):
 
     # Force re-prime path to run with our patched cpu_percent implementation
     wd._cpu_percent_initialized = False
+    monkeypatch.setattr(wd, '_stats_sampled_at', float('-inf'))
 
     stats = wd.get_system_stats()
 
@@ -36,3 +39,1181 @@ def test_get_system_stats_uses_non_blocking_cpu(monkeypatch):
     assert stats['network'] == {'bytes_sent': 123, 'bytes_recv': 456}
     assert all(call is None for call in cpu_calls)
     assert isinstance(stats['timestamp'], str)
+
+
+def test_get_system_stats_reuses_recent_sample(monkeypatch):
+    import macbot.web_dashboard as wd
+
+    samples = []
+
+    def fake_cpu_percent(interval=None):
+        samples.append(interval)
+        return 10.0
+
+    monkeypatch.setattr(wd.psutil, 'cpu_percent', fake_cpu_percent)
+    monkeypatch.setattr(wd.psutil, 'virtual_memory', lambda: SimpleNamespace(percent=1.0))
+    monkeypatch.setattr(wd.psutil, 'disk_usage', lambda _: SimpleNamespace(percent=2.0))
+    monkeypatch.setattr(wd.psutil, 'net_io_counters', lambda: SimpleNamespace(bytes_sent=0, bytes_recv=0))
+    monkeypatch.setattr(wd, '_cpu_percent_initialized', True)
+    monkeypatch.setattr(wd, '_stats_sampled_at', float('-inf'))
+
+    first = wd.get_system_stats()
+    second = wd.get_system_stats()
+
+    assert second is first
+    assert samples == [None]
+
+    monkeypatch.setattr(wd, '_stats_sampled_at', wd._stats_sampled_at - wd._STATS_MIN_INTERVAL)
+    assert wd.get_system_stats() is not first
+    assert samples == [None, None]
+
+
+def test_fallback_health_probes_run_concurrently(monkeypatch):
+    import threading
+
+    import macbot.web_dashboard as wd
+
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+    release = threading.Barrier(3, timeout=2.0)
+
+    def fake_get(url, timeout=None):
+        if url.endswith('/services'):
+            raise ConnectionError('orchestrator down')
+        with lock:
+            in_flight.append(url)
+            peak.append(len(in_flight))
+        # All three probes must be in flight at once to pass the barrier
+        release.wait()
+        with lock:
+            in_flight.remove(url)
+        return SimpleNamespace(status_code=500 if f':{wd.rag_port}/' in url else 200)
+
+    monkeypatch.setattr(wd._http, 'get', fake_get)
+    monkeypatch.setattr(wd, 'service_status', {
+        name: dict(entry) for name, entry in wd.service_status.items()
+    })
+
+    monkeypatch.setattr(wd, '_health_checked_at', float('-inf'))
+
+    wd.check_service_health()
+
+    assert max(peak) == 3
+    assert wd.service_status['llama']['status'] == 'running'
+    assert wd.service_status['voice_assistant']['status'] == 'running'
+    assert wd.service_status['rag']['status'] == 'stopped'
+
+
+def test_service_health_is_cached_within_ttl(monkeypatch):
+    import macbot.web_dashboard as wd
+
+    sweeps = []
+    monkeypatch.setattr(wd, '_refresh_service_health', lambda: sweeps.append(1))
+    monkeypatch.setattr(wd, '_health_checked_at', float('-inf'))
+
+    wd.check_service_health()
+    wd.check_service_health()
+    assert sweeps == [1]
+
+    wd._invalidate_service_health()
+    wd.check_service_health()
+    assert sweeps == [1, 1]
+
+
+def test_sse_clients_share_one_broadcaster(monkeypatch):
+    import threading
+
+    import macbot.web_dashboard as wd
+
+    gate = threading.Event()
+    payloads = []
+
+    def fake_payload():
+        assert gate.wait(timeout=1.0)
+        payloads.append(1)
+        return '{"n": %d}' % len(payloads)
+
+    monkeypatch.setattr(wd, '_sse_payload', fake_payload)
+    monkeypatch.setattr(wd, '_SSE_INTERVAL', 0.01)
+    monkeypatch.setattr(wd, '_sse_subscribers', set())
+    monkeypatch.setattr(wd, '_sse_state', {'running': False, 'last': None})
+    started = []
+
+    def start_task(target):
+        started.append(threading.Thread(target=target, daemon=True))
+        started[-1].start()
+
+    monkeypatch.setattr(wd.socketio, 'start_background_task', start_task)
+
+    first = wd._sse_subscribe()
+    second = wd._sse_subscribe()
+    gate.set()
+
+    assert len(started) == 1
+    assert first.get(timeout=1.0) == second.get(timeout=1.0) == '{"n": 1}'
+
+    wd._sse_unsubscribe(first)
+    wd._sse_unsubscribe(second)
+    started[0].join(timeout=1.0)
+    assert not started[0].is_alive()
+    assert wd._sse_state['running'] is False
+
+    # A later client is served the last payload straight away
+    late = wd._sse_subscribe()
+    assert late.get_nowait().startswith('{"n": ')
+    wd._sse_unsubscribe(late)
+    started[-1].join(timeout=1.0)
+    assert len(started) == 2
+
+
+def test_upload_parses_documents_off_the_request_and_cleans_up(monkeypatch):
+    import io
+    from concurrent.futures import ThreadPoolExecutor
+
+    import macbot.web_dashboard as wd
+
+    seen_paths = []
+
+    def fake_extract(path, kind):
+        seen_paths.append(path)
+        with open(path, 'rb') as fh:
+            data = fh.read()
+        if kind == 'docx':
+            raise wd.DocumentTextError("empty or unreadable document")
+        return f"{kind}:{data.decode()}"
+
+    posted = []
+
+    def fake_post(url, json=None, headers=None, timeout=None):
+        posted.append((json['title'], json['type'], json['content']))
+        return SimpleNamespace(status_code=200)
+
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(wd, '_get_parse_pool', lambda: pool)
+    monkeypatch.setattr(wd, 'extract_document_text', fake_extract)
+    monkeypatch.setattr(wd._http, 'post', fake_post)
+
+    try:
+        resp = wd.app.test_client().post(
+            '/api/upload-documents',
+            data={'files': [
+                (io.BytesIO(b'plain'), 'notes.txt'),
+                (io.BytesIO(b'pdfbytes'), 'report.pdf'),
+                (io.BytesIO(b''), 'blank.docx'),
+                (io.BytesIO(b'x'), 'tool.exe'),
+            ]},
+            content_type='multipart/form-data',
+            environ_base={'REMOTE_ADDR': '127.0.0.1'},
+        )
+    finally:
+        pool.shutdown()
+
+    body = resp.get_json()
+    assert sorted(posted) == [
+        ('notes.txt', 'text', 'plain'),
+        ('report.pdf', 'pdf', 'pdf:pdfbytes'),
+    ]
+    assert sorted(body['errors']) == [
+        'blank.docx: empty or unreadable document',
+        'tool.exe: unsupported file type (txt, pdf, docx supported)',
+    ]
+    assert len(seen_paths) == 2
+    assert not any(os.path.exists(path) for path in seen_paths)
+
+
+def test_parse_pool_workers_come_from_a_forkserver(monkeypatch, tmp_path):
+    import macbot.web_dashboard as wd
+
+    monkeypatch.setattr(wd, '_parse_pool', None)
+    doc = tmp_path / 'notes.txt'
+    doc.write_text('plain')
+
+    pool = wd._get_parse_pool()
+    try:
+        assert wd._get_parse_pool() is pool
+        assert pool._mp_context.get_start_method() == 'forkserver'
+        assert pool.submit(wd.extract_document_text, str(doc), 'text').result(timeout=30) == 'plain'
+    finally:
+        pool.shutdown()
+
+
+def test_extract_text_reads_plain_text(tmp_path):
+    from macbot import document_text
+
+    path = tmp_path / "a.txt"
+    path.write_bytes("héllo".encode())
+
+    assert document_text.document_kind("A.TXT") == "text"
+    assert document_text.document_kind("a.md") is None
+    assert document_text.extract_text(str(path), "text") == "héllo"
+
+
+def test_extract_text_prefers_pdfium_for_pdfs(monkeypatch, tmp_path):
+    import sys
+
+    from macbot import document_text
+
+    closed = []
+
+    class FakeTextPage:
+        def __init__(self, text):
+            self.text = text
+
+        def get_text_range(self):
+            return self.text
+
+        def close(self):
+            closed.append('textpage')
+
+    class FakePage(FakeTextPage):
+        def get_textpage(self):
+            return FakeTextPage(self.text)
+
+    class FakeDocument:
+        def __init__(self, path):
+            self.path = path
+
+        def __iter__(self):
+            return iter([FakePage(' page one'), FakePage('page two ')])
+
+        def close(self):
+            closed.append('document')
+
+    monkeypatch.setitem(sys.modules, 'pypdfium2', SimpleNamespace(PdfDocument=FakeDocument))
+
+    assert document_text.extract_text(str(tmp_path / 'a.pdf'), 'pdf') == 'page one\npage two'
+    assert closed.count('document') == 1
+
+    monkeypatch.setattr(FakeDocument, '__iter__', lambda self: iter([FakePage('  ')]))
+    with pytest.raises(document_text.DocumentTextError):
+        document_text.extract_text(str(tmp_path / 'b.pdf'), 'pdf')
+
+
+def test_broadcast_updates_are_coalesced(monkeypatch):
+    import threading
+
+    import macbot.web_dashboard as wd
+
+    emitted = []
+    tasks = []
+
+    def start_task(target):
+        tasks.append(threading.Thread(target=target, daemon=True))
+        tasks[-1].start()
+
+    monkeypatch.setattr(wd.socketio, 'start_background_task', start_task)
+    monkeypatch.setattr(wd.socketio, 'emit', lambda event, data, **kw: emitted.append((event, data)))
+    monkeypatch.setattr(wd, '_EMIT_COALESCE_SEC', 0.05)
+    monkeypatch.setattr(wd, '_emit_queue', wd.queue.SimpleQueue())
+    monkeypatch.setattr(wd, '_emit_state', {'running': False})
+
+    wd._broadcast_update({'type': 'user_message', 'content': 'hi'})
+    wd._broadcast_update({'type': 'interruption'})
+    tasks[0].join(timeout=2.0)
+
+    assert len(tasks) == 1
+    assert emitted == [('conversation_batch', {'events': [
+        {'type': 'user_message', 'content': 'hi'},
+        {'type': 'interruption'},
+    ]})]
+    assert wd._emit_state['running'] is False
+
+
+def test_proxy_calls_use_short_connect_timeout(monkeypatch):
+    import macbot.web_dashboard as wd
+
+    calls = []
+    monkeypatch.setattr(
+        wd._http, 'request',
+        lambda method, url, json=None, timeout=None: calls.append((method, json, timeout)) or SimpleNamespace(status_code=200),
+    )
+
+    wd._request_with_retry('POST', 'http://127.0.0.1:1/speak', json_body={'text': 'hi'}, timeout=5)
+    wd._request_with_retry('GET', 'http://127.0.0.1:1/metrics', timeout=2)
+
+    assert calls == [
+        ('POST', {'text': 'hi'}, (wd._CONNECT_TIMEOUT, 5)),
+        ('GET', None, (wd._CONNECT_TIMEOUT, 2)),
+    ]
+
+
+def test_session_retries_through_the_pooled_adapter():
+    import macbot.web_dashboard as wd
+
+    retry = wd._http.get_adapter('http://127.0.0.1:1').max_retries
+
+    assert retry.total == 1
+    assert 503 in retry.status_forcelist
+    assert retry.connect == 1 and retry.read is False
+    assert 'POST' not in retry.allowed_methods
+    assert retry.raise_on_status is False
+
+
+def test_jsonify_matches_flask_with_and_without_orjson(monkeypatch):
+    import json
+
+    import macbot.web_dashboard as wd
+
+    payload = {'success': True, 'data': {'cpu': 12.5, 'services': ['llm', 'rag']}}
+    with wd.app.app_context():
+        fast = wd._jsonify(payload)
+        monkeypatch.setattr(wd, '_orjson', None)
+        slow = wd._jsonify(payload)
+
+    assert fast.mimetype == slow.mimetype == 'application/json'
+    assert json.loads(fast.get_data()) == json.loads(slow.get_data())
+    assert json.loads(wd._json_dumps({'n': 1})) == {'n': 1}
+
+
+def test_socketio_packets_encode_with_orjson_codec():
+    import json
+
+    import macbot.web_dashboard as wd
+
+    if wd._orjson is None:
+        pytest.skip('orjson not installed')
+    from socketio import packet
+
+    assert packet.Packet.json is wd._OrjsonPackets
+    encoded = packet.Packet(packet.EVENT, data=['state_update', {'cpu': 1.5}]).encode()
+    assert json.loads(encoded[1:]) == ['state_update', {'cpu': 1.5}]
+    # Objects orjson rejects still go through the stdlib encoder
+    assert wd._OrjsonPackets.dumps({'n': 2**70}, separators=(',', ':')) == '{"n":%d}' % 2**70
+    assert wd._OrjsonPackets.loads('{"a":1}') == {'a': 1}
+
+
+def test_history_snapshot_is_reused_until_history_changes(monkeypatch):
+    from collections import deque
+
+    import macbot.web_dashboard as wd
+
+    monkeypatch.setattr(wd, 'conversation_history', deque(maxlen=2))
+    monkeypatch.setattr(wd, '_history_snapshot', {'list': None, 'json': None})
+
+    wd._append_history({'id': 1})
+    first = wd._history_list()
+    assert wd._history_list() is first
+
+    wd._append_history({'id': 2})
+    wd._append_history({'id': 3})
+    assert [m['id'] for m in wd._history_list()] == [2, 3]
+    assert first == [{'id': 1}]
+
+    wd._clear_history()
+    assert wd._history_list() == []
+
+
+def test_history_payload_is_encoded_once_per_change(monkeypatch):
+    from collections import deque
+
+    import macbot.web_dashboard as wd
+
+    encoded = []
+
+    class FakeFragment:
+        def __init__(self, contents):
+            encoded.append(contents)
+            self.contents = contents
+
+    monkeypatch.setattr(wd, '_orjson_fragment', FakeFragment if wd._orjson is not None else None)
+    monkeypatch.setattr(wd, 'conversation_history', deque(maxlen=5))
+    monkeypatch.setattr(wd, '_history_snapshot', {'list': None, 'json': None})
+
+    wd._append_history({'id': 1})
+    if wd._orjson is None:
+        assert wd._history_payload() == [{'id': 1}]
+        return
+    first = wd._history_payload()
+    assert wd._history_payload() is first and len(encoded) == 1
+    assert wd._unfragment(first) == [{'id': 1}]
+
+    wd._append_history({'id': 2})
+    assert wd._unfragment(wd._history_payload()) == [{'id': 1}, {'id': 2}]
+    assert len(encoded) == 2
+
+
+def test_state_room_holds_only_subscribed_clients(monkeypatch):
+    import macbot.web_dashboard as wd
+
+    monkeypatch.setattr(wd, 'websocket_clients', set())
+    monkeypatch.setattr(wd, 'get_system_stats', lambda: {'cpu': 1.0})
+
+    idle = wd.socketio.test_client(wd.app)
+    assert not wd._has_state_subscribers()
+
+    viewer = wd.socketio.test_client(wd.app)
+    viewer.get_received()
+    viewer.emit('subscribe_state')
+    assert wd._has_state_subscribers()
+    assert [m['name'] for m in viewer.get_received()] == ['state_update']
+
+    idle.get_received()
+    wd.socketio.emit('state_update', {'system_stats': {}}, to=wd._STATE_ROOM)
+    assert idle.get_received() == []
+    assert [m['name'] for m in viewer.get_received()] == ['state_update']
+
+    viewer.emit('unsubscribe_state')
+    assert not wd._has_state_subscribers()
+    idle.disconnect()
+    viewer.disconnect()
+
+
+def test_state_subscriber_check_tolerates_missing_room(monkeypatch):
+    import macbot.web_dashboard as wd
+
+    manager = wd.socketio.server.manager
+
+    def strict_participants(namespace, room):
+        # Older python-socketio 5.x behaviour for unknown rooms
+        return iter(manager.rooms[namespace][room])
+
+    monkeypatch.setattr(manager, 'get_participants', strict_participants)
+    monkeypatch.setattr(manager, 'rooms', {})
+    assert not wd._has_state_subscribers()
+    monkeypatch.setattr(manager, 'rooms', {'/': {wd._DASHBOARD_ROOM: {'sid': 'eio'}}})
+    assert not wd._has_state_subscribers()
+
+
+def test_subscriber_rebuilds_history_from_full_state_and_ticks(monkeypatch):
+    from collections import deque
+
+    import macbot.web_dashboard as wd
+
+    monkeypatch.setattr(wd, 'websocket_clients', set())
+    monkeypatch.setattr(wd, 'get_system_stats', lambda: {'cpu': 1.0})
+    monkeypatch.setattr(wd, 'conversation_history', deque(maxlen=4))
+    monkeypatch.setattr(wd, '_history_snapshot', {'list': None, 'json': None})
+    monkeypatch.setattr(wd, '_history_marks', {'seq': 0, 'cleared_at': 0})
+    monkeypatch.setattr(wd, '_orjson_fragment', None)
+
+    last: dict = {}
+    wd._append_history({'id': 1})
+    wd._state_update_delta(last)
+    # Changes after the monitor's last tick but before the subscription
+    wd._append_history({'id': 2})
+
+    viewer = wd.socketio.test_client(wd.app)
+    viewer.get_received()
+    viewer.emit('subscribe_state')
+    full = viewer.get_received()[0]['args'][0]
+    held, held_seq = list(full['conversation_history']), full['conversation_history_seq']
+
+    wd._append_history({'id': 3})
+    wd.socketio.emit('state_update', wd._state_update_delta(last), to=wd._STATE_ROOM)
+    for message in viewer.get_received():
+        delta = message['args'][0].get('conversation_history_delta')
+        if delta:
+            held, held_seq = _apply_history_delta(held, held_seq, delta, 4)
+
+    assert held == list(wd.conversation_history)
+    viewer.disconnect()
+
+
+def test_state_update_sends_only_changed_fields_and_history_delta(monkeypatch):
+    from collections import deque
+
+    import macbot.web_dashboard as wd
+
+    monkeypatch.setattr(wd, 'conversation_history', deque(maxlen=3))
+    monkeypatch.setattr(wd, '_history_snapshot', {'list': None, 'json': None})
+    monkeypatch.setattr(wd, '_history_marks', {'seq': 0, 'cleared_at': 0})
+    monkeypatch.setattr(wd, 'get_system_stats', lambda: {'cpu': 1.0})
+    monkeypatch.setattr(wd, 'service_status', {'rag': {'status': 'running'}})
+
+    last: dict = {}
+    wd._append_history({'id': 1})
+    first = wd._state_update_delta(last)
+    assert set(first) == {'system_stats', 'service_status', 'conversation_state',
+                          'conversation_history_delta'}
+    assert first['conversation_history_delta']['added'] == [{'id': 1}]
+
+    # Idle tick: only the stats go out
+    assert wd._state_update_delta(last) == {'system_stats': {'cpu': 1.0}}
+
+    wd._append_history({'id': 2})
+    wd.service_status['rag']['status'] = 'stopped'
+    tick = wd._state_update_delta(last)
+    assert tick['service_status']['rag']['status'] == 'stopped'
+    assert tick['conversation_history_delta'] == {'added': [{'id': 2}], 'since': 1, 'seq': 2}
+
+    # Overrunning the deque between ticks resends the whole window
+    for i in range(3, 7):
+        wd._append_history({'id': i})
+    delta = wd._state_update_delta(last)['conversation_history_delta']
+    assert delta['since'] == 3 and delta['seq'] == 6
+    assert [m['id'] for m in delta['added']] == [4, 5, 6]
+
+    # seq keeps rising across a clear
+    wd._clear_history()
+    assert wd._state_update_delta(last)['conversation_history_delta'] == {'added': [], 'since': 7, 'seq': 7}
+
+
+def _apply_history_delta(held: list, held_seq: int, delta: dict, maxlen: int) -> tuple:
+    """Client side of conversation_history_delta, as documented in API_REFERENCE.md"""
+    if held_seq >= delta['seq']:
+        return held, held_seq
+    if held_seq >= delta['since']:
+        held = held + delta['added'][held_seq - delta['since']:]
+    else:
+        held = list(delta['added'])
+    return held[-maxlen:], delta['seq']
+
+
+def test_history_delta_applies_after_clear_and_for_clients_ahead_of_the_tick(monkeypatch):
+    from collections import deque
+
+    import macbot.web_dashboard as wd
+
+    monkeypatch.setattr(wd, 'conversation_history', deque(maxlen=3))
+    monkeypatch.setattr(wd, '_history_snapshot', {'list': None, 'json': None})
+    monkeypatch.setattr(wd, '_history_marks', {'seq': 0, 'cleared_at': 0})
+    monkeypatch.setattr(wd, '_orjson_fragment', None)
+
+    for i in range(5):
+        wd._append_history({'id': i})
+    tick_seq, delta = wd._history_delta(None)
+    client, client_seq = _apply_history_delta([], 0, delta, 3)
+    assert client == list(wd.conversation_history) and client_seq == 5
+
+    # A clear must not leave the client ignoring every later delta
+    wd._clear_history()
+    wd._append_history({'id': 'new'})
+    tick_seq, delta = wd._history_delta(tick_seq)
+    client, client_seq = _apply_history_delta(client, client_seq, delta, 3)
+    assert client == [{'id': 'new'}]
+
+    # A client that took full state between ticks holds more than the last
+    # tick did; it neither drops nor repeats entries
+    wd._append_history({'id': 'a'})
+    late, late_seq = wd._history_state()
+    late = list(late)
+    wd._append_history({'id': 'b'})
+    tick_seq, delta = wd._history_delta(tick_seq)
+    late, late_seq = _apply_history_delta(late, late_seq, delta, 3)
+    client, client_seq = _apply_history_delta(client, client_seq, delta, 3)
+    assert late == client == list(wd.conversation_history)
+    assert late_seq == client_seq == tick_seq
+
+
+def test_broadcast_skips_the_originating_client(monkeypatch):
+    import threading
+
+    import macbot.web_dashboard as wd
+
+    emitted = []
+    tasks = []
+
+    def start_task(target):
+        tasks.append(threading.Thread(target=target, daemon=True))
+        tasks[-1].start()
+
+    monkeypatch.setattr(wd.socketio, 'start_background_task', start_task)
+    monkeypatch.setattr(wd.socketio, 'emit', lambda event, data, to=None, skip_sid=None: emitted.append((data, to, skip_sid)))
+    monkeypatch.setattr(wd, '_EMIT_COALESCE_SEC', 0.05)
+    monkeypatch.setattr(wd, '_emit_queue', wd.queue.SimpleQueue())
+    monkeypatch.setattr(wd, '_emit_state', {'running': False})
+
+    wd._broadcast_update({'type': 'user_message'}, skip_sid='abc')
+    wd._broadcast_update({'type': 'assistant_message'})
+    wd._broadcast_update({'type': 'error_message'})
+    tasks[0].join(timeout=2.0)
+
+    assert emitted == [
+        ({'events': [{'type': 'user_message'}]}, wd._DASHBOARD_ROOM, 'abc'),
+        ({'events': [{'type': 'assistant_message'}, {'type': 'error_message'}]}, wd._DASHBOARD_ROOM, None),
+    ]
+
+
+def test_orchestrator_proxies_use_module_host_port(monkeypatch):
+    import macbot.web_dashboard as wd
+
+    urls = []
+    monkeypatch.setattr(wd, 'orc_host', 'orc.local')
+    monkeypatch.setattr(wd, 'orc_port', 9999)
+    monkeypatch.setattr(wd.CFG, 'get_orchestrator_host_port', lambda: (_ for _ in ()).throw(AssertionError('config re-read')))
+    monkeypatch.setattr(
+        wd, '_request_with_retry',
+        lambda method, url, **kw: urls.append(url) or SimpleNamespace(ok=True, json=lambda: {'ok': True}),
+    )
+
+    client = wd.app.test_client()
+    assert client.get('/api/metrics').get_json() == {'ok': True}
+    assert client.get('/api/pipeline-check').get_json() == {'ok': True}
+    assert urls == ['http://orc.local:9999/metrics', 'http://orc.local:9999/pipeline-check']
+
+
+def test_post_that_times_out_on_read_is_sent_once():
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    import requests
+
+    import macbot.web_dashboard as wd
+
+    hits = []
+
+    class SlowHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            hits.append(self.path)
+            self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            time.sleep(0.5)
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/generate"
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            wd._http.post(url, json={'n': 1}, timeout=(wd._CONNECT_TIMEOUT, 0.1))
+        time.sleep(0.3)
+        assert hits == ['/generate']
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_api_chat_does_not_write_to_stdout(monkeypatch, capsys):
+    import macbot.web_dashboard as wd
+
+    monkeypatch.setattr(wd, '_handle_chat_message_and_broadcast', lambda message, emit_user=True: 'pong')
+
+    resp = wd.app.test_client().post(
+        '/api/chat', json={'message': 'ping'}, environ_base={'REMOTE_ADDR': '127.0.0.1'}
+    )
+
+    assert resp.get_json()['response'] == 'pong'
+    assert capsys.readouterr().out == ''
+
+
+def test_voice_audio_is_piped_to_ffmpeg(monkeypatch):
+    import base64
+
+    import macbot.web_dashboard as wd
+
+    calls = []
+
+    def fake_run(cmd, input=None, capture_output=False, timeout=None, close_fds=True):
+        assert close_fds is False  # keeps CPython on its posix_spawn path
+        calls.append((cmd, input))
+        return SimpleNamespace(returncode=1, stderr=b'bad input')
+
+    monkeypatch.setattr(wd.subprocess, 'run', fake_run)
+    monkeypatch.setattr(wd, '_decode_audio_pyav', lambda audio_bytes, as_float=False: None)
+    monkeypatch.setattr(wd, '_HAS_WHISPER_CLI', False)
+    audio = b'\x1aE\xdf\xa3webm-bytes'
+    data_url = 'data:audio/webm;codecs=opus;base64,' + base64.b64encode(audio).decode()
+
+    assert 'conversion failed' in wd.process_voice_with_whisper(data_url)
+    cmd, piped = calls[0]
+    assert cmd[0] == wd._FFMPEG
+    assert cmd[cmd.index('-i') + 1] == 'pipe:0'
+    assert cmd[cmd.index('-f') + 1] == 'webm'
+    assert piped == audio
+
+    wd.process_voice_with_whisper('data:audio/ogg;base64,' + base64.b64encode(audio).decode())
+    cmd = calls[-1][0]
+    assert cmd[cmd.index('-i') - 2:cmd.index('-i') + 2] == ['-f', 'ogg', '-i', 'pipe:0']
+    assert cmd[cmd.index('-loglevel') + 1] == 'error' and '-nostats' in cmd
+
+    # A bare base64 payload decodes the same way
+    wd.process_voice_with_whisper(base64.b64encode(audio).decode())
+    assert calls[-1][1] == audio
+
+    wd.process_voice_with_whisper('data:audio/mp4;base64,' + base64.b64encode(audio).decode())
+    cmd, piped = calls[-1]
+    src = cmd[cmd.index('-i') + 1]
+    assert piped is None and src.endswith('.mp4')
+    assert not os.path.exists(src)
+    assert cmd[-1] == 'pipe:1'
+    # Without whisper.cpp the fallback gets raw float32 samples
+    assert cmd[-3:] == ['-f', 'f32le', 'pipe:1']
+
+
+def test_voice_audio_decodes_in_process_with_pyav(monkeypatch):
+    import base64
+    import io
+    import sys
+    import wave
+
+    import numpy as np
+
+    import macbot.web_dashboard as wd
+
+    class FakeFrame:
+        def __init__(self, samples):
+            self.samples = samples
+
+        def to_ndarray(self):
+            return np.array([self.samples], dtype=np.int16)
+
+    class FakeResampler:
+        def __init__(self, format, layout, rate):
+            assert (format, layout, rate) == ('s16', 'mono', 16000)
+
+        def resample(self, frame):
+            return [] if frame is None else [frame]
+
+    class FakeContainer:
+        def __init__(self, source):
+            self.source = source
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def decode(self, audio):
+            return [FakeFrame([1, 2]), FakeFrame([3])]
+
+    fake_av = SimpleNamespace(
+        open=FakeContainer,
+        audio=SimpleNamespace(resampler=SimpleNamespace(AudioResampler=FakeResampler)),
+    )
+    monkeypatch.setitem(sys.modules, 'av', fake_av)
+    monkeypatch.setattr(wd.subprocess, 'run', lambda *a, **kw: (_ for _ in ()).throw(AssertionError('ffmpeg spawned')))
+
+    written = []
+    real_encode = wd._pcm16_wav_bytes
+
+    def record_encode(pcm):
+        wav_bytes = real_encode(pcm)
+        with wave.open(io.BytesIO(wav_bytes), 'rb') as wf:
+            written.append((wf.getframerate(), wf.getnchannels(), wf.readframes(10)))
+        return wav_bytes
+
+    monkeypatch.setattr(wd, '_pcm16_wav_bytes', record_encode)
+    monkeypatch.setattr(wd, '_HAS_WHISPER_CLI', True)
+    monkeypatch.setattr(wd._whisper_server, 'transcribe', lambda wav_bytes, model: 'ok')
+
+    assert wd.process_voice_with_whisper(base64.b64encode(b'ogg-bytes').decode()) == 'ok'
+
+    assert written == [(16000, 1, np.array([1, 2, 3], dtype=np.int16).tobytes())]
+
+
+def test_favicon_and_versioned_static_are_cacheable():
+    import flask
+
+    import macbot.web_dashboard as wd
+
+    client = wd.app.test_client()
+
+    favicon = client.get('/favicon.ico')
+    assert favicon.status_code == 204
+    assert 'max-age' in favicon.headers['Cache-Control']
+
+    with wd.app.test_request_context():
+        url = flask.url_for('static', filename='dashboard.js')
+    assert '?v=' in url
+
+    resp = client.get(url)
+    assert resp.headers['Cache-Control'] == wd._STATIC_IMMUTABLE
+    resp.close()
+    unversioned = client.get('/static/dashboard.js')
+    assert unversioned.headers.get('Cache-Control') != wd._STATIC_IMMUTABLE
+    unversioned.close()
+
+
+def test_chat_message_and_broadcast_share_one_timestamp(monkeypatch):
+    from collections import deque
+
+    import macbot.web_dashboard as wd
+
+    broadcasts = []
+    monkeypatch.setattr(wd, 'conversation_history', deque(maxlen=10))
+    monkeypatch.setattr(wd, '_history_snapshot', {'list': None, 'json': None})
+    monkeypatch.setattr(wd, '_broadcast_update', lambda payload, skip_sid=None: broadcasts.append(payload))
+    monkeypatch.setattr(wd, 'process_with_llm', lambda message, on_token=None: 'pong')
+    monkeypatch.setattr(wd, 'conversation_state', dict(wd.conversation_state))
+
+    assert wd._handle_chat_message_and_broadcast('ping') == 'pong'
+
+    history = wd._history_list()
+    assert [m['type'] for m in history] == ['user_message', 'assistant_message']
+    assert [b['timestamp'] for b in broadcasts] == [m['timestamp'] for m in history]
+    assert wd.conversation_state['last_activity'].isoformat() == history[0]['timestamp']
+
+
+def test_websocket_clients_are_tracked_by_sid(monkeypatch):
+    import macbot.web_dashboard as wd
+
+    monkeypatch.setattr(wd, 'websocket_clients', set())
+    monkeypatch.setattr(wd, 'get_system_stats', lambda: {})
+
+    first = wd.socketio.test_client(wd.app)
+    second = wd.socketio.test_client(wd.app)
+    assert len(wd.websocket_clients) == 2
+    assert all(isinstance(sid, str) for sid in wd.websocket_clients)
+
+    first.disconnect()
+    second.disconnect()
+    assert wd.websocket_clients == set()
+
+
+def test_sse_payload_is_reencoded_only_after_a_refresh(monkeypatch):
+    import macbot.web_dashboard as wd
+
+    dumps = []
+    monkeypatch.setattr(wd, '_sse_encoded', {'key': None, 'payload': None})
+    monkeypatch.setattr(wd, 'check_service_health', lambda: None)
+    monkeypatch.setattr(wd, 'get_system_stats', lambda: {'cpu': 1})
+    monkeypatch.setattr(wd, '_json_dumps', lambda obj: dumps.append(obj) or 'encoded-%d' % len(dumps))
+    monkeypatch.setattr(wd, '_stats_sampled_at', 10.0)
+    monkeypatch.setattr(wd, '_health_checked_at', 20.0)
+
+    assert wd._sse_payload() == 'encoded-1'
+    assert wd._sse_payload() == 'encoded-1'
+
+    monkeypatch.setattr(wd, '_stats_sampled_at', 11.0)
+    assert wd._sse_payload() == 'encoded-2'
+    assert len(dumps) == 2
+
+
+def test_interrupt_is_sent_off_the_socket_handler(monkeypatch):
+    import macbot.web_dashboard as wd
+
+    tasks = []
+    posted = []
+    monkeypatch.setattr(wd.socketio, 'start_background_task', tasks.append)
+    monkeypatch.setattr(wd, '_broadcast_update', lambda payload, skip_sid=None: None)
+    monkeypatch.setattr(wd, 'conversation_state', dict(wd.conversation_state))
+    monkeypatch.setattr(wd._http, 'post', lambda url, timeout=None: posted.append(url) or SimpleNamespace(status_code=200))
+
+    client = wd.socketio.test_client(wd.app)
+    client.get_received()
+    client.emit('interrupt_conversation')
+
+    assert [m['name'] for m in client.get_received()] == ['system_status']
+    assert tasks == [wd._send_interrupt] and posted == []
+
+    tasks[0]()
+    assert posted == [f"http://{wd.va_host}:{wd.va_port}/interrupt"]
+    client.disconnect()
+
+
+def test_chat_message_runs_on_the_llm_pool_and_refuses_when_full(monkeypatch):
+    import threading
+
+    import macbot.web_dashboard as wd
+
+    release = threading.Event()
+    handled = []
+
+    def slow_chat(message, emit_user=True, origin_sid=None):
+        release.wait(5)
+        handled.append((message, threading.current_thread().name))
+        return 'pong'
+
+    monkeypatch.setattr(wd, '_handle_chat_message_and_broadcast', slow_chat)
+    monkeypatch.setattr(wd, '_llm_slots', threading.BoundedSemaphore(1))
+    monkeypatch.setattr(wd, 'get_system_stats', lambda: {})
+
+    client = wd.socketio.test_client(wd.app)
+    client.get_received()
+    client.emit('chat_message', {'message': 'first'})
+    # The handler returned while the first reply is still in flight
+    assert handled == []
+
+    client.emit('chat_message', {'message': 'second'})
+    busy = client.get_received()
+    assert busy[0]['name'] == 'conversation_update'
+    assert busy[0]['args'][0]['type'] == 'error_message'
+
+    release.set()
+    wd._LLM_POOL.submit(lambda: None).result(5)
+    assert handled[0][0] == 'first' and handled[0][1].startswith('wd-llm')
+    client.disconnect()
+
+
+def test_whisper_cli_paths_are_checked_once_and_refreshable(monkeypatch, tmp_path):
+    import macbot.web_dashboard as wd
+
+    bin_path, model_path = tmp_path / 'whisper-cli', tmp_path / 'ggml-base.en.bin'
+    monkeypatch.setattr(wd, '_WHISPER_BIN', str(bin_path))
+    monkeypatch.setattr(wd, '_WHISPER_MODEL', str(model_path))
+    monkeypatch.setattr(wd, '_HAS_WHISPER_CLI', False)
+
+    bin_path.write_bytes(b'')
+    model_path.write_bytes(b'')
+    # Installing the model does not change the cached answer until a refresh
+    assert wd._HAS_WHISPER_CLI is False
+    assert wd.refresh_whisper_paths() is True and wd._HAS_WHISPER_CLI is True
+
+    model_path.unlink()
+    assert wd.refresh_whisper_paths() is False
+
+
+def test_voice_samples_stay_in_memory_for_python_whisper(monkeypatch):
+    import base64
+    import sys
+
+    import numpy as np
+
+    import macbot.web_dashboard as wd
+
+    samples = np.linspace(-0.5, 0.5, 160, dtype=np.float32)
+
+    transcribed = []
+    loads = []
+    commands = []
+
+    def fake_transcribe(data, language, fp16):
+        assert fp16 is False
+        transcribed.append(data)
+        return {'text': ' hi '}
+
+    fake_model = SimpleNamespace(transcribe=fake_transcribe)
+    monkeypatch.setitem(sys.modules, 'whisper', SimpleNamespace(load_model=lambda name: loads.append(name) or fake_model))
+    monkeypatch.setattr(wd, '_whisper_model', None)
+    monkeypatch.setattr(wd, '_decode_audio_pyav', lambda audio_bytes, as_float=False: None)
+    monkeypatch.setattr(wd, '_HAS_WHISPER_CLI', False)
+    monkeypatch.setattr(
+        wd.subprocess, 'run',
+        lambda cmd, input=None, capture_output=False, timeout=None, close_fds=True: commands.append(cmd)
+        or SimpleNamespace(returncode=0, stdout=samples.tobytes(), stderr=b''),
+    )
+    monkeypatch.setattr(wd.tempfile, 'NamedTemporaryFile', lambda *a, **kw: (_ for _ in ()).throw(AssertionError('temp file')))
+
+    assert wd.process_voice_with_whisper(base64.b64encode(b'webm').decode()) == 'hi'
+    assert transcribed[0].dtype == np.float32
+    np.testing.assert_array_equal(transcribed[0], samples)
+    assert commands[0][-3:] == ['-f', 'f32le', 'pipe:1']
+
+    # The model is loaded once and reused by later requests
+    assert wd.process_voice_with_whisper(base64.b64encode(b'webm').decode()) == 'hi'
+    assert loads == ['tiny'] and len(transcribed) == 2
+
+
+def test_whisper_fallback_model_is_quantized_when_possible():
+    torch = pytest.importorskip('torch')
+    from torch.ao.nn.quantized.dynamic import Linear as DynamicQuantizedLinear
+
+    import macbot.web_dashboard as wd
+
+    class WhisperLinear(torch.nn.Linear):
+        # Same shape as whisper.model.Linear: a subclass that only casts weights
+        def forward(self, x):
+            return torch.nn.functional.linear(x, self.weight.to(x.dtype), self.bias.to(x.dtype))
+
+    model = torch.nn.Sequential(WhisperLinear(8, 8), torch.nn.ReLU(), WhisperLinear(8, 4))
+    x = torch.randn(2, 8)
+    expected = model(x)
+
+    quantized = wd._quantize_whisper(model)
+
+    assert sum(isinstance(m, DynamicQuantizedLinear) for m in quantized.modules()) == 2
+    assert torch.allclose(quantized(x), expected, atol=0.1)
+
+
+def test_whisper_quantization_falls_back_to_fp32(monkeypatch):
+    import sys
+
+    import macbot.web_dashboard as wd
+
+    monkeypatch.setitem(sys.modules, 'torch', None)
+    model = SimpleNamespace(modules=lambda: [])
+    assert wd._quantize_whisper(model) is model
+
+
+def test_whisper_server_is_started_once_and_reused(monkeypatch, tmp_path):
+    import macbot.web_dashboard as wd
+
+    binary = tmp_path / 'whisper-server'
+    binary.write_text('')
+    launched = []
+    posted = []
+
+    class FakeProc:
+        def __init__(self, cmd, stdout=None, stderr=None):
+            launched.append(cmd)
+
+        def poll(self):
+            return None
+
+        def terminate(self):
+            launched.append('terminated')
+
+    monkeypatch.setattr(wd.subprocess, 'Popen', FakeProc)
+    monkeypatch.setattr(wd._http, 'get', lambda url, timeout=None: SimpleNamespace(status_code=200))
+    monkeypatch.setattr(
+        wd._http, 'post',
+        lambda url, files=None, data=None, timeout=None: posted.append((url, files['file'][1])) or SimpleNamespace(
+            status_code=200, json=lambda: {'text': ' hello there\n'}),
+    )
+
+    server = wd._WhisperServer(str(binary), 8999)
+    assert server.transcribe(b'wav-1', 'model.bin') == 'hello there'
+    assert server.transcribe(b'wav-2', 'model.bin') == 'hello there'
+
+    assert len(launched) == 1 and launched[0][-2:] == ['--port', '8999']
+    assert posted == [('http://127.0.0.1:8999/inference', b'wav-1'), ('http://127.0.0.1:8999/inference', b'wav-2')]
+    server.stop()
+    assert launched[-1] == 'terminated'
+
+    # A missing binary or disabled port means the caller spawns whisper-cli
+    assert wd._WhisperServer(str(tmp_path / 'missing'), 8999).transcribe(b'wav', 'model.bin') is None
+    assert wd._WhisperServer(str(binary), 0).transcribe(b'wav', 'model.bin') is None
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("search the weather", ("get_weather",)),
+    ("Search for cheap flights", ("web_search", "cheap flights")),
+    ("search web news", ("web_search", "news")),
+    ("browse https://example.com please", ("browse_website", "https://example.com")),
+    ("go to the Docs", ("web_search", "the Docs")),
+    ("open app Safari", ("open_app", "safari")),
+    ("open the notes app", ("open_app", "open the notes app")),
+    ("take picture now", ("take_screenshot",)),
+    ("show system information", ("get_system_info",)),
+    ("tell me a joke", None),
+])
+def test_process_tools_routes_with_one_keyword_scan(monkeypatch, message, expected):
+    import macbot.web_dashboard as wd
+
+    calls = []
+    fake_tools = SimpleNamespace(**{
+        name: (lambda name: lambda *args: calls.append((name, *args)) or "done")(name)
+        for name in ("get_weather", "web_search", "browse_website", "open_app", "take_screenshot", "get_system_info")
+    })
+    monkeypatch.setattr(wd, 'tools_mod', fake_tools)
+
+    result = wd.process_tools(message)
+
+    assert calls == ([expected] if expected else [])
+    assert result == ("done" if expected else None)
+
+
+def test_llm_reply_is_streamed_to_dashboards(monkeypatch):
+    import macbot.web_dashboard as wd
+
+    lines = [
+        b'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+        b'',
+        b'data: {"choices": [{"delta": {"content": "Hel"}}]}',
+        b'data: {"choices": [{"delta": {"content": "lo"}}]}',
+        b'data: [DONE]',
+        b'data: {"choices": [{"delta": {"content": "ignored"}}]}',
+    ]
+
+    class FakeStream:
+        status_code = 200
+
+        def iter_lines(self):
+            return iter(lines)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    posted = []
+    emitted = []
+    tokens = []
+    monkeypatch.setattr(wd._http, 'post', lambda url, json=None, stream=False, timeout=None: posted.append((json, stream)) or FakeStream())
+    monkeypatch.setattr(wd, 'process_tools', lambda message: None)
+    monkeypatch.setattr(wd, 'get_rag_context', lambda message: None)
+    monkeypatch.setattr(wd.socketio, 'emit', lambda event, data, to=None: emitted.append((event, data, to)))
+
+    # Direct callers (e.g. /api/llm) stream nothing to dashboards
+    assert wd.process_with_llm('hi') == 'Hello'
+    assert posted[0][0]['stream'] is True and posted[0][1] is True
+    assert emitted == []
+
+    assert wd.process_with_llm('hi', on_token=tokens.append) == 'Hello'
+    assert tokens == ['Hel', 'lo']
+
+
+def test_chat_tokens_are_tagged_with_the_message_they_answer(monkeypatch):
+    from collections import deque
+
+    import macbot.web_dashboard as wd
+
+    emitted = []
+    broadcasts = []
+
+    def fake_llm(message, on_token=None):
+        on_token('po')
+        on_token('ng')
+        return 'pong'
+
+    monkeypatch.setattr(wd, 'conversation_history', deque(maxlen=10))
+    monkeypatch.setattr(wd, '_history_snapshot', {'list': None, 'json': None})
+    monkeypatch.setattr(wd, 'conversation_state', dict(wd.conversation_state))
+    monkeypatch.setattr(wd, 'process_with_llm', fake_llm)
+    monkeypatch.setattr(wd, '_broadcast_update', lambda payload, skip_sid=None: broadcasts.append(payload))
+    monkeypatch.setattr(wd.socketio, 'emit', lambda event, data, to=None: emitted.append((event, data, to)))
+
+    wd._handle_chat_message_and_broadcast('ping')
+
+    reply = broadcasts[-1]
+    assert reply['type'] == 'assistant_message'
+    assert emitted == [
+        ('llm_token', {'text': 'po', 'reply_to': reply['reply_to']}, wd._DASHBOARD_ROOM),
+        ('llm_token', {'text': 'ng', 'reply_to': reply['reply_to']}, wd._DASHBOARD_ROOM),
+    ]
+
+
+def test_rag_context_is_cached_by_normalized_query(monkeypatch):
+    from collections import OrderedDict
+
+    import macbot.web_dashboard as wd
+
+    fetched = []
+    answers = {'ok': (True, 'Doc: text...'), 'down': (False, None)}
+    monkeypatch.setattr(wd, '_rag_cache', OrderedDict())
+    monkeypatch.setattr(wd, '_RAG_CACHE_MAX', 2)
+    monkeypatch.setattr(wd, '_fetch_rag_context', lambda query: fetched.append(query) or answers[query.split()[0].lower()])
+
+    assert wd.get_rag_context('OK  what is macbot') == 'Doc: text...'
+    assert wd.get_rag_context('ok what is   MacBot') == 'Doc: text...'
+    assert len(fetched) == 1
+
+    # Failed lookups are retried rather than cached
+    assert wd.get_rag_context('down now') is None
+    assert wd.get_rag_context('down now') is None
+    assert len(fetched) == 3
+
+    wd.get_rag_context('ok two')
+    wd.get_rag_context('ok three')
+    assert list(wd._rag_cache) == ['ok two', 'ok three']
+
+    monkeypatch.setattr(wd, '_RAG_CACHE_TTL', 0.0)
+    wd.get_rag_context('ok three')
+    assert fetched[-1] == 'ok three' and len(fetched) == 6
+
+
+def test_llm_and_rag_calls_skip_liveness_pings(monkeypatch):
+    import macbot.web_dashboard as wd
+
+    def refuse(*args, **kwargs):
+        raise wd.requests.exceptions.ConnectionError()
+
+    posted = []
+    monkeypatch.setattr(wd._http, 'get', lambda *a, **kw: (_ for _ in ()).throw(AssertionError('health ping')))
+    monkeypatch.setattr(wd._http, 'post', refuse)
+    monkeypatch.setattr(wd, 'process_tools', lambda message: None)
+    monkeypatch.setattr(wd, 'get_rag_context', lambda message: None)
+
+    assert 'not accessible' in wd.process_with_llm('hi')
+
+    status = {name: dict(info) for name, info in wd.service_status.items()}
+    monkeypatch.setattr(wd, 'service_status', status)
+    monkeypatch.setattr(
+        wd._http, 'post',
+        lambda url, json=None, timeout=None: posted.append(url) or SimpleNamespace(status_code=200, json=lambda: {'results': []}),
+    )
+
+    status['rag']['status'] = 'stopped'
+    assert wd._fetch_rag_context('q') == (False, None)
+    assert posted == []
+
+    status['rag']['status'] = 'running'
+    assert wd._fetch_rag_context('q') == (True, None)
+    assert posted == [f"http://{wd.rag_host}:{wd.rag_port}/api/search"]